@@ -34,6 +34,13 @@ class Map(object):
 
         self.grainPlot = None
 
+        # flat (row major) indices of the points of all grains, sorted
+        # by grain and in raster order within each grain, and the
+        # position of the first point of each grain (and end of the
+        # last) in it
+        self.grainPointIdxs = None
+        self.grainOffsets = None
+
     def __len__(self):
         return len(self.grainList)
 
@@ -63,6 +70,32 @@ class Map(object):
             raise Exception("No grains detected.")
         return True
 
+    def buildGrainIndex(self):
+        """
+        Build the index of the points in each grain from the grain map,
+        stored in self.grainPointIdxs and self.grainOffsets. Points of
+        grain i (grainID, label i + 1 in the grain map) are
+        ``grainPointIdxs[grainOffsets[i]:grainOffsets[i + 1]]``.
+
+        Returns
+        -------
+        int
+            Number of grains
+        """
+        grainsFlat = self.grains.ravel()
+        numGrains = max(int(grainsFlat.max()), 0)
+
+        pointIdxs = np.flatnonzero(grainsFlat > 0)
+        pointIdxs = pointIdxs[np.argsort(grainsFlat[pointIdxs], kind='stable')]
+        grainSizes = np.bincount(grainsFlat[pointIdxs],
+                                 minlength=numGrains + 1)[1:]
+
+        self.grainPointIdxs = pointIdxs
+        self.grainOffsets = np.zeros(numGrains + 1, dtype=int)
+        np.cumsum(grainSizes, out=self.grainOffsets[1:])
+
+        return numGrains
+
     def plotGrainNumbers(self, dilateBoundaries=False, ax=None, **kwargs):
         """Plot a map with grains numbered
 
@@ -452,24 +485,55 @@ class Map(object):
         if grainData.shape[0] != len(grainIds):
             raise Exception("The length of supplied grain data does not"
                             "match the number of grains.")
-        if len(grainData.shape) == 1:
-            mapShape = [self.yDim, self.xDim]
-        elif len(grainData.shape) == 2 and grainData.shape[1] == 3:
-            mapShape = [self.yDim, self.xDim, 3]
-        else:
+        if not (len(grainData.shape) == 1 or
+                (len(grainData.shape) == 2 and grainData.shape[1] == 3)):
             raise Exception("The grain data supplied must be either a"
                             "single value or RGB values per grain.")
 
-        grainMap = np.full(mapShape, bg, dtype=grainData.dtype)
-        for grainId, grainValue in zip(grainIds, grainData):
-            grain = self.grainList[grainId]
-            for coord in grain.coordList:
-                grainMap[coord[1], coord[0]] = grainValue
+        grainMap = self.grainDataToMapData(grainData, grainIds=grainIds, bg=bg)
 
         plot = MapPlot.create(self, grainMap, **plotParams)
 
         return plot
 
+    def grainDataToMapData(self, grainData, grainIds=-1, bg=0):
+        """
+        Create a map with each grain filled with a value, by looking up
+        the value for each point from its label in the grain map.
+
+        Parameters
+        ----------
+        grainData : numpy.ndarray
+            Value for each grain, can be multiple values per grain
+            (e.g. RGB) along the second axis.
+        grainIds : list of int or int, optional
+            IDs of the grains the values are for. Use -1 for all grains
+            in the map.
+        bg : int or real, optional
+            Value to fill the background (boundaries, grains too small
+            or not in grainIds) with.
+
+        Returns
+        -------
+        numpy.ndarray shape (yDim, xDim, ...)
+            Map of grain values
+        """
+        # Check that grains have been detected in the map
+        self.checkGrainsDetected()
+
+        if type(grainIds) is int and grainIds == -1:
+            grainIds = range(len(self))
+
+        grainData = np.asarray(grainData)
+
+        # lookup table of values by grain label, label 0 for points
+        # not in a grain
+        valueTable = np.full((len(self) + 1,) + grainData.shape[1:], bg,
+                             dtype=grainData.dtype)
+        valueTable[np.asarray(grainIds, dtype=int) + 1] = grainData
+
+        return valueTable[np.maximum(self.grains, 0)]
+
     def plotGrainDataIPF(
             self, direction, mapData=None, grainData=None,
             grainIds=-1, **kwargs
@@ -524,19 +588,82 @@ class Grain(object):
     def __init__(self):
         # list of coords stored as tuples (x, y). These are coords in a
         # cropped image if crop exists.
-        self.coordList = []
+        self._coordList = []
+        # flat indices of the points of the grain in the owner map, a
+        # view of the grain index of the map. Used instead of the coord
+        # list when set.
+        self.pointIdxs = None
+        self._extremeCoords = None
+        self._centroid = None
 
     def __len__(self):
-        return len(self.coordList)
+        if self.pointIdxs is not None:
+            return len(self.pointIdxs)
+        return len(self._coordList)
+
+    @property
+    def coordList(self):
+        """Coordinates (x, y) of the points of the grain. An array of
+        shape (n, 2) for grains in the grain index of a map."""
+        if self.pointIdxs is None:
+            return self._coordList
+
+        x, y = self.coords
+        return np.stack((x, y), axis=1)
+
+    @coordList.setter
+    def coordList(self, coordList):
+        self._detachFromIndex()
+        self._coordList = coordList
+        self._extremeCoords = None
+        self._centroid = None
+
+    def _detachFromIndex(self):
+        """Stop using the grain index of the owner map for the points of
+        the grain, for example when the coord list is replaced."""
+        self.pointIdxs = None
+
+    @property
+    def coords(self):
+        """
+        Coordinates of the points of the grain.
+
+        Returns
+        -------
+        numpy.ndarray, numpy.ndarray
+            x and y coordinates
+        """
+        if self.pointIdxs is None:
+            coords = np.array(self._coordList, dtype=int).reshape((-1, 2))
+            return coords[:, 0], coords[:, 1]
+
+        y, x = np.divmod(self.pointIdxs, self.ownerMap.xDim)
+        return x, y
 
     @property
     def extremeCoords(self):
-        coords = np.array(self.coordList, dtype=int)
+        if self._extremeCoords is not None:
+            return self._extremeCoords
 
-        x0, y0 = coords.min(axis=0)
-        xmax, ymax = coords.max(axis=0)
+        x, y = self.coords
+        extremeCoords = x.min(), y.min(), x.max(), y.max()
+        if self.pointIdxs is not None:
+            self._extremeCoords = extremeCoords
 
-        return x0, y0, xmax, ymax
+        return extremeCoords
+
+    @property
+    def centroid(self):
+        """Centre of mass (x, y) of the grain in map coordinates."""
+        if self._centroid is not None:
+            return self._centroid
+
+        x, y = self.coords
+        centroid = x.mean(), y.mean()
+        if self.pointIdxs is not None:
+            self._centroid = centroid
+
+        return centroid
 
     def centreCoords(self, centreType="box", grainCoords=True):
         """
@@ -562,7 +689,7 @@ class Grain(object):
             xCentre = round((xmax + x0) / 2)
             yCentre = round((ymax + y0) / 2)
         elif centreType == "com":
-            xCentre, yCentre = np.array(self.coordList).mean(axis=0).round()
+            xCentre, yCentre = np.round(self.centroid)
         else:
             raise ValueError("centreType must be box or com")
 
@@ -578,8 +705,8 @@ class Grain(object):
         # initialise array with nans so area not in grain displays white
         outline = np.full((ymax - y0 + 1, xmax - x0 + 1), bg, dtype=int)
 
-        for coord in self.coordList:
-            outline[coord[1] - y0, coord[0] - x0] = fg
+        x, y = self.coords
+        outline[y - y0, x - x0] = fg
 
         return outline
 
@@ -606,12 +733,9 @@ class Grain(object):
         numpy.ndarray
             Array containing this grains values from the given map data.
         """
-        grainData = np.zeros(len(self), dtype=mapData.dtype)
-
-        for i, coord in enumerate(self.coordList):
-            grainData[i] = mapData[coord[1], coord[0]]
+        x, y = self.coords
 
-        return grainData
+        return mapData[y, x]
 
     def grainMapData(self, mapData=None, grainData=None, bg=np.nan):
         """
@@ -645,8 +769,8 @@ class Grain(object):
         grainMapData = np.full((ymax - y0 + 1, xmax - x0 + 1), bg,
                                dtype=type(grainData[0]))
 
-        for coord, data in zip(self.coordList, grainData):
-            grainMapData[coord[1] - y0, coord[0] - x0] = data
+        x, y = self.coords
+        grainMapData[y - y0, x - x0] = grainData
 
         return grainMapData
 
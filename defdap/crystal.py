@@ -174,6 +174,27 @@ class SlipSystem(object):
 
         return groupedSlipSystems
 
+    @staticmethod
+    def stackSlipSystems(slipSystems):
+        """Stack the slip plane normals and directions of grouped slip
+        systems into arrays for vectorised calculations.
+
+        Args:
+            slipSystems (list(list(SlipSystem))): Slip systems grouped
+            by slip plane
+
+        Returns:
+            np.ndarray: Slip plane normals, shape (3, number of systems)
+            np.ndarray: Slip directions, shape (3, number of systems)
+            list(int): Number of slip systems in each group
+        """
+        flatSlipSystems = [ss for ssGroup in slipSystems for ss in ssGroup]
+        slipPlanes = np.array([ss.slipPlane for ss in flatSlipSystems]).T
+        slipDirs = np.array([ss.slipDir for ss in flatSlipSystems]).T
+        groupSizes = [len(ssGroup) for ssGroup in slipSystems]
+
+        return slipPlanes, slipDirs, groupSizes
+
     @staticmethod
     def lMatrix(a, b, c, alpha, beta, gamma):
         """ Construct L matrix based on Page 22 of
@@ -14,6 +14,8 @@
 # limitations under the License.
 
 import numpy as np
+from scipy import ndimage, sparse
+from scipy.sparse import csgraph
 from matplotlib.widgets import Button
 from skimage import morphology as mph
 
@@ -21,12 +23,13 @@ import copy
 import warnings
 
 from defdap.file_readers import EBSDDataLoader
-from defdap.quat import Quat
+from defdap.quat import Quat, QuatArray, OriIndex
 from defdap.crystal import SlipSystem
 from defdap import base
 
 from defdap.plotting import MapPlot, GrainPlot
-from defdap.utils import reportProgress
+from defdap.utils import (reportProgress, getNumWorkers, runParallel,
+                          splitRanges)
 
 
 class Map(base.Map):
@@ -46,7 +49,7 @@ class Map(base.Map):
         step size
     eulerAngleArray
     bandContrastArray
-    quatArray : numpy.ndarray
+    quatArray : defdap.quat.QuatArray
         array of quaterions for each point of map
     numPhases : int
         number of phases
@@ -59,20 +62,61 @@ class Map(base.Map):
     phaseBoundaries : numpy.ndarray
         map of phase boundaries. -1 for boundary, 0 otherwise
     cacheEulerMap
+    fzQuatArray : defdap.quat.QuatArray
+        orientations reduced to the fundamental zone of the crystal
+        symmetry
+    fzSymIdxs : numpy.ndarray
+        index of the symmetry operator used to reduce each orientation
+    pixelNeighbourMisOri : numpy.ndarray shape (2, yDim, xDim)
+        misorientation (cos of half angle) of each point to its +x
+        (first) and +y (second) neighbour in the fundamental zone reduced
+        map. 0 in the last column/row which have no neighbour
+    pixelNeighbourSymIdxs : numpy.ndarray shape (2, yDim, xDim)
+        index of the symmetry operator applied to the neighbour for
+        minimum misorientation
+    segmentationEdges : numpy.ndarray shape (2, numEdges)
+        flat (row major) indices of the pairs of points joined by the
+        edges of a minimum spanning forest of the map, weighted by
+        neighbour misorientation, in order of increasing misorientation
+    segmentationMisOri : numpy.ndarray shape (numEdges,)
+        misorientation (cos of half angle) of each segmentation edge
+    segmentationConnectivity : int
+        connectivity of points used to build the segmentation edges,
+        4 or 8
+    pixelOriIndex : defdap.quat.OriIndex
+        orientation index of all points in the map, flattened in row
+        major order
+    grainOriIndex : defdap.quat.OriIndex
+        orientation index of the reference orientation of all grains
     grains : numpy.ndarray
         map of grains. Grain numbers start at 1 here but everywhere else
         grainID starts at 0. Regions that are smaller than the minimum
         grain size are given value -2.
     grainList : list(defdap.ebsd.Grain)
         list of grains
-    misOri : numpy.ndarray
-        map of misorientation
-    misOriAxis : list(numpy.ndarray)
-        map of misorientation axis components
+    grainPointIdxs : numpy.ndarray
+        flat (row major) indices of the points of all grains, sorted by
+        grain and in raster order within each grain
+    grainOffsets : numpy.ndarray shape (numGrains + 1,)
+        position of the first point of each grain in grainPointIdxs
+    misOri : numpy.ndarray shape (yDim, xDim)
+        map of misorientation (cos of half angle) of each point to the
+        reference orientation of its grain. 1 outside grains
+    misOriAxis : numpy.ndarray shape (3, yDim, xDim)
+        map of misorientation axis components. 0 outside grains
     kam : numpy.ndarray
         map of kam
     averageSchmidFactor : numpy.ndarray
         map of average Schmid factor
+    grainSchmidFactors : numpy.ndarray shape (numSystems, numGrains)
+        Schmid factor of each slip system for the mean orientation of
+        each grain
+    schmidFactors : numpy.ndarray shape (numSystems, yDim, xDim)
+        Schmid factor of each slip system at each point
+    maxSchmidFactor : numpy.ndarray shape (yDim, xDim)
+        maximum Schmid factor of all slip systems at each point
+    maxSchmidFactorSystem : numpy.ndarray shape (yDim, xDim)
+        index of the slip system with maximum Schmid factor at each point
     slipSystems : list(list(slipSystems))
         slip systems grouped by slip plane
     slipTraceColours list(str)
@@ -86,11 +130,18 @@ class Map(base.Map):
         GND scalar map
     Nye
         3x3 Nye tensor at each point
+    precision : numpy.dtype
+        floating point type of orientation, misorientation and strain
+        arrays
+    memoryBudget : int
+        approximate memory in bytes for working arrays of calculations
+        processed in blocks of the map
     fig
     ax
     """
 
-    def __init__(self, fileName, crystalSym, cOverA=None, dataType=None):
+    def __init__(self, fileName, crystalSym, cOverA=None, dataType=None,
+                 precision=np.float64, memoryBudget=2**26):
         """
         Initialise class and load EBSD data
 
@@ -102,6 +153,13 @@ class Map(base.Map):
             Crystal structure
         dataType : str, {'OxfordBinary', 'OxfordText'}
             Format of EBSD data file
+        precision : numpy.dtype, {numpy.float64, numpy.float32}
+            Floating point precision of orientation, misorientation and
+            strain arrays. float32 halves memory use, see the precision
+            section of the documentation for the effect on accuracy.
+        memoryBudget : int
+            Approximate memory in bytes to use for working arrays of
+            calculations that are processed in blocks of the map.
         """
         # Call base class constructor
         super(Map, self).__init__()
@@ -114,6 +172,15 @@ class Map(base.Map):
         self.eulerAngleArray = None
         self.bandContrastArray = None
         self.quatArray = None
+        self.fzQuatArray = None
+        self.fzSymIdxs = None
+        self.pixelNeighbourMisOri = None
+        self.pixelNeighbourSymIdxs = None
+        self.segmentationEdges = None
+        self.segmentationMisOri = None
+        self.segmentationConnectivity = None
+        self.pixelOriIndex = None
+        self.grainOriIndex = None
         self.numPhases = None
         self.phaseArray = None
         self.phaseNames = []
@@ -125,12 +192,18 @@ class Map(base.Map):
         self.misOriAxis = None
         self.kam = None
         self.averageSchmidFactor = None
+        self.grainSchmidFactors = None
+        self.schmidFactors = None
+        self.maxSchmidFactor = None
+        self.maxSchmidFactorSystem = None
         self.slipSystems = None
         self.slipTraceColours = None
         self.currGrainId = None
         self.origin = (0, 0)
         self.GND = None
         self.Nye = None
+        self.precision = np.dtype(precision)
+        self.memoryBudget = memoryBudget
 
         # Use euler map for defining homologous points
         self.plotHomog = self.plotEulerMap
@@ -196,22 +269,161 @@ class Map(base.Map):
         return self.stepSize
 
     @reportProgress("transforming EBSD data")
-    def transformData(self):
+    def transformData(self, rotation=None, transformMap=True):
         """
-        Rotate map by 180 degrees and transform quats
+        Rotate the sample frame of the map. Orientations are transformed
+        in a single quaternion product and the Euler angle array is
+        updated to match. By default the map is rotated by 180 degrees
+        about the z axis.
+
+        Parameters
+        ----------
+        rotation : defdap.quat.Quat, optional
+            Rotation of the sample frame, the sample vector v is moved
+            to rotation.rotMatrix() @ v. Flips of the map are given as
+            a 180 degree rotation about the x or y axis.
+        transformMap : bool, optional
+            If True, also move the points of the map to their rotated
+            positions. Only rotations that map the grid onto itself
+            (multiples of 90 degrees about z and 180 degrees about x
+            or y) are allowed. If False, only the orientations are
+            rotated, for example to correct a small misalignment.
+
+        Boundaries, grains and all results calculated from the map are
+        cleared, so grains must be found again after transforming.
+
         """
-        self.eulerAngleArray = self.eulerAngleArray[:, ::-1, ::-1]
-        self.bandContrastArray = self.bandContrastArray[::-1, ::-1]
-        self.phaseArray = self.phaseArray[::-1, ::-1]
-        self.buildQuatArray()
-        
-        transformQuat = Quat.fromAxisAngle(np.array([0, 0, 1]), np.pi)
-        for i in range(self.xDim):
-            for j in range(self.yDim):
-                self.quatArray[j, i] = self.quatArray[j, i] * transformQuat
+        self.checkDataLoaded()
+
+        if rotation is None:
+            rotation = Quat.fromAxisAngle(np.array([0, 0, 1]), np.pi)
+        if not isinstance(rotation, Quat):
+            raise TypeError("Rotation must be a quaternion.")
+
+        if transformMap:
+            rotMatrix = rotation.rotMatrix()
+            mapMatrix = np.round(rotMatrix[:2, :2]).astype(int)
+            if (not np.allclose(rotMatrix[:2, :2], mapMatrix, atol=1e-6) or
+                    abs(np.linalg.det(mapMatrix)) != 1):
+                raise ValueError("Rotation does not map the grid of points "
+                                 "onto itself, use transformMap=False to "
+                                 "only rotate the orientations.")
+
+            if self.quatArray is not None:
+                self.quatArray = QuatArray._fromComps(
+                    self.transformMapArray(self.quatArray.quatCoef, mapMatrix)
+                )
+            self.eulerAngleArray = self.transformMapArray(
+                self.eulerAngleArray, mapMatrix
+            )
+            self.bandContrastArray = self.transformMapArray(
+                self.bandContrastArray, mapMatrix
+            )
+            self.phaseArray = self.transformMapArray(
+                self.phaseArray, mapMatrix
+            )
+            self.yDim, self.xDim = self.phaseArray.shape
+
+        yield 0.5
+
+        # non-indexed points have all Euler angles zero
+        nonIndexed = ~self.eulerAngleArray.any(axis=0)
+        if self.quatArray is None:
+            quatComps = QuatArray.fromEulerAngles(
+                *self.eulerAngleArray
+            ).quatCoef
+        else:
+            quatComps = self.quatArray.quatCoef.astype(float, copy=False)
+
+        # orientation is a sample to crystal transformation, so undo the
+        # rotation of sample vectors before applying it. Product with a
+        # fixed quat is a linear map of the components.
+        rotComps = rotation.conjugate.quatCoef
+        productMatrix = Quat.quatProduct(np.eye(4), rotComps[:, np.newaxis])
+        quatComps = np.dot(productMatrix, quatComps.reshape((4, -1)))
+        quatComps *= np.where(quatComps[0] < 0, -1., 1.)
+        quatComps = quatComps.reshape((4, self.yDim, self.xDim))
+
+        if rotComps[1] == 0 and rotComps[2] == 0:
+            # rotation about z only changes the first Euler angle
+            eulerAngleArray = self.eulerAngleArray.copy()
+            eulerAngleArray[0] -= 2 * np.arctan2(rotComps[3], rotComps[0])
+            eulerAngleArray[0] %= 2 * np.pi
+        else:
+            eulerAngleArray = Quat.calcEulerAngles(quatComps)
+        eulerAngleArray[:, nonIndexed] = 0
+        self.eulerAngleArray = eulerAngleArray.astype(
+            self.eulerAngleArray.dtype, copy=False
+        )
+        self.quatArray = QuatArray._fromComps(
+            quatComps.astype(self.precision, copy=False)
+        )
+        self.fzQuatArray = None
+        self.fzSymIdxs = None
+        self.pixelNeighbourMisOri = None
+        self.pixelNeighbourSymIdxs = None
+        self.segmentationEdges = None
+        self.segmentationMisOri = None
+        self.pixelOriIndex = None
+
+        # results calculated from the old orientations or positions,
+        # grains must be found again
+        self.boundaries = None
+        self.phaseBoundaries = None
+        self.cacheEulerMap = None
+        self.kam = None
+        self.Nye = None
+        self.GND = None
+        self.schmidFactors = None
+        self.maxSchmidFactor = None
+        self.maxSchmidFactorSystem = None
+        self.averageSchmidFactor = None
+        self.grainSchmidFactors = None
+        self.grains = None
+        self.misOri = None
+        self.misOriAxis = None
+        self.grainList = None
+        self.grainPointIdxs = None
+        self.grainOffsets = None
+        self.grainOriIndex = None
+        self.neighbourNetwork = None
+        self.proxigramArr = None
+        self.currGrainId = None
+
+        yield 1.
+
+    @staticmethod
+    def transformMapArray(mapArray, mapMatrix):
+        """Move the points of a map array (with the map in the last 2
+        axes) for a transformation of the grid coordinates.
 
-            # report progress
-            yield i / self.xDim
+        Parameters
+        ----------
+        mapArray : numpy.ndarray shape (..., yDim, xDim)
+            Array to transform
+        mapMatrix : numpy.ndarray shape (2, 2)
+            Signed permutation matrix taking (x, y) coordinates of points
+            to the transformed coordinates
+
+        Returns
+        -------
+        numpy.ndarray shape (..., yDim, xDim) or (..., xDim, yDim)
+            Transformed array
+
+        """
+        if mapMatrix[0, 0] == 0:
+            # x and y swapped, new x from old y and new y from old x
+            mapArray = np.swapaxes(mapArray, -1, -2)
+            flipX, flipY = mapMatrix[0, 1] < 0, mapMatrix[1, 0] < 0
+        else:
+            flipX, flipY = mapMatrix[0, 0] < 0, mapMatrix[1, 1] < 0
+
+        if flipX:
+            mapArray = np.flip(mapArray, axis=-1)
+        if flipY:
+            mapArray = np.flip(mapArray, axis=-2)
+
+        return np.ascontiguousarray(mapArray)
 
     def plotBandContrastMap(self, **kwargs):
         """
@@ -325,34 +537,26 @@ class Map(base.Map):
 
     def calcKam(self):
         """
-        Calculates Kernel Average Misorientaion (KAM) for the EBSD map.
-        Crystal symmetric equivalences are not considered. Stores
-        result in self.kam.
+        Calculates Kernel Average Misorientaion (KAM) for the EBSD map
+        from the misorientation to the 4 nearest neighbours, taking into
+        account crystal symmetry. Stores result in self.kam.
         """
-        quatComps = np.empty((4, self.yDim, self.xDim))
-
-        for i, row in enumerate(self.quatArray):
-            for j, quat in enumerate(row):
-                quatComps[:, i, j] = quat.quatCoef
+        self.calcPixelNeighbourMisOri()
+        misOriX = self.pixelNeighbourMisOri[0, :, :-1]
+        misOriY = self.pixelNeighbourMisOri[1, :-1, :]
 
-        self.kam = np.empty((self.yDim, self.xDim))
+        self.kam = np.empty((self.yDim, self.xDim), dtype=self.precision)
 
-        # Start with rows. Calculate misorientation with neighbouring rows.
-        # First and last row only in one direction
-        self.kam[0, :] = abs(np.einsum("ij,ij->j", quatComps[:, 0, :], quatComps[:, 1, :]))
-        self.kam[-1, :] = abs(np.einsum("ij,ij->j", quatComps[:, -1, :], quatComps[:, -2, :]))
-        for i in range(1, self.yDim - 1):
-            self.kam[i, :] = (abs(np.einsum("ij,ij->j", quatComps[:, i, :], quatComps[:, i + 1, :])) +
-                              abs(np.einsum("ij,ij->j", quatComps[:, i, :], quatComps[:, i - 1, :]))) / 2
-
-        self.kam[self.kam > 1] = 1
+        # Start with rows. Average of misorientation with neighbouring
+        # rows, first and last row only in one direction
+        self.kam[0, :] = misOriY[0]
+        self.kam[-1, :] = misOriY[-1]
+        self.kam[1:-1, :] = (misOriY[1:] + misOriY[:-1]) / 2
 
         # Do the same for columns
-        self.kam[:, 0] += abs(np.einsum("ij,ij->j", quatComps[:, :, 0], quatComps[:, :, 1]))
-        self.kam[:, -1] += abs(np.einsum("ij,ij->j", quatComps[:, :, -1], quatComps[:, :, -2]))
-        for i in range(1, self.xDim - 1):
-            self.kam[:, i] += (abs(np.einsum("ij,ij->j", quatComps[:, :, i], quatComps[:, :, i + 1])) +
-                               abs(np.einsum("ij,ij->j", quatComps[:, :, i], quatComps[:, :, i - 1]))) / 2
+        self.kam[:, 0] += misOriX[:, 0]
+        self.kam[:, -1] += misOriX[:, -1]
+        self.kam[:, 1:-1] += (misOriX[:, 1:] + misOriX[:, :-1]) / 2
 
         self.kam /= 2
         self.kam[self.kam > 1] = 1
@@ -391,85 +595,34 @@ class Map(base.Map):
         Calculates Nye tensor and related GND density for the EBSD map.
         Stores result in self.Nye and self.GND.
         """
-        self.buildQuatArray()
-        syms = Quat.symEqv(self.crystalSym)
-        numSyms = len(syms)
-
-        # array to store quat components of initial and symmetric equivalents
-        quatComps = np.empty((numSyms, 4, self.yDim, self.xDim))
-
-        # populate with initial quat components
-        for i, row in enumerate(self.quatArray):
-            for j, quat in enumerate(row):
-                quatComps[0, :, i, j] = quat.quatCoef
-
-        # loop of over symmetries and apply to initial quat components
-        # (excluding first symmetry as this is the identity transformation)
-        for i, sym in enumerate(syms[1:], start=1):
-            # sym[i] * quat for all points (* is quaternion product)
-            quatComps[i, 0] = (quatComps[0, 0] * sym[0] - quatComps[0, 1] * sym[1] -
-                               quatComps[0, 2] * sym[2] - quatComps[0, 3] * sym[3])
-            quatComps[i, 1] = (quatComps[0, 0] * sym[1] + quatComps[0, 1] * sym[0] -
-                               quatComps[0, 2] * sym[3] + quatComps[0, 3] * sym[2])
-            quatComps[i, 2] = (quatComps[0, 0] * sym[2] + quatComps[0, 2] * sym[0] -
-                               quatComps[0, 3] * sym[1] + quatComps[0, 1] * sym[3])
-            quatComps[i, 3] = (quatComps[0, 0] * sym[3] + quatComps[0, 3] * sym[0] -
-                               quatComps[0, 1] * sym[2] + quatComps[0, 2] * sym[1])
-
-            # swap into positve hemisphere if required
-            quatComps[i, :, quatComps[i, 0] < 0] *= -1
-
-        # Arrays to store neigbour misorientation in positive x and y direction
-        misOrix = np.zeros((numSyms, self.yDim, self.xDim))
-        misOriy = np.zeros((numSyms, self.yDim, self.xDim))
-
-        # loop over symmetries calculating misorientation to initial
-        for i in range(numSyms):
-            for j in range(self.xDim - 1):
-                misOrix[i, :, j] = abs(np.einsum("ij,ij->j", quatComps[0, :, :, j], quatComps[i, :, :, j + 1]))
-
-            for j in range(self.yDim - 1):
-                misOriy[i, j, :] = abs(np.einsum("ij,ij->j", quatComps[0, :, j, :], quatComps[i, :, j + 1, :]))
-
-        misOrix[misOrix > 1] = 1
-        misOriy[misOriy > 1] = 1
-
-        # find min misorientation (max here as misorientaion is cos of this)
-        argmisOrix = np.argmax(misOrix, axis=0)
-        argmisOriy = np.argmax(misOriy, axis=0)
-        misOrix = np.max(misOrix, axis=0)
-        misOriy = np.max(misOriy, axis=0)
-
-        # convert to misorientation in degrees
-        misOrix = 360 * np.arccos(misOrix) / np.pi
-        misOriy = 360 * np.arccos(misOriy) / np.pi
+        self.calcPixelNeighbourMisOri()
+        quatComps = self.fzQuatArray.quatCoef
+        symComps = Quat.symEqvComps(self.crystalSym).astype(self.precision)
 
         # calculate relative elastic distortion tensors at each point in the two directions
-        betaderx = np.zeros((3, 3, self.yDim, self.xDim))
-        betadery = betaderx
-        for i in range(self.xDim - 1):
-            for j in range(self.yDim - 1):
-                q0x = Quat(quatComps[0, 0, j, i], quatComps[0, 1, j, i],
-                           quatComps[0, 2, j, i], quatComps[0, 3, j, i])
-                qix = Quat(quatComps[argmisOrix[j, i], 0, j, i + 1],
-                           quatComps[argmisOrix[j, i], 1, j, i + 1],
-                           quatComps[argmisOrix[j, i], 2, j, i + 1],
-                           quatComps[argmisOrix[j, i], 3, j, i + 1])
-                misoquatx = qix.conjugate * q0x
-                # change stepsize to meters
-                betaderx[:, :, j, i] = (Quat.rotMatrix(misoquatx) - np.eye(3)) / self.stepSize / 1e-6
-                q0y = Quat(quatComps[0, 0, j, i], quatComps[0, 1, j, i],
-                           quatComps[0, 2, j, i], quatComps[0, 3, j, i])
-                qiy = Quat(quatComps[argmisOriy[j, i], 0, j + 1, i],
-                           quatComps[argmisOriy[j, i], 1, j + 1, i],
-                           quatComps[argmisOriy[j, i], 2, j + 1, i],
-                           quatComps[argmisOriy[j, i], 3, j + 1, i])
-                misoquaty = qiy.conjugate * q0y
-                # change stepsize to meters
-                betadery[:, :, j, i] = (Quat.rotMatrix(misoquaty) - np.eye(3)) / self.stepSize / 1e-6
+        betaderx = np.zeros((3, 3, self.yDim, self.xDim), dtype=self.precision)
+        betadery = np.zeros((3, 3, self.yDim, self.xDim), dtype=self.precision)
+
+        q0 = quatComps[:, :-1, :-1]
+        # symmetric equivalents of neighbours with minimum misorientation
+        symIdxs = self.pixelNeighbourSymIdxs[:, :-1, :-1]
+        qix = Quat.quatProduct(np.moveaxis(symComps[symIdxs[0]], -1, 0),
+                               quatComps[:, :-1, 1:])
+        qiy = Quat.quatProduct(np.moveaxis(symComps[symIdxs[1]], -1, 0),
+                               quatComps[:, 1:, :-1])
+        qix[1:4] *= -1
+        qiy[1:4] *= -1
+
+        misoquatx = Quat.quatProduct(qix, q0)
+        misoquaty = Quat.quatProduct(qiy, q0)
+        # change stepsize to meters
+        betaderx[:, :, :-1, :-1] = (Quat.calcRotMatrix(misoquatx) -
+                                    np.eye(3)[:, :, np.newaxis, np.newaxis]) / self.stepSize / 1e-6
+        betadery[:, :, :-1, :-1] = (Quat.calcRotMatrix(misoquaty) -
+                                    np.eye(3)[:, :, np.newaxis, np.newaxis]) / self.stepSize / 1e-6
 
         # Calculate the Nye Tensor
-        alpha = np.empty((3, 3, self.yDim, self.xDim))
+        alpha = np.empty((3, 3, self.yDim, self.xDim), dtype=self.precision)
         bavg = 1.4e-10  # Burgers vector
         alpha[0, 2] = (betadery[0, 0] - betaderx[0, 1]) / bavg
         alpha[1, 2] = (betadery[1, 0] - betaderx[1, 1]) / bavg
@@ -538,75 +691,226 @@ class Map(base.Map):
 
         if self.quatArray is None:
             # create the array of quat objects
-            self.quatArray = Quat.createManyQuats(self.eulerAngleArray)
+            self.quatArray = QuatArray.fromEulerAngles(
+                *self.eulerAngleArray, dtype=self.precision
+            )
+        elif self.quatArray.quatCoef.dtype != self.precision:
+            # precision has been changed since the array was built
+            self.quatArray = QuatArray(self.quatArray.quatCoef,
+                                       dtype=self.precision)
+            self.fzQuatArray = None
+            self.fzSymIdxs = None
+            self.pixelOriIndex = None
+            self.grainOriIndex = None
+
+        yield 1.
+
+    @reportProgress("reducing orientations to fundamental zone")
+    def buildFZQuatArray(self):
+        """
+        Build array of orientations reduced to the fundamental zone,
+        see `Quat.calcFundZone`. Stored in self.fzQuatArray with the
+        symmetry operators used in self.fzSymIdxs. Neighbouring points
+        in the reduced map are mostly related by the identity, so
+        misorientation calculations using it rarely need to search the
+        symmetric equivalents.
+        """
+        self.buildQuatArray()
+
+        if self.fzQuatArray is None:
+            fzQuatComps, fzSymIdxs = Quat.calcFundZone(
+                self.quatArray.quatCoef, self.crystalSym
+            )
+            self.fzQuatArray = QuatArray(
+                fzQuatComps.reshape((4, self.yDim, self.xDim)),
+                dtype=self.precision
+            )
+            self.fzSymIdxs = fzSymIdxs.reshape((self.yDim, self.xDim))
+            self.pixelNeighbourMisOri = None
+            self.pixelNeighbourSymIdxs = None
+            self.segmentationEdges = None
+            self.segmentationMisOri = None
+
+        yield 1.
+
+    @reportProgress("calculating neighbour misorientation")
+    def calcPixelNeighbourMisOri(self, memoryBudget=None):
+        """
+        Calculate misorientation of each point to its +x and +y
+        neighbours, taking into account crystal symmetry. Results are
+        stored in self.pixelNeighbourMisOri with the index of the symmetry
+        operator giving the minimum in self.pixelNeighbourSymIdxs, and are
+        reused by boundary detection, KAM and Nye tensor calculations
+        until the map data is transformed.
+
+        The map is processed in bands of rows (with the row below each
+        band as a halo for the +y neighbour) sized to keep working arrays
+        within a memory budget. Results do not depend on the band size.
+        scripts/benchmark_neighbour_misori.py measures run time and peak
+        memory for a range of budgets.
+
+        Parameters
+        ----------
+        memoryBudget : int, optional
+            Approximate memory in bytes to use for working arrays,
+            defaults to self.memoryBudget
+
+        """
+        self.buildFZQuatArray()
+
+        if self.pixelNeighbourMisOri is not None:
+            yield 1.
+            return
+
+        if memoryBudget is None:
+            memoryBudget = self.memoryBudget
+
+        quatComps = self.fzQuatArray.quatCoef
+
+        # Last column/row has no neighbour so left at 0 (180 degrees)
+        misOris = np.zeros((2, self.yDim, self.xDim), dtype=self.precision)
+        symIdxs = np.zeros((2, self.yDim, self.xDim), dtype=np.int8)
+
+        bandRows = self._misOriBandRows(memoryBudget)
+
+        for startRow in range(0, self.yDim, bandRows):
+            endRow = min(startRow + bandRows, self.yDim)
+            band = slice(startRow, endRow)
+            chunkSize = (endRow - startRow) * self.xDim
+
+            misOri, symIdx = Quat.misOriMany(
+                quatComps[:, band, :-1], quatComps[:, band, 1:],
+                self.crystalSym, returnSymIdx=True, chunkSize=chunkSize
+            )
+            misOris[0, band, :-1] = misOri.reshape((-1, self.xDim - 1))
+            symIdxs[0, band, :-1] = symIdx.reshape((-1, self.xDim - 1))
+
+            # +y neighbour, including the first row of the next band
+            endRow = min(endRow, self.yDim - 1)
+            if endRow > startRow:
+                band = slice(startRow, endRow)
+                haloBand = slice(startRow + 1, endRow + 1)
+                misOri, symIdx = Quat.misOriMany(
+                    quatComps[:, band, :], quatComps[:, haloBand, :],
+                    self.crystalSym, returnSymIdx=True, chunkSize=chunkSize
+                )
+                misOris[1, band, :] = misOri.reshape((-1, self.xDim))
+                symIdxs[1, band, :] = symIdx.reshape((-1, self.xDim))
+
+            yield endRow / self.yDim
+
+        self.pixelNeighbourMisOri = misOris
+        self.pixelNeighbourSymIdxs = symIdxs
 
         yield 1.
 
+    def _misOriChunkSize(self, memoryBudget):
+        """
+        Number of pairs of points to process together when calculating
+        misorientations, to keep working arrays within a memory budget.
+
+        Parameters
+        ----------
+        memoryBudget : int
+            Approximate memory in bytes to use for working arrays
+
+        Returns
+        -------
+        int
+
+        """
+        numSyms = len(Quat.symEqvComps(self.crystalSym))
+
+        # estimate of working memory per pair of points in misOriMany,
+        # copies of the orientations and misorientations to all
+        # symmetries in the worst case of every pair being searched
+        bytesPerPair = (28 + numSyms) * self.precision.itemsize + 32
+
+        return int(max(1, memoryBudget // bytesPerPair))
+
+    def _misOriBandRows(self, memoryBudget):
+        """
+        Number of rows of the map to process together when calculating
+        misorientation between neighbouring points, see
+        `_misOriChunkSize`.
+        """
+        return max(1, self._misOriChunkSize(memoryBudget) // self.xDim)
+
+    def buildPixelOriIndex(self):
+        """
+        Build orientation index of all points in the map, stored in
+        self.pixelOriIndex. Use `findPixelsByOri` to query it.
+        """
+        if self.pixelOriIndex is None:
+            self.buildFZQuatArray()
+            self.pixelOriIndex = OriIndex(self.fzQuatArray.quatCoef,
+                                          self.crystalSym)
+
+    def findPixelsByOri(self, quat, angle):
+        """
+        Find all points in the map with orientation within a
+        misorientation angle of the given orientation.
+
+        Parameters
+        ----------
+        quat : defdap.quat.Quat
+            Orientation to search for
+        angle : float
+            Maximum misorientation angle in degrees
+
+        Returns
+        -------
+        numpy.ndarray
+            Boolean map, True at matching points
+        numpy.ndarray
+            Map of misorientation angle in degrees to the orientation,
+            NaN at points that do not match
+        """
+        self.buildPixelOriIndex()
+        idxs, angles = self.pixelOriIndex.queryRadius(quat, angle)
+
+        angleMap = np.full(self.yDim * self.xDim, np.nan)
+        angleMap[idxs[0]] = angles[0]
+        angleMap = angleMap.reshape((self.yDim, self.xDim))
+
+        return ~np.isnan(angleMap), angleMap
+
     @reportProgress("finding grain boundaries")
-    def findBoundaries(self, boundDef=10):
+    def findBoundaries(self, boundDef=10, boundaryThresholds=None):
         """
-        Find grain boundaries
+        Find grain boundaries. Neighbour misorientations are calculated
+        once and kept on the map, so finding boundaries again with a
+        different critical misorientation only repeats the comparison.
 
         :param boundDef: critical misorientation
         :type boundDef: float
+        :param boundaryThresholds: list of critical misorientations to
+            return boundary maps for, stacked in the first axis. Sets
+            of boundaries for each are returned instead of updating
+            self.boundaries
+        :type boundaryThresholds: list(float)
+        :return: stack of boundary maps if boundaryThresholds given
         """
-        syms = Quat.symEqv(self.crystalSym)
-        numSyms = len(syms)
-
-        # array to store quat components of initial and symmetric equivalents
-        quatComps = np.empty((numSyms, 4, self.yDim, self.xDim))
-
-        # populate with initial quat components
-        for i, row in enumerate(self.quatArray):
-            for j, quat in enumerate(row):
-                quatComps[0, :, i, j] = quat.quatCoef
-
-        # loop of over symmetries and apply to initial quat components
-        # (excluding first symmetry as this is the identity transformation)
-        for i, sym in enumerate(syms[1:], start=1):
-            # sym[i] * quat for all points (* is quaternion product)
-            quatComps[i, 0] = (quatComps[0, 0] * sym[0] - quatComps[0, 1] * sym[1] -
-                               quatComps[0, 2] * sym[2] - quatComps[0, 3] * sym[3])
-            quatComps[i, 1] = (quatComps[0, 0] * sym[1] + quatComps[0, 1] * sym[0] -
-                               quatComps[0, 2] * sym[3] + quatComps[0, 3] * sym[2])
-            quatComps[i, 2] = (quatComps[0, 0] * sym[2] + quatComps[0, 2] * sym[0] -
-                               quatComps[0, 3] * sym[1] + quatComps[0, 1] * sym[3])
-            quatComps[i, 3] = (quatComps[0, 0] * sym[3] + quatComps[0, 3] * sym[0] -
-                               quatComps[0, 1] * sym[2] + quatComps[0, 2] * sym[1])
-
-            # swap into positve hemisphere if required
-            quatComps[i, :, quatComps[i, 0] < 0] *= -1
-
-        # Arrays to store neigbour misorientation in positive x and y direction
-        misOrix = np.zeros((numSyms, self.yDim, self.xDim))
-        misOriy = np.zeros((numSyms, self.yDim, self.xDim))
-
-        # loop over symmetries calculating misorientation to initial
-        for i in range(numSyms):
-            for j in range(self.xDim - 1):
-                misOrix[i, :, j] = abs(np.einsum("ij,ij->j", quatComps[0, :, :, j], quatComps[i, :, :, j + 1]))
-
-            for j in range(self.yDim - 1):
-                misOriy[i, j, :] = abs(np.einsum("ij,ij->j", quatComps[0, :, j, :], quatComps[i, :, j + 1, :]))
-
-        misOrix[misOrix > 1] = 1
-        misOriy[misOriy > 1] = 1
-
-        # find min misorientation (max here as misorientaion is cos of this)
-        misOrix = np.max(misOrix, axis=0)
-        misOriy = np.max(misOriy, axis=0)
-
-        # convert to misorientation in degrees
-        misOrix = 360 * np.arccos(misOrix) / np.pi
-        misOriy = 360 * np.arccos(misOriy) / np.pi
-
-        # set boundary locations where misOrix or misOriy are greater than set value
-        self.boundaries = np.zeros((self.yDim, self.xDim), dtype=int)
+        self.calcPixelNeighbourMisOri()
+
+        # minimum of misorientation (maximum angle) to the +x and +y
+        # neighbours. Map edge is always marked as boundary
+        misOri = self.pixelNeighbourMisOri.min(axis=0)
 
-        for i in range(self.xDim):
-            for j in range(self.yDim):
-                if (misOrix[j, i] > boundDef) or (misOriy[j, i] > boundDef):
-                    self.boundaries[j, i] = -1
+        if boundaryThresholds is not None:
+            boundCos = np.cos(np.deg2rad(boundaryThresholds) / 2)
+            boundaries = np.zeros((len(boundCos), self.yDim, self.xDim),
+                                  dtype=int)
+            boundaries[misOri < boundCos[:, np.newaxis, np.newaxis]] = -1
+
+            yield 1.
+            return boundaries
+
+        # set boundary locations where misorientation is greater than
+        # set value
+        boundCos = np.cos(np.deg2rad(boundDef) / 2)
+        self.boundaries = np.zeros((self.yDim, self.xDim), dtype=int)
+        self.boundaries[misOri < boundCos] = -1
 
         yield 1.
 
@@ -668,47 +972,308 @@ class Map(base.Map):
         return plot
 
     @reportProgress("finding grains")
-    def findGrains(self, minGrainSize=10):
+    def findGrains(self, minGrainSize=10, misOriThreshold=None,
+                   connectivity=4):
         """
-        Find grains and assign ids
+        Find grains and assign ids. By default grains are regions
+        enclosed by the boundaries found with `findBoundaries`. If a
+        misorientation threshold is given grains are instead found from
+        the segmentation tree (see `segmentGrains`) and boundaries are
+        set between neighbouring points in different grains.
 
         :param minGrainSize: Minimum grain area in pixels
+        :param misOriThreshold: critical misorientation in degrees to
+            segment grains at using the segmentation tree
+        :type misOriThreshold: float
+        :param connectivity: connectivity of points when segmenting,
+            4 or 8
         """
-        # Initialise the grain map
-        self.grains = np.copy(self.boundaries)
+        if misOriThreshold is None:
+            self.grains = self.labelGrains(self.boundaries, minGrainSize)
+        else:
+            self.grains = self.segmentGrains(
+                misOriThreshold, minGrainSize=minGrainSize,
+                connectivity=connectivity
+            )
 
+            # Map edge is always marked as boundary
+            self.boundaries = np.zeros((self.yDim, self.xDim), dtype=int)
+            self.boundaries[:, -1] = -1
+            self.boundaries[-1, :] = -1
+            self.boundaries[:, :-1][self.grains[:, :-1] != self.grains[:, 1:]] = -1
+            self.boundaries[:-1, :][self.grains[:-1, :] != self.grains[1:, :]] = -1
+        yield 0.5
+
+        # grains are views of the grain index of the map
+        self.buildGrainIndex()
+        self.grainSchmidFactors = None
+        self.misOri = None
+        self.misOriAxis = None
         self.grainList = []
+        for start, end in zip(self.grainOffsets[:-1], self.grainOffsets[1:]):
+            grain = Grain(self)
+            grain.pointIdxs = self.grainPointIdxs[start:end]
+            self.grainList.append(grain)
 
-        # List of points where no grain has be set yet
-        unknownPoints = np.where(self.grains == 0)
-        numPoints = unknownPoints[0].shape[0]
-        totalPoints = numPoints
-        # Start counter for grains
-        grainIndex = 1
-
-        # Loop until all points (except boundaries) have been assigned
-        # to a grain or ignored
-        while numPoints > 0:
-            # report progress
-            yield 1. - numPoints / totalPoints
-
-            # Flood fill first unknown point and return grain object
-            currentGrain = self.floodFill(unknownPoints[1][0], unknownPoints[0][0], grainIndex)
-
-            grainSize = len(currentGrain)
-            if grainSize < minGrainSize:
-                # if grain size less than minimum, ignore grain and set
-                # values in grain map to -2
-                for coord in currentGrain.coordList:
-                    self.grains[coord[1], coord[0]] = -2
-            else:
-                # add grain and size to lists and increment grain label
-                self.grainList.append(currentGrain)
-                grainIndex += 1
+        yield 1.
+
+    @staticmethod
+    def labelGrains(boundaries, minGrainSize=10):
+        """
+        Label grains in a boundary map. Points not on a boundary are
+        labelled as connected regions. A boundary point is added to the
+        first grain (in raster order of the first point of each grain)
+        that has a point directly to the left of or above it.
+
+        Parameters
+        ----------
+        boundaries : numpy.ndarray shape (yDim, xDim)
+            Boundary map, -1 for a boundary and 0 otherwise
+        minGrainSize : int, optional
+            Minimum grain area in pixels
+
+        Returns
+        -------
+        numpy.ndarray shape (yDim, xDim)
+            Grain map with ids starting at 1, numbered in raster order of
+            the first point of each grain. Boundary points not assigned
+            to a grain are -1 and points in grains smaller than the
+            minimum size are -2.
+
+        """
+        # labels are numbered in raster order of the first point of each
+        # region, which is the order regions would be flood filled in
+        labels, numLabels = ndimage.label(boundaries == 0)
+
+        # boundary points take the lowest label to the left or above
+        maxLabel = numLabels + 1
+        leftLabels = np.full_like(labels, maxLabel)
+        leftLabels[:, 1:] = labels[:, :-1]
+        upLabels = np.full_like(labels, maxLabel)
+        upLabels[1:, :] = labels[:-1, :]
+        leftLabels[leftLabels == 0] = maxLabel
+        upLabels[upLabels == 0] = maxLabel
+        boundaryLabels = np.minimum(leftLabels, upLabels)
+        boundaryLabels[boundaryLabels == maxLabel] = 0
+
+        isBoundary = boundaries != 0
+        labels[isBoundary] = boundaryLabels[isBoundary]
+
+        return Map._removeSmallGrains(labels, numLabels, minGrainSize)
+
+    @staticmethod
+    def _removeSmallGrains(labels, numLabels, minGrainSize):
+        """
+        Renumber labelled regions at least the minimum grain size from
+        1, keeping their order, and mark the rest with -2. Points with
+        label 0 are not in a region and are marked with -1.
+        """
+        grainSizes = np.bincount(labels.ravel(), minlength=numLabels + 1)
+        keep = grainSizes >= minGrainSize
+        keep[0] = False
+        labelMap = np.where(keep, np.cumsum(keep), -2)
+        labelMap[0] = -1
+
+        return labelMap[labels]
+
+    def floodFill(self, x, y, grainIndex):
+        """
+        Add the unassigned points connected to a point to a new grain.
+        Boundary points with a point of the grain directly to the left
+        or above are also added. Deprecated, grains are labelled in one
+        pass by `findGrains`.
+
+        Parameters
+        ----------
+        x, y : int
+            Coordinates of the first point of the grain
+        grainIndex : int
+            Value to mark the points of the grain with in self.grains
+
+        Returns
+        -------
+        defdap.ebsd.Grain
+
+        """
+        warnings.warn("floodFill is deprecated, use findGrains or "
+                      "labelGrains instead", DeprecationWarning,
+                      stacklevel=2)
+        self.buildQuatArray()
+
+        labels, _ = ndimage.label(self.grains == 0)
+        inGrain = labels == labels[y, x]
+        # boundary points are added to the grain to their left or above
+        leftInGrain = np.zeros_like(inGrain)
+        leftInGrain[:, 1:] = inGrain[:, :-1]
+        upInGrain = np.zeros_like(inGrain)
+        upInGrain[1:, :] = inGrain[:-1, :]
+        inGrain |= (self.grains == -1) & (leftInGrain | upInGrain)
+        self.grains[inGrain] = grainIndex
+
+        currentGrain = Grain(self)
+        for pointY, pointX in np.argwhere(inGrain):
+            currentGrain.addPoint((pointX, pointY),
+                                  self.quatArray[pointY, pointX])
+
+        return currentGrain
+
+    @reportProgress("building segmentation tree")
+    def buildSegmentationTree(self, connectivity=4, memoryBudget=None):
+        """
+        Build a segmentation hierarchy of the map. Points are nodes of a
+        graph with edges between neighbouring points weighted by their
+        misorientation. Edges of a minimum spanning forest of the graph
+        are found by sorting all edges by misorientation and joining
+        points with union-find (Kruskal's algorithm), then stored in
+        order in self.segmentationEdges and self.segmentationMisOri.
+        Points connected by the edges below a threshold misorientation
+        are the connected regions of the map at that threshold, so
+        grains at any threshold can be found from the tree without
+        recalculating misorientations, see `segmentGrains`.
+
+        Parameters
+        ----------
+        connectivity : int, {4, 8}
+            Connect each point to its 4 edge neighbours, or to its 8
+            edge and corner neighbours
+        memoryBudget : int, optional
+            Approximate memory in bytes to use for working arrays when
+            calculating misorientation to corner neighbours, defaults to
+            self.memoryBudget
 
-            # update unknown points
-            unknownPoints = np.where(self.grains == 0)
-            numPoints = unknownPoints[0].shape[0]
+        """
+        if connectivity not in (4, 8):
+            raise ValueError("Connectivity must be 4 or 8.")
+
+        if (self.segmentationEdges is not None and
+                self.segmentationConnectivity == connectivity):
+            yield 1.
+            return
+
+        self.calcPixelNeighbourMisOri()
+
+        numPoints = self.yDim * self.xDim
+        pointIdxs = np.arange(numPoints).reshape((self.yDim, self.xDim))
+
+        # +x and +y neighbours
+        edgeStarts = [pointIdxs[:, :-1], pointIdxs[:-1, :]]
+        edgeEnds = [pointIdxs[:, 1:], pointIdxs[1:, :]]
+        edgeMisOris = [self.pixelNeighbourMisOri[0, :, :-1],
+                       self.pixelNeighbourMisOri[1, :-1, :]]
+
+        if connectivity == 8:
+            # +x+y and -x+y neighbours
+            if memoryBudget is None:
+                memoryBudget = self.memoryBudget
+            quatComps = self.fzQuatArray.quatCoef
+            cornerMisOris = np.empty((2, self.yDim - 1, self.xDim - 1),
+                                     dtype=self.precision)
+            bandRows = self._misOriBandRows(memoryBudget)
+            for startRow in range(0, self.yDim - 1, bandRows):
+                endRow = min(startRow + bandRows, self.yDim - 1)
+                band = slice(startRow, endRow)
+                haloBand = slice(startRow + 1, endRow + 1)
+                chunkSize = (endRow - startRow) * (self.xDim - 1)
+
+                cornerMisOris[0, band] = Quat.misOriMany(
+                    quatComps[:, band, :-1], quatComps[:, haloBand, 1:],
+                    self.crystalSym, chunkSize=chunkSize
+                ).reshape((-1, self.xDim - 1))
+                cornerMisOris[1, band] = Quat.misOriMany(
+                    quatComps[:, band, 1:], quatComps[:, haloBand, :-1],
+                    self.crystalSym, chunkSize=chunkSize
+                ).reshape((-1, self.xDim - 1))
+
+                yield 0.5 * endRow / (self.yDim - 1)
+
+            edgeStarts += [pointIdxs[:-1, :-1], pointIdxs[:-1, 1:]]
+            edgeEnds += [pointIdxs[1:, 1:], pointIdxs[1:, :-1]]
+            edgeMisOris += [cornerMisOris[0], cornerMisOris[1]]
+
+        edgeStarts = np.concatenate([idxs.ravel() for idxs in edgeStarts])
+        edgeEnds = np.concatenate([idxs.ravel() for idxs in edgeEnds])
+        # weights increase with misorientation angle and are kept above
+        # 0 because zero weight edges are dropped from sparse graphs
+        edgeWeights = 2. - np.concatenate(
+            [misOri.ravel() for misOri in edgeMisOris]
+        ).astype(np.float64)
+
+        graph = sparse.csr_matrix((edgeWeights, (edgeStarts, edgeEnds)),
+                                  shape=(numPoints, numPoints))
+        del edgeStarts, edgeEnds, edgeWeights
+        yield 0.75
+
+        tree = csgraph.minimum_spanning_tree(graph).tocoo()
+        del graph
+        edgeOrder = np.argsort(tree.data, kind='stable')
+
+        self.segmentationEdges = np.stack((tree.row[edgeOrder],
+                                           tree.col[edgeOrder]))
+        self.segmentationMisOri = (2. - tree.data[edgeOrder]).astype(
+            self.precision
+        )
+        self.segmentationConnectivity = connectivity
+
+        yield 1.
+
+    def segmentGrains(self, misOriThresholds, minGrainSize=10,
+                      connectivity=4):
+        """
+        Segment the map into grains at one or more misorientation
+        thresholds using the segmentation tree, which is built on the
+        first call (see `buildSegmentationTree`). Neighbouring points
+        with misorientation at or below a threshold are in the same
+        grain, so grains at a lower threshold (e.g. subgrains at 2
+        degrees) are always contained within grains at a higher
+        threshold (e.g. grains at 10 degrees). Each map takes time
+        linear in the number of points.
+
+        Parameters
+        ----------
+        misOriThresholds : float or list(float)
+            Critical misorientation(s) in degrees
+        minGrainSize : int, optional
+            Minimum grain area in pixels
+        connectivity : int, {4, 8}
+            Connectivity of points
+
+        Returns
+        -------
+        numpy.ndarray shape (yDim, xDim) or (numThresholds, yDim, xDim)
+            Grain maps with ids starting at 1, numbered in raster order
+            of the first point of each grain. Points in grains smaller
+            than the minimum size are -2.
+
+        """
+        self.buildSegmentationTree(connectivity=connectivity)
+
+        numPoints = self.yDim * self.xDim
+        thresholdCos = np.cos(np.deg2rad(misOriThresholds) / 2)
+        # number of edges at or below each threshold
+        numEdges = np.searchsorted(-self.segmentationMisOri,
+                                   -np.atleast_1d(thresholdCos),
+                                   side='right')
+
+        grainMaps = np.empty((len(numEdges), self.yDim, self.xDim),
+                             dtype=int)
+        for i, n in enumerate(numEdges):
+            graph = sparse.csr_matrix(
+                (np.ones(n, dtype=bool), self.segmentationEdges[:, :n]),
+                shape=(numPoints, numPoints)
+            )
+            # components are numbered in order of their lowest point
+            # index, the raster order of the first point of each grain
+            numLabels, labels = csgraph.connected_components(
+                graph, directed=False
+            )
+            grainMaps[i] = self._removeSmallGrains(
+                labels.reshape((self.yDim, self.xDim)) + 1,
+                numLabels, minGrainSize
+            )
+
+        if np.ndim(misOriThresholds) == 0:
+            return grainMaps[0]
+        return grainMaps
 
     def plotGrainMap(self, **kwargs):
         """
@@ -726,79 +1291,287 @@ class Map(base.Map):
 
         return plot
 
-    def floodFill(self, x, y, grainIndex):
-        currentGrain = Grain(self)
+    @reportProgress("calculating grain mean orientations")
+    def calcGrainAvOris(self, nWorkers=None):
+        """Calculate the mean orientation of all grains in a single
+        pass, see `Quat.calcAverageOriMany`. Stored as refOri of each
+        grain.
 
-        currentGrain.addPoint((x, y), self.quatArray[y, x])
-
-        edge = [(x, y)]
-        grain = [(x, y)]
-
-        self.grains[y, x] = grainIndex
-        while edge:
-            newedge = []
-
-            for (x, y) in edge:
-                moves = np.array([(x+1, y), (x-1, y), (x, y+1), (x, y-1)])
-
-                movesIndexShift = 0
-                if x <= 0:
-                    moves = np.delete(moves, 1, 0)
-                    movesIndexShift = 1
-                elif x >= self.xDim - 1:
-                    moves = np.delete(moves, 0, 0)
-                    movesIndexShift = 1
-
-                if y <= 0:
-                    moves = np.delete(moves, 3 - movesIndexShift, 0)
-                elif y >= self.yDim - 1:
-                    moves = np.delete(moves, 2 - movesIndexShift, 0)
-
-                for (s, t) in moves:
-                    if self.grains[t, s] == 0:
-                        currentGrain.addPoint((s, t), self.quatArray[t, s])
-                        newedge.append((s, t))
-                        grain.append((s, t))
-                        self.grains[t, s] = grainIndex
-                    elif self.grains[t, s] == -1 and (s > x or t > y):
-                        currentGrain.addPoint((s, t), self.quatArray[t, s])
-                        grain.append((s, t))
-                        self.grains[t, s] = grainIndex
-
-            if newedge == []:
-                return currentGrain
-            else:
-                edge = newedge
+        Parameters
+        ----------
+        nWorkers : int, optional
+            Number of worker processes to share grains between,
+            defaults to the number set with `defdap.utils.setNumWorkers`
 
-    @reportProgress("calculating grain mean orientations")
-    def calcGrainAvOris(self):
+        """
         # Check that grains have been detected in the map
         self.checkGrainsDetected()
 
         numGrains = len(self)
-        for iGrain, grain in enumerate(self):
-            grain.calcAverageOri()
+        nWorkers = getNumWorkers(nWorkers)
+        if nWorkers > 1:
+            grainRanges = splitRanges(np.diff(self.grainOffsets),
+                                      4 * nWorkers)
+        else:
+            grainRanges = [(0, numGrains)]
+
+        # average the fundamental zone reduced orientations then rotate
+        # each mean back to the symmetric equivalent closest to the
+        # orientation of the first point of the grain
+        self.buildFZQuatArray()
+        avOriComps = np.empty((4, numGrains), dtype=self.precision)
+        results = runParallel(
+            self._grainAvOriTask,
+            [grainRange + (self.crystalSym,) for grainRange in grainRanges],
+            inputs={'quatComps': self.fzQuatArray.quatCoef.reshape((4, -1)),
+                    'grainPointIdxs': self.grainPointIdxs,
+                    'grainOffsets': self.grainOffsets},
+            outputs={'avOriComps': avOriComps},
+            nWorkers=nWorkers
+        )
+        for i, _ in enumerate(results):
+            yield 0.9 * (i + 1) / len(grainRanges)
 
-            # report progress
-            yield (iGrain + 1) / numGrains
+        seedIdxs = self.grainPointIdxs[self.grainOffsets[:-1]]
+        seedSymIdxs = self.fzSymIdxs.ravel()[seedIdxs]
+        symInvComps = Quat.symEqvComps(self.crystalSym)[seedSymIdxs].T
+        symInvComps = symInvComps * np.array([[1], [-1], [-1], [-1]])
+        avOriComps = Quat.quatProduct(symInvComps.astype(avOriComps.dtype),
+                                      avOriComps)
+        avOriComps[:, avOriComps[0] < 0] *= -1
+
+        for grain, avOri in zip(self, avOriComps.T):
+            grain.refOri = Quat(avOri)
+        self.grainOriIndex = None
+
+        yield 1.
+
+    @staticmethod
+    def _grainAvOriTask(arrays, task):
+        """Mean orientation of a range of grains of the grain index, see
+        `calcGrainAvOris`."""
+        startGrain, endGrain, crystalSym = task
+        grainOffsets = arrays['grainOffsets']
+        start, end = grainOffsets[startGrain], grainOffsets[endGrain]
+        labels = np.searchsorted(grainOffsets, np.arange(start, end),
+                                 side='right') - 1 - startGrain
+
+        avOriComps = Quat.calcAverageOriMany(
+            arrays['quatComps'][:, arrays['grainPointIdxs'][start:end]],
+            labels, crystalSym, numLabels=endGrain - startGrain
+        )
+        arrays['avOriComps'][:, startGrain:endGrain] = avOriComps
+
+    def grainEulerAngles(self):
+        """Bunge Euler angles of the reference (mean) orientation of
+        every grain, calculated in a single batch.
+
+        Returns
+        -------
+        np.ndarray shape (3, numGrains)
+            Euler angles in radians
+
+        """
+        # Check that grains have been detected in the map
+        self.checkGrainsDetected()
+
+        refOris = Quat.extractQuatComps([grain.refOri for grain in self])
+
+        return Quat.calcEulerAngles(refOris)
 
     @reportProgress("calculating grain misorientations")
-    def calcGrainMisOri(self, calcAxis=False):
+    def calcGrainMisOri(self, calcAxis=False, memoryBudget=None,
+                        nWorkers=None):
         """
-        Calculate grain misorientation
+        Calculate the misorientation of every point in a grain to the
+        reference (mean) orientation of the grain, the grain reference
+        orientation deviation (GROD), and optionally the misorientation
+        axis. All grains are processed together in chunks of points of
+        the grain index. Results are stored as maps in self.misOri (cos
+        of half angle, 1 outside grains) and self.misOriAxis (0 outside
+        grains). The misOriList and misOriAxisList of each grain are
+        views of the results for the points of the grain. Without
+        calcAxis, any axes from an earlier call are cleared.
 
         :param calcAxis: Calculate the misorientation axis also
-        :return:
+        :param memoryBudget: Approximate memory in bytes to use for
+            working arrays (of each worker), defaults to
+            self.memoryBudget
+        :type memoryBudget: int
+        :param nWorkers: Number of worker processes to share chunks
+            between, defaults to the number set with
+            `defdap.utils.setNumWorkers`
+        :type nWorkers: int
         """
         # Check that grains have been detected in the map
         self.checkGrainsDetected()
 
-        numGrains = len(self)
-        for iGrain, grain in enumerate(self):
-            grain.buildMisOriList(calcAxis=calcAxis)
+        if memoryBudget is None:
+            memoryBudget = self.memoryBudget
+
+        # calculate mean orientation of grains without a reference
+        refOris = [grain.refOri for grain in self]
+        if any(refOri is None for refOri in refOris):
+            self.calcGrainAvOris(nWorkers=nWorkers)
+            for grain, refOri in zip(self, refOris):
+                if refOri is not None:
+                    grain.refOri = refOri
+        refOriComps = Quat.extractQuatComps(
+            [grain.refOri for grain in self]
+        ).astype(self.precision)
+
+        # misorientations in the order of the grain index
+        numPoints = self.grainOffsets[-1]
+        misOris = np.empty(numPoints, dtype=self.precision)
+        outputs = {'misOris': misOris}
+        if calcAxis:
+            misOriAxes = np.empty((numPoints, 3), dtype=self.precision)
+            outputs['misOriAxes'] = misOriAxes
+
+        chunkSize = self._misOriChunkSize(memoryBudget)
+        nWorkers = getNumWorkers(nWorkers)
+        if nWorkers > 1:
+            # several chunks per worker to balance the load
+            chunkSize = min(chunkSize, -(-numPoints // (4 * nWorkers)))
+        tasks = [(start, min(start + chunkSize, numPoints),
+                  self.crystalSym, calcAxis)
+                 for start in range(0, numPoints, chunkSize)]
+
+        results = runParallel(
+            self._grainMisOriTask, tasks,
+            inputs={'quatComps': self.quatArray.quatCoef.reshape((4, -1)),
+                    'refOriComps': refOriComps,
+                    'grainPointIdxs': self.grainPointIdxs,
+                    'grainOffsets': self.grainOffsets},
+            outputs=outputs, nWorkers=nWorkers
+        )
+        for i, _ in enumerate(results):
+            yield (i + 1) / len(tasks)
+
+        self.misOri = np.ones((self.yDim, self.xDim), dtype=self.precision)
+        self.misOri.ravel()[self.grainPointIdxs] = misOris
+        if calcAxis:
+            self.misOriAxis = np.zeros((3, self.yDim, self.xDim),
+                                       dtype=self.precision)
+            self.misOriAxis.reshape((3, -1))[:, self.grainPointIdxs] = \
+                misOriAxes.T
+        else:
+            # axes from an earlier call are for different orientations
+            self.misOriAxis = None
+
+        averageMisOris = np.add.reduceat(
+            misOris, self.grainOffsets[:-1], dtype=np.float64
+        ) / np.diff(self.grainOffsets)
+        averageMisOris = averageMisOris.astype(self.precision)
+
+        for i, grain in enumerate(self):
+            start, end = self.grainOffsets[i], self.grainOffsets[i + 1]
+            grain.misOriList = misOris[start:end]
+            grain.averageMisOri = averageMisOris[i]
+            grain.misOriAxisList = (misOriAxes[start:end] if calcAxis
+                                    else None)
+
+    @staticmethod
+    def _grainMisOriTask(arrays, task):
+        """Misorientation of a chunk of points of the grain index to the
+        reference orientation of their grain, see `calcGrainMisOri`."""
+        start, end, crystalSym, calcAxis = task
+        grainIds = np.searchsorted(arrays['grainOffsets'],
+                                   np.arange(start, end), side='right') - 1
+
+        results = Quat.misOriMany(
+            arrays['refOriComps'][:, grainIds],
+            arrays['quatComps'][:, arrays['grainPointIdxs'][start:end]],
+            crystalSym, calcAxis=calcAxis, chunkSize=end - start
+        )
+        if calcAxis:
+            arrays['misOris'][start:end] = results[0]
+            arrays['misOriAxes'][start:end] = results[1].T
+        else:
+            arrays['misOris'][start:end] = results
+
+    def buildGrainOriIndex(self):
+        """
+        Build orientation index of the reference orientation of all
+        grains, stored in self.grainOriIndex. Mean orientations are
+        calculated first if required.
+        """
+        self.checkGrainsDetected()
+
+        if self.grainOriIndex is None:
+            if any(grain.refOri is None for grain in self):
+                self.calcGrainAvOris()
+            self.grainOriIndex = OriIndex([grain.refOri for grain in self],
+                                          self.crystalSym)
+
+    def findGrainsByOri(self, quats, angle=None, k=None):
+        """
+        Find grains by their reference orientation. Either all grains
+        within a misorientation angle of each orientation or the k
+        grains with closest orientation are found. This can be used to
+        extract texture components or to match grains between maps by
+        orientation, e.g. ``ebsdMap.findGrainsByOri([grain.refOri for
+        grain in otherMap], k=1)``.
+
+        Parameters
+        ----------
+        quats : defdap.quat.Quat or list(defdap.quat.Quat) or defdap.quat.QuatArray
+            Orientations to search for
+        angle : float, optional
+            Maximum misorientation angle in degrees
+        k : int, optional
+            Number of grains to find for each orientation
+
+        Returns
+        -------
+        grainIds : list(numpy.ndarray) or numpy.ndarray shape (m, k)
+            IDs of found grains for each orientation, sorted by
+            misorientation angle
+        angles : list(numpy.ndarray) or numpy.ndarray shape (m, k)
+            Misorientation angle in degrees of the found grains
+        """
+        if (angle is None) == (k is None):
+            raise ValueError("Specify one of angle or k.")
+
+        self.buildGrainOriIndex()
+
+        if angle is not None:
+            return self.grainOriIndex.queryRadius(quats, angle)
+        return self.grainOriIndex.queryNearest(quats, k=k)
+
+    def calcNeighbourMisOri(self, calcAxis=False):
+        """Calculate the misorientation between the reference
+        orientations of every pair of neighbouring grains. Results are
+        stored as 'misOri' (and 'misOriAxis') attributes of the edges
+        of neighbourNetwork. Angle is 2*arccos(misOri).
+
+        Parameters
+        ----------
+        calcAxis : bool, optional
+            Calculate the misorientation axis also
+
+        """
+        if self.neighbourNetwork is None:
+            self.buildNeighbourNetwork()
+
+        edges = list(self.neighbourNetwork.edges)
+        if len(edges) == 0:
+            return
+        grainIdsA, grainIdsB = np.array(edges).T
+
+        refOris = Quat.extractQuatComps([grain.refOri for grain in self])
+        result = Quat.misOriMany(refOris[:, grainIdsA], refOris[:, grainIdsB],
+                                 self.crystalSym, calcAxis=calcAxis)
+        if calcAxis:
+            misOris, misOriAxes = result
+        else:
+            misOris = result
 
-            # report progress
-            yield (iGrain + 1) / numGrains
+        for i, edge in enumerate(edges):
+            edgeData = self.neighbourNetwork.edges[edge]
+            edgeData['misOri'] = misOris[i]
+            if calcAxis:
+                edgeData['misOriAxis'] = misOriAxes[:, i]
 
     def plotMisOriMap(self, component=0, **kwargs):
         """
@@ -820,21 +1593,17 @@ class Map(base.Map):
         # Check that grains have been detected in the map
         self.checkGrainsDetected()
 
-        self.misOri = np.ones([self.yDim, self.xDim])
-
         if component in [1, 2, 3]:
-            for grain in self.grainList:
-                for coord, misOriAxis in zip(grain.coordList, np.array(grain.misOriAxisList)):
-                    self.misOri[coord[1], coord[0]] = misOriAxis[component - 1]
+            if self.misOriAxis is None:
+                self.calcGrainMisOri(calcAxis=True)
 
-            misOri = self.misOri * 180 / np.pi
+            misOri = self.misOriAxis[component - 1] * 180 / np.pi
             cLabel = "Rotation around {:} axis ($^\circ$)".format(
                 ['X', 'Y', 'Z'][component-1]
             )
         else:
-            for grain in self.grainList:
-                for coord, misOri in zip(grain.coordList, grain.misOriList):
-                    self.misOri[coord[1], coord[0]] = misOri
+            if self.misOri is None:
+                self.calcGrainMisOri()
 
             misOri = np.arccos(self.misOri) * 360 / np.pi
             cLabel = "Grain reference orienation deviation (GROD) ($^\circ$)"
@@ -881,7 +1650,9 @@ class Map(base.Map):
     def calcAverageGrainSchmidFactors(self, loadVector, slipSystems=None):
         """
         Calculates Schmid factors for all slip systems, for all grains,
-        based on average grain orientation
+        based on average grain orientation. Stored for all grains in
+        self.grainSchmidFactors and grouped by slip plane in the
+        averageSchmidFactors of each grain.
 
         :param loadVector: Loading vector, e.g. [1, 0, 0]
         :param slipSystems: Slip systems
@@ -889,22 +1660,136 @@ class Map(base.Map):
         # Check that grains have been detected in the map
         self.checkGrainsDetected()
 
-        numGrains = len(self)
-        for iGrain, grain in enumerate(self.grainList):
-            grain.calcAverageSchmidFactors(loadVector, slipSystems=slipSystems)
+        if slipSystems is None:
+            slipSystems = self.slipSystems
+        if any(grain.refOri is None for grain in self):
+            self.calcGrainAvOris()
+
+        # Transform the load vector into the crystal coordinates of
+        # every grain at once then calculate for all slip systems
+        refOriComps = Quat.extractQuatComps([grain.refOri for grain in self])
+        loadVectorsCrystal = Quat.calcTransformVectors(refOriComps,
+                                                       np.asarray(loadVector))
+        yield 0.5
+
+        schmidFactors = Grain._schmidFactors(loadVectorsCrystal, slipSystems)
+        self.grainSchmidFactors = schmidFactors
+        for grain, grainSchmidFactors in zip(self, schmidFactors.T):
+            grain.averageSchmidFactors = Grain._groupSlipSystemValues(
+                grainSchmidFactors, slipSystems
+            )
+
+        yield 1.
+
+    @reportProgress("calculating Schmid factor maps")
+    def calcSchmidFactorMaps(self, loadVector, slipSystems=None,
+                             calcGrainAverages=False, memoryBudget=None):
+        """
+        Calculate Schmid factors of every slip system at every point of
+        the map from the orientation of the point. The load vector is
+        transformed into the crystal frame of a chunk of points at a time
+        and Schmid factors of all slip systems are then found together
+        (see `Grain._schmidFactors`). Stored in self.schmidFactors,
+        self.maxSchmidFactor and self.maxSchmidFactorSystem.
+
+        Parameters
+        ----------
+        loadVector : numpy.ndarray
+            Loading vector, e.g. [1, 0, 0]
+        slipSystems : list(list(defdap.crystal.SlipSystem)), optional
+            Slip systems grouped by slip plane, defaults to
+            self.slipSystems
+        calcGrainAverages : bool, optional
+            Also calculate the mean Schmid factor of each slip system over
+            the points of every grain
+        memoryBudget : int, optional
+            Approximate memory in bytes to use for working arrays,
+            defaults to self.memoryBudget
+
+        Returns
+        -------
+        schmidFactors : numpy.ndarray shape (numSystems, yDim, xDim)
+            Schmid factor of each slip system (in order of the flattened
+            slip system groups), float32
+        maxSchmidFactor : numpy.ndarray shape (yDim, xDim)
+            Maximum Schmid factor of all slip systems, float32
+        maxSchmidFactorSystem : numpy.ndarray shape (yDim, xDim)
+            Index of the slip system with maximum Schmid factor
+        grainSchmidFactors : numpy.ndarray shape (numSystems, numGrains)
+            Mean Schmid factor of each slip system in each grain. Only
+            returned if calcGrainAverages is True
 
-            # report progress
-            yield (iGrain + 1) / numGrains
+        """
+        if slipSystems is None:
+            slipSystems = self.slipSystems
+        if memoryBudget is None:
+            memoryBudget = self.memoryBudget
+        if calcGrainAverages:
+            # Check that grains have been detected in the map
+            self.checkGrainsDetected()
+
+        self.buildQuatArray()
+        quatComps = self.quatArray.quatCoef.reshape((4, -1))
+        loadVector = np.asarray(loadVector)
+        numPoints = quatComps.shape[1]
+        numSystems = sum(len(slipSystemGroup)
+                         for slipSystemGroup in slipSystems)
+
+        schmidFactors = np.empty((numSystems, numPoints), dtype=np.float32)
+        if calcGrainAverages:
+            grainLabels = np.maximum(self.grains.ravel(), 0)
+            grainSums = np.zeros((numSystems, len(self) + 1))
+
+        # working memory per point, the load vectors in crystal frame
+        # and the components and products of the Schmid factors
+        bytesPerPoint = (10 + 3 * numSystems) * 8
+        chunkSize = int(max(1, memoryBudget // bytesPerPoint))
+        for start in range(0, numPoints, chunkSize):
+            end = min(start + chunkSize, numPoints)
+
+            loadVectorsCrystal = Quat.calcTransformVectors(
+                quatComps[:, start:end], loadVector
+            )
+            chunkSchmidFactors = Grain._schmidFactors(loadVectorsCrystal,
+                                                      slipSystems)
+            schmidFactors[:, start:end] = chunkSchmidFactors
+
+            if calcGrainAverages:
+                for i in range(numSystems):
+                    grainSums[i] += np.bincount(
+                        grainLabels[start:end],
+                        weights=chunkSchmidFactors[i],
+                        minlength=len(self) + 1
+                    )
+
+            yield end / numPoints
+
+        self.schmidFactors = schmidFactors.reshape((-1, self.yDim, self.xDim))
+        self.maxSchmidFactorSystem = self.schmidFactors.argmax(axis=0)
+        self.maxSchmidFactor = np.take_along_axis(
+            self.schmidFactors, self.maxSchmidFactorSystem[np.newaxis], axis=0
+        )[0]
+
+        output = (self.schmidFactors, self.maxSchmidFactor,
+                  self.maxSchmidFactorSystem)
+        if calcGrainAverages:
+            grainSizes = np.diff(self.grainOffsets)
+            output += (grainSums[:, 1:] / grainSizes,)
+
+        return output
 
     def plotAverageGrainSchmidFactorsMap(self, planes=None, directions=None,
                                          **kwargs):
         """
         Plot maximum Schmid factor map, based on average grain
-        orientation (for all slip systems unless specified)
+        orientation (for all slip systems unless specified). Each grain
+        is filled with the maximum of the chosen slip systems from
+        self.grainSchmidFactors.
 
         :param planes: Plane ID(s) to consider (optional)
         :type planes: list
-        :param directions: Direction ID(s) to consider (optional)
+        :param directions: Direction ID(s) to consider within each of the
+            planes (optional, only used with planes)
         :type directions: list
         :param plotGBs: Plots grain boundaries if True
         :param boundaryColour:  Colour of grain boundaries
@@ -924,36 +1809,38 @@ class Map(base.Map):
 
         # Check that grains have been detected in the map
         self.checkGrainsDetected()
-        self.averageSchmidFactor = np.zeros([self.yDim, self.xDim])
 
-        if self[0].averageSchmidFactors is None:
+        if self.grainSchmidFactors is None:
             raise Exception("Run 'calcAverageGrainSchmidFactors' first")
 
-        for grain in self.grainList:
-            currentSchmidFactor = []
-
-            if planes is not None:
-                # Error catching
-                if np.max(planes) > len(self.slipSystems) - 1:
-                    raise Exception("Check plane IDs exists, IDs range from 0 "
-                                    "to {0}".format(len(self.slipSystems) - 1))
-
-                for plane in planes:
-                    if directions is not None:
-                        for direction in directions:
-                            currentSchmidFactor.append(grain.averageSchmidFactors[plane][direction])
-                    else:
-                        currentSchmidFactor.append(grain.averageSchmidFactors[plane])
-                # TODO: what is this doing?
-                currentSchmidFactor = [max(s) for s in zip(*currentSchmidFactor)]
-            else:
-                currentSchmidFactor = [max(s) for s in zip(*grain.averageSchmidFactors)]
-
-            # Fill grain with colour
-            for coord in grain.coordList:
-                self.averageSchmidFactor[coord[1], coord[0]] = currentSchmidFactor[0]
+        # plane and direction ID of each of the stacked slip systems
+        groupSizes = [len(group) for group in self[0].averageSchmidFactors]
+        systemPlanes = np.repeat(np.arange(len(groupSizes)), groupSizes)
+        systemDirections = (np.arange(len(systemPlanes)) -
+                            np.repeat(np.cumsum(groupSizes) - groupSizes,
+                                      groupSizes))
+
+        chosenSystems = np.ones(len(systemPlanes), dtype=bool)
+        if planes is not None:
+            # Error catching
+            if np.max(planes) > len(groupSizes) - 1:
+                raise Exception("Check plane IDs exists, IDs range from 0 "
+                                "to {0}".format(len(groupSizes) - 1))
+            chosenSystems &= np.isin(systemPlanes, planes)
+            if directions is not None:
+                chosenSystems &= np.isin(systemDirections, directions)
+        if not chosenSystems.any():
+            raise Exception("No slip systems with the given plane and "
+                            "direction IDs")
+
+        # maximum over the chosen slip systems of each grain
+        grainSchmidFactors = self.grainSchmidFactors[chosenSystems].max(
+            axis=0
+        )
 
-        self.averageSchmidFactor[self.averageSchmidFactor == 0] = 0.5
+        # Fill grains with colour
+        self.averageSchmidFactor = self.grainDataToMapData(grainSchmidFactors,
+                                                           bg=0.5)
 
         plot = MapPlot.create(self, self.averageSchmidFactor, **plotParams)
 
@@ -970,9 +1857,9 @@ class Grain(base.Grain):
         self.slipSystems = ebsdMap.slipSystems
         self.ebsdMap = ebsdMap                  # ebsd map this grain is a member of
         self.ownerMap = ebsdMap
-        self.quatList = []                      # list of quats
-        self.misOriList = None                  # list of misOri at each point in grain
-        self.misOriAxisList = None              # list of misOri axes at each point in grain
+        self._quatList = []                     # list of quats
+        self.misOriList = None                  # array of misOri at each point in grain
+        self.misOriAxisList = None              # array (n, 3) of misOri axes at each point in grain
         self.refOri = None                      # (quat) average ori of grain
         self.averageMisOri = None               # average misOri of grain
 
@@ -980,58 +1867,59 @@ class Grain(base.Grain):
         self.slipTraceAngles = None             # list of slip trace angles
         self.slipTraceInclinations = None
 
+    @property
+    def quatList(self):
+        """Orientations of the points of the grain. A QuatArray for
+        grains in the grain index of the map."""
+        if self.pointIdxs is None:
+            return self._quatList
+
+        return QuatArray._fromComps(
+            self.ebsdMap.quatArray.quatCoef.reshape((4, -1))[:, self.pointIdxs]
+        )
+
+    def _detachFromIndex(self):
+        # keep the orientations of the points as a list
+        if self.pointIdxs is not None:
+            self._quatList = list(self.quatList)
+        super(Grain, self)._detachFromIndex()
+
     # quat is a quaternion and coord is a tuple (x, y)
     def addPoint(self, coord, quat):
         self.coordList.append(coord)
         self.quatList.append(quat)
 
     def calcAverageOri(self):
-        quatCompsSym = Quat.calcSymEqvs(self.quatList, self.crystalSym)
+        quatComps = Quat.extractQuatComps(self.quatList)
+        avOriComps = Quat.calcAverageOriMany(
+            quatComps, np.zeros(len(self), dtype=int), self.crystalSym
+        )
 
-        self.refOri = Quat.calcAverageOri(quatCompsSym)
+        self.refOri = Quat(avOriComps[:, 0])
 
     def buildMisOriList(self, calcAxis=False):
-        quatCompsSym = Quat.calcSymEqvs(self.quatList, self.crystalSym)
+        quatComps = Quat.extractQuatComps(self.quatList).astype(
+            self.ebsdMap.precision
+        )
 
         if self.refOri is None:
-            self.refOri = Quat.calcAverageOri(quatCompsSym)
-
-        misOriArray, minQuatComps = Quat.calcMisOri(quatCompsSym, self.refOri)
-
-        self.averageMisOri = misOriArray.mean()
-        self.misOriList = list(misOriArray)
+            self.calcAverageOri()
 
+        refOriComps = np.repeat(
+            self.refOri.quatCoef[:, np.newaxis].astype(quatComps.dtype),
+            quatComps.shape[1], axis=1
+        )
+        results = Quat.misOriMany(
+            refOriComps, quatComps, self.crystalSym, calcAxis=calcAxis
+        )
         if calcAxis:
-            # Now for axis calulation
-            refOriInv = self.refOri.conjugate
-
-            misOriAxis = np.empty((3, minQuatComps.shape[1]))
-            Dq = np.empty((4, minQuatComps.shape[1]))
-
-            # refOriInv * minQuat for all points (* is quaternion product)
-            # change to minQuat * refOriInv
-            Dq[0, :] = (refOriInv[0] * minQuatComps[0, :] - refOriInv[1] * minQuatComps[1, :] -
-                        refOriInv[2] * minQuatComps[2, :] - refOriInv[3] * minQuatComps[3, :])
-
-            Dq[1, :] = (refOriInv[1] * minQuatComps[0, :] + refOriInv[0] * minQuatComps[1, :] +
-                        refOriInv[3] * minQuatComps[2, :] - refOriInv[2] * minQuatComps[3, :])
-
-            Dq[2, :] = (refOriInv[2] * minQuatComps[0, :] + refOriInv[0] * minQuatComps[2, :] +
-                        refOriInv[1] * minQuatComps[3, :] - refOriInv[3] * minQuatComps[1, :])
-
-            Dq[3, :] = (refOriInv[3] * minQuatComps[0, :] + refOriInv[0] * minQuatComps[3, :] +
-                        refOriInv[2] * minQuatComps[1, :] - refOriInv[1] * minQuatComps[2, :])
-
-            Dq[:, Dq[0] < 0] = -Dq[:, Dq[0] < 0]
-
-            # numpy broadcasting taking care of different array sizes
-            misOriAxis[:, :] = (2 * Dq[1:4, :] * np.arccos(Dq[0, :])) / np.sqrt(1 - np.power(Dq[0, :], 2))
+            misOriArray, misOriAxis = results
+            self.misOriAxisList = misOriAxis.T
+        else:
+            misOriArray = results
 
-            # hack it back into a list. Need to change self.*List to be arrays, it was a bad decision to
-            # make them lists in the beginning
-            self.misOriAxisList = []
-            for row in misOriAxis.transpose():
-                self.misOriAxisList.append(row)
+        self.averageMisOri = misOriArray.mean()
+        self.misOriList = misOriArray
 
     def plotRefOri(self, direction=np.array([0, 0, 1]), **kwargs):
         plotParams = {'marker': '+'}
@@ -1127,26 +2015,41 @@ class Grain(base.Grain):
         if self.refOri is None:
             self.calcAverageOri()
 
-        # orientation of grain
-        grainAvOri = self.refOri
-
         # Transform the load vector into crystal coordinates
-        loadVectorCrystal = grainAvOri.transformVector(loadVector)
+        loadVectorCrystal = self.refOri.transformVector(loadVector)
 
-        self.averageSchmidFactors = []
-        # flatten list of lists
-        # slipSystems = chain.from_iterable(slipSystems)
+        schmidFactors = Grain._schmidFactors(loadVectorCrystal, slipSystems)
+        self.averageSchmidFactors = Grain._groupSlipSystemValues(
+            schmidFactors, slipSystems
+        )
 
-        # Loop over groups of slip systems with same slip plane
-        for i, slipSystemGroup in enumerate(slipSystems):
-            self.averageSchmidFactors.append([])
-            # Then loop over individual slip systems
-            for slipSystem in slipSystemGroup:
-                schmidFactor = abs(np.dot(loadVectorCrystal, slipSystem.slipPlane) *
-                                   np.dot(loadVectorCrystal, slipSystem.slipDir))
-                self.averageSchmidFactors[i].append(schmidFactor)
+    @staticmethod
+    def _schmidFactors(loadVectorsCrystal, slipSystems):
+        """Schmid factors of all slip systems for load vectors in
+        crystal coordinates, shape (3, ...). Returns an array of shape
+        (number of slip systems, ...)."""
+        slipPlanes, slipDirs, _ = SlipSystem.stackSlipSystems(slipSystems)
+        loadVectorsCrystal = np.asarray(loadVectorsCrystal)
+        loadShape = loadVectorsCrystal.shape[1:]
+        loadVectorsCrystal = loadVectorsCrystal.reshape((3, -1))
+
+        schmidFactors = abs(np.matmul(slipPlanes.T, loadVectorsCrystal) *
+                            np.matmul(slipDirs.T, loadVectorsCrystal))
+
+        return schmidFactors.reshape((-1,) + loadShape)
+
+    @staticmethod
+    def _groupSlipSystemValues(values, slipSystems):
+        """Split a flat array of values for each slip system into a list
+        of lists grouped by slip plane."""
+        groupedValues = []
+        start = 0
+        for slipSystemGroup in slipSystems:
+            end = start + len(slipSystemGroup)
+            groupedValues.append(list(values[start:end]))
+            start = end
 
-        return
+        return groupedValues
 
     @property
     def slipTraces(self):
@@ -1183,36 +2086,31 @@ class Grain(base.Grain):
 
         screenPlaneNormCrystal = grainAvOri.transformVector(screenPlaneNorm)
 
-        self.slipTraceAngles = []
-        self.slipTraceInclinations = []
-        # Loop over each group of slip systems
-        for slipSystemGroup in slipSystems:
-            # Take slip plane from first in group
-            slipPlaneNorm = slipSystemGroup[0].slipPlane
-            # planeLabel = slipSystemGroup[0].slipPlaneLabel
+        # Slip plane of each group of slip systems (first in group)
+        slipPlaneNorms = np.array([slipSystemGroup[0].slipPlane
+                                   for slipSystemGroup in slipSystems]).T
 
-            # Calculate intersection of slip plane with plane of screen
-            intersectionCrystal = np.cross(screenPlaneNormCrystal, slipPlaneNorm)
+        # Calculate intersection of slip planes with plane of screen
+        intersectionCrystal = np.cross(screenPlaneNormCrystal, slipPlaneNorms,
+                                       axisb=0, axisc=0)
 
-            # Calculate angle between slip plane and screen plane
-            inclination = np.arccos(np.dot(screenPlaneNormCrystal, slipPlaneNorm))
-            if inclination > np.pi / 2:
-                inclination = np.pi - inclination
-            # print("{} inclination: {:.1f}".format(planeLabel, inclination * 180 / np.pi))
+        # Calculate angle between slip planes and screen plane
+        inclinations = np.arccos(np.dot(screenPlaneNormCrystal, slipPlaneNorms))
+        inclinations = np.where(inclinations > np.pi / 2,
+                                np.pi - inclinations, inclinations)
 
-            # Transform intersection back into sample coordinates and normalise
-            intersection = grainAvOri.conjugate.transformVector(intersectionCrystal)
-            intersection = intersection / np.sqrt(np.dot(intersection, intersection))
+        # Transform intersections back into sample coordinates and normalise
+        intersections = grainAvOri.transformVector(intersectionCrystal,
+                                                   inverse=True)
+        intersections /= np.sqrt(np.sum(intersections**2, axis=0))
 
-            # Calculate trace angle. Starting vertical and proceeding
-            # counter clockwise
-            if intersection[0] > 0:
-                intersection *= -1
-            traceAngle = np.arccos(np.dot(intersection, np.array([0, 1.0, 0])))
+        # Calculate trace angle. Starting vertical and proceeding
+        # counter clockwise
+        intersections[:, intersections[0] > 0] *= -1
+        traceAngles = np.arccos(intersections[1])
 
-            # Append to list
-            self.slipTraceAngles.append(traceAngle)
-            self.slipTraceInclinations.append(inclination)
+        self.slipTraceAngles = list(traceAngles)
+        self.slipTraceInclinations = list(inclinations)
 
 
 class Linker(object):
@@ -1315,6 +2213,32 @@ class Linker(object):
 
         return
 
+    def calcLinkMisOri(self):
+        """Calculate misorientation between the reference orientations
+        of linked grains in each map and the first map.
+
+        Returns
+        -------
+        np.ndarray shape (numMaps - 1, numLinks)
+            Misorientation of each link. Angle is 2*arccos(output)
+        """
+        masterMap = self.ebsdMaps[0]
+        links = np.array(self.links).reshape((-1, self.numMaps))
+
+        masterOris = Quat.extractQuatComps(
+            [masterMap.grainList[grainId].refOri for grainId in links[:, 0]]
+        )
+
+        linkMisOris = np.empty((self.numMaps - 1, len(links)))
+        for i, ebsdMap in enumerate(self.ebsdMaps[1:], start=1):
+            linkedOris = Quat.extractQuatComps(
+                [ebsdMap.grainList[grainId].refOri for grainId in links[:, i]]
+            )
+            linkMisOris[i - 1] = Quat.misOriMany(masterOris, linkedOris,
+                                                 ebsdMap.crystalSym)
+
+        return linkMisOris
+
     def updateMisOri(self, calcAxis=False):
         # recalculate misorientation for linked grain (not for first map)
         for i, ebsdMap in enumerate(self.ebsdMaps[1:], start=1):
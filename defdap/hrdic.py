@@ -30,7 +30,8 @@ from defdap.quat import Quat
 
 from defdap.plotting import MapPlot, GrainPlot
 from defdap.inspector import GrainInspector
-from defdap.utils import reportProgress
+from defdap.utils import (reportProgress, getNumWorkers, runParallel,
+                          splitRanges)
 
 
 class Map(base.Map):
@@ -676,6 +677,73 @@ class Map(base.Map):
             else:
                 edge = newedge
 
+    @reportProgress("detecting slip bands")
+    def calcGrainSlipBands(self, thres=None, min_dist=None, nWorkers=None):
+        """Detect slip bands in the max shear map of every grain, see
+        `Grain.calcSlipBands`. Detected angles are stored as
+        slipBandAngles of each grain.
+
+        Args:
+            thres (float, optional): Normalised threshold for peaks
+            min_dist (int, optional): Minimum angle between bands
+            nWorkers (int, optional): Number of worker processes to
+                share grains between, defaults to the number set with
+                defdap.utils.setNumWorkers
+        """
+        # Check that grains have been detected in the map
+        self.checkGrainsDetected()
+
+        # points of all grains, in order of grain
+        grainSizes = [len(grain) for grain in self]
+        grainOffsets = np.zeros(len(self) + 1, dtype=int)
+        np.cumsum(grainSizes, out=grainOffsets[1:])
+        coords = np.concatenate(
+            [np.array(grain.coordList, dtype=int).reshape((-1, 2))
+             for grain in self]
+        )
+        maxShears = np.concatenate(
+            [np.array(grain.maxShearList, dtype=float) for grain in self]
+        )
+
+        nWorkers = getNumWorkers(nWorkers)
+        grainRanges = splitRanges(grainSizes, 4 * nWorkers)
+        results = runParallel(
+            self._slipBandTask,
+            [grainRange + (thres, min_dist) for grainRange in grainRanges],
+            inputs={'coords': coords, 'maxShears': maxShears,
+                    'grainOffsets': grainOffsets},
+            nWorkers=nWorkers
+        )
+        for (startGrain, endGrain), slipBandAngles in zip(grainRanges,
+                                                           results):
+            for grain, angles in zip(self[startGrain:endGrain],
+                                     slipBandAngles):
+                grain.slipBandAngles = angles
+
+            yield endGrain / len(self)
+
+    @staticmethod
+    def _slipBandTask(arrays, task):
+        """Slip band angles of a range of grains, see
+        `calcGrainSlipBands`."""
+        startGrain, endGrain, thres, min_dist = task
+        grainOffsets = arrays['grainOffsets']
+
+        slipBandAngles = []
+        for i in range(startGrain, endGrain):
+            start, end = grainOffsets[i], grainOffsets[i + 1]
+            x, y = arrays['coords'][start:end].T
+            x0, y0 = x.min(), y.min()
+            grainMapData = np.full((y.max() - y0 + 1, x.max() - x0 + 1),
+                                   np.nan)
+            grainMapData[y - y0, x - x0] = arrays['maxShears'][start:end]
+
+            slipBandAngles.append(
+                Grain._detectSlipBands(grainMapData, thres, min_dist)
+            )
+
+        return slipBandAngles
+
     def runGrainInspector(self, vmax=0.1):
         GrainInspector(currMap=self, vmax=vmax)
 
@@ -694,6 +762,7 @@ class Grain(base.Grain):
 
         self.pointsList = []        # Lines drawn for STA
         self.groupsList = []        # Unique angles drawn for STA
+        self.slipBandAngles = None  # Detected slip band angles
 
     @property
     def plotDefault(self):
@@ -741,6 +810,14 @@ class Grain(base.Grain):
         Returns:
             list(float): Detected slip band angles
         """
+        slipBandAngles = self._detectSlipBands(grainMapData, thres=thres,
+                                               min_dist=min_dist)
+        print("Number of bands detected: {:}".format(len(slipBandAngles)))
+
+        return slipBandAngles
+
+    @staticmethod
+    def _detectSlipBands(grainMapData, thres=None, min_dist=None):
         if thres is None:
             thres = 0.3
         if min_dist is None:
@@ -772,7 +849,6 @@ class Grain(base.Grain):
         indexes = peakutils.indexes(profile, thres=thres, min_dist=min_dist)
         peaks = x[indexes]
         # peaks = peakutils.interpolate(x, profile, ind=indexes)
-        print("Number of bands detected: {:}".format(len(peaks)))
 
         slipBandAngles = peaks
         slipBandAngles = slipBandAngles * np.pi / 180
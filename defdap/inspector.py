@@ -411,13 +411,13 @@ class GrainInspector:
         for idx, (ssGroup, sfGroup, slipTraceAngle) in enumerate(
                 zip(grain.ebsdMap.slipSystems, ebsdGrain.averageSchmidFactors, np.rad2deg(ebsdGrain.slipTraceAngles))):
             text = "{0:s}    {1:.1f}\n".format(ssGroup[0].slipPlaneLabel, slipTraceAngle)
-            tempRDRs = [];
-            for ss, sf in zip(ssGroup, sfGroup):
-                slipDirSample = ebsdGrain.refOri.conjugate.transformVector(ss.slipDir)
+            # slip directions of the group in sample coordinates
+            slipDirsSample = ebsdGrain.refOri.transformVector(
+                np.array([ss.slipDir for ss in ssGroup]).T, inverse=True)
+            tempRDRs = list(-slipDirsSample[0] / slipDirsSample[1])
+            for ss, sf, RDR in zip(ssGroup, sfGroup, tempRDRs):
                 text = text + "          {0:s}    SF: {1:.3f}    RDR: {2:.3f}\n".format\
-                    (ss.slipDirLabel, sf,-slipDirSample[0]/slipDirSample[1])
-                RDR = -slipDirSample[0]/slipDirSample[1]
-                tempRDRs.append(RDR)
+                    (ss.slipDirLabel, sf, RDR)
             RDRs.append(tempRDRs)    
 
             if idx in grain.groupsList[group][2]:
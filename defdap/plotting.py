@@ -22,6 +22,7 @@ from mpl_toolkits.mplot3d.art3d import Poly3DCollection
 from mpl_toolkits.mplot3d import Axes3D
 
 from skimage import morphology as mph
+from scipy.ndimage import gaussian_filter
 
 from defdap import quat
 # TODO: add plot parameter to add to current figure
@@ -542,9 +543,9 @@ class PolePlot(Plot):
     def addLine(self, startPoint, endPoint, plotSyms=False, res=100, **kwargs):
         lines = [(startPoint, endPoint)]
         if plotSyms:
-            for symm in quat.Quat.symEqv(self.crystalSym)[1:]:
-                startPointSymm = symm.transformVector(startPoint).astype(int)
-                endPointSymm = symm.transformVector(endPoint).astype(int)
+            for symm in quat.Quat.symRotMatrices(self.crystalSym)[1:]:
+                startPointSymm = np.matmul(symm, startPoint)
+                endPointSymm = np.matmul(symm, endPoint)
 
                 if startPointSymm[2] < 0:
                     startPointSymm *= -1
@@ -607,6 +608,107 @@ class PolePlot(Plot):
         else:
             raise Exception("specify one colour for solid markers or list two for 'half and half'")
 
+    def addDensity(self, alphaAng, betaAng, weights=None, bins=200,
+                   smoothing=1., normalise=True, contour=False, **kwargs):
+        """Plot the density of poles as a single raster (or filled
+        contour) layer clipped to the fundamental triangle. Poles are
+        binned with a 2D histogram in the projection plane, which is
+        much faster than `addPoints` for large numbers of poles.
+
+        Parameters
+        ----------
+        alphaAng : np.ndarray
+            Polar angle of the poles (in the fundamental triangle)
+        betaAng : np.ndarray
+            Azimuthal angle of the poles
+        weights : np.ndarray, optional
+            Weight of each pole
+        bins : int, optional
+            Number of pixels across the triangle
+        smoothing : float, optional
+            Standard deviation of Gaussian smoothing in pixels, 0 for
+            no smoothing
+        normalise : bool, optional
+            Plot in multiples of a random density (MRD), otherwise
+            the number of poles in each pixel
+        contour : bool, optional
+            Plot filled contours instead of a raster
+        kwargs
+            Passed to the matplotlib imshow or contourf call
+
+        """
+        if self.projection is PolePlot.stereoProject:
+            inverse = PolePlot.stereoProjectInverse
+        elif self.projection is PolePlot.lambertProject:
+            inverse = PolePlot.lambertProjectInverse
+        else:
+            raise Exception("Density only works for stereographic and "
+                            "lambert projections.")
+
+        # pixel grid covering the triangle
+        vertices = quat.Quat.ipfTriangleVertices(self.crystalSym)
+        edgePoints = np.concatenate([
+            np.linspace(vertices[i], vertices[(i + 1) % 3], 100)
+            for i in range(3)
+        ]).T
+        xEdge, yEdge = self.projection(*edgePoints)
+        pixelSize = max(np.ptp(xEdge), np.ptp(yEdge)) / bins
+        xBins = xEdge.min() + pixelSize * np.arange(
+            int(np.ceil(np.ptp(xEdge) / pixelSize)) + 1)
+        yBins = yEdge.min() + pixelSize * np.arange(
+            int(np.ceil(np.ptp(yEdge) / pixelSize)) + 1)
+
+        xp, yp = self.projection(np.asarray(alphaAng), np.asarray(betaAng))
+        counts = np.histogram2d(yp, xp, bins=(yBins, xBins),
+                                weights=weights)[0]
+
+        # solid angle of each pixel and mask of pixels in the triangle
+        xc, yc = np.meshgrid((xBins[:-1] + xBins[1:]) / 2,
+                             (yBins[:-1] + yBins[1:]) / 2)
+        alphaC, betaC, areaScale = inverse(xc, yc)
+        solidAngles = areaScale * pixelSize**2
+        inTriangle = self._inFundTriangle(alphaC, betaC)
+
+        density = counts / solidAngles
+        if smoothing > 0:
+            # normalised convolution so the edges of the triangle are
+            # not diluted
+            with np.errstate(invalid='ignore', divide='ignore'):
+                density = (gaussian_filter(density, smoothing) /
+                           gaussian_filter(inTriangle.astype(float),
+                                           smoothing))
+        if normalise:
+            density /= counts.sum() / solidAngles[inTriangle].sum()
+        else:
+            density *= solidAngles
+        density = np.ma.masked_where(~inTriangle, density)
+
+        if contour:
+            img = self.ax.contourf(xc, yc, density, **kwargs)
+        else:
+            img = self.ax.imshow(
+                density, origin='lower', interpolation='nearest',
+                extent=(xBins[0], xBins[-1], yBins[0], yBins[-1]),
+                **kwargs
+            )
+        self.imgLayers.append(img)
+
+    def _inFundTriangle(self, alpha, beta):
+        """Mask of directions (polar angles) in the fundamental
+        triangle of the IPF."""
+        tol = 1e-9
+        x = np.sin(alpha) * np.cos(beta)
+        y = np.sin(alpha) * np.sin(beta)
+        z = np.cos(alpha)
+
+        if self.crystalSym == "cubic":
+            return (z >= x - tol) & (x >= y - tol) & (y >= -tol)
+        elif self.crystalSym == "hexagonal":
+            return ((z >= -tol) & (y >= -tol) &
+                    (y <= x * np.tan(np.pi / 6) + tol))
+        else:
+            raise NotImplementedError("Only works for cubic and hexagonal IPFs")
+
     def addColourBar(self, label, layer=0, **kwargs):
         img = self.imgLayers[layer]
         self.colourBar = plt.colorbar(img, ax=self.ax, label=label, **kwargs)
@@ -660,6 +762,16 @@ class PolePlot(Plot):
 
         return xp, yp
 
+    @staticmethod
+    def stereoProjectInverse(xp, yp):
+        """Polar angles of points in the stereographic projection and
+        the solid angle per unit area of the projection at them."""
+        r2 = xp**2 + yp**2
+        alpha = 2 * np.arctan(np.sqrt(r2))
+        beta = np.arctan2(yp, xp)
+
+        return alpha, beta, 4 / (1 + r2)**2
+
     @staticmethod
     def lambertProject(*args):
         if len(args) == 3:
@@ -675,6 +787,17 @@ class PolePlot(Plot):
 
         return xp, yp
 
+    @staticmethod
+    def lambertProjectInverse(xp, yp):
+        """Polar angles of points in the lambert projection and the
+        solid angle per unit area of the projection at them (constant
+        as the projection is equal area)."""
+        r = np.sqrt(xp**2 + yp**2)
+        alpha = 2 * np.arcsin(np.minimum(r / 2, 1))
+        beta = np.arctan2(yp, xp)
+
+        return alpha, beta, np.ones_like(r)
+
 
 class HistPlot(Plot):
     """ Class for creating a histogram
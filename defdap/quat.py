@@ -13,7 +13,11 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import os
+import math
+
 import numpy as np
+from scipy.spatial import cKDTree
 
 from defdap import plotting
 
@@ -32,15 +36,15 @@ class Quat(object):
             Variable length argument list.
 
         """
+        # construct with quat coefficients
+        if len(args) == 4:
+            quatCoef = np.array(args, dtype=float)
+
         # construct with array of quat coefficients
-        if len(args) == 1:
+        elif len(args) == 1:
             if len(args[0]) != 4:
                 raise TypeError("Arrays input must have 4 elements")
-            self.quatCoef = np.array(args[0], dtype=float)
-
-        # construct with quat coefficients
-        elif len(args) == 4:
-            self.quatCoef = np.array(args, dtype=float)
+            quatCoef = np.array(args[0], dtype=float)
 
         else:
             raise TypeError("Incorrect argument length. Input should be "
@@ -48,8 +52,32 @@ class Quat(object):
                             "quat coefficients")
 
         # move to northern hemisphere
-        if self.quatCoef[0] < 0:
-            self.quatCoef = self.quatCoef * -1
+        if quatCoef[0] < 0:
+            quatCoef *= -1
+        self.quatCoef = quatCoef
+
+    @classmethod
+    def _fromCoef(cls, quatCoef):
+        """Fast construction from a float array of 4 quat coefficients,
+        which is used directly without copying or checking the input.
+
+        Parameters
+        ----------
+        quatCoef : np.ndarray shape 4
+            Quat coefficients, owned by the new object.
+
+        Returns
+        -------
+        defdap.quat.Quat
+
+        """
+        quat = cls.__new__(cls)
+        # move to northern hemisphere
+        if quatCoef[0] < 0:
+            quatCoef *= -1
+        quat.quatCoef = quatCoef
+
+        return quat
 
     @classmethod
     def fromEulerAngles(cls, ph1, phi, ph2):
@@ -71,15 +99,17 @@ class Quat(object):
 
         """
         # calculate quat coefficients
+        cosPhi, sinPhi = math.cos(phi / 2.0), math.sin(phi / 2.0)
+        sumAng, diffAng = (ph1 + ph2) / 2.0, (ph1 - ph2) / 2.0
         quatCoef = np.array([
-            np.cos(phi / 2.0) * np.cos((ph1 + ph2) / 2.0),
-            -np.sin(phi / 2.0) * np.cos((ph1 - ph2) / 2.0),
-            -np.sin(phi / 2.0) * np.sin((ph1 - ph2) / 2.0),
-            -np.cos(phi / 2.0) * np.sin((ph1 + ph2) / 2.0)
+            cosPhi * math.cos(sumAng),
+            -sinPhi * math.cos(diffAng),
+            -sinPhi * math.sin(diffAng),
+            -cosPhi * math.sin(sumAng)
         ], dtype=float)
 
         # call constructor
-        return cls(quatCoef)
+        return cls._fromCoef(quatCoef)
 
     @classmethod
     def fromAxisAngle(cls, axis, angle):
@@ -99,15 +129,15 @@ class Quat(object):
 
         """
         # normalise the axis vector
-        axis = np.array(axis)
+        axis = np.asarray(axis, dtype=float)
         axis = axis / np.sqrt(np.dot(axis, axis))
         # calculate quat coefficients
-        quatCoef = np.zeros(4, dtype=float)
-        quatCoef[0] = np.cos(angle / 2)
-        quatCoef[1:4] = np.sin(angle / 2) * axis
+        quatCoef = np.empty(4, dtype=float)
+        quatCoef[0] = math.cos(angle / 2)
+        quatCoef[1:4] = math.sin(angle / 2) * axis
 
         # call constructor
-        return cls(quatCoef)
+        return cls._fromCoef(quatCoef)
 
     def eulerAngles(self):
         """Calculate the Euler angle representation for this rotation
@@ -128,43 +158,7 @@ class Quat(object):
             Model. Simul. Mater. Sci. Eng., 23(8)
 
         """
-        eulers = np.empty(3, dtype=float)
-
-        q = self.quatCoef
-        q03 = q[0]**2 + q[3]**2
-        q12 = q[1]**2 + q[2]**2
-        chi = np.sqrt(q03 * q12)
-
-        if chi == 0 and q12 == 0:
-            eulers[0] = np.arctan2(-2 * q[0] * q[3], q[0]**2 - q[3]**2)
-            eulers[1] = 0
-            eulers[2] = 0
-
-        elif chi == 0 and q03 == 0:
-            eulers[0] = np.arctan2(2 * q[1] * q[2], q[1]**2 - q[2]**2)
-            eulers[1] = np.pi
-            eulers[2] = 0
-
-        else:
-            cosPh1 = (-q[0] * q[1] - q[2] * q[3]) / chi
-            sinPh1 = (-q[0] * q[2] + q[1] * q[3]) / chi
-
-            cosPhi = q[0]**2 + q[3]**2 - q[1]**2 - q[2]**2
-            sinPhi = 2 * chi
-
-            cosPh2 = (-q[0] * q[1] + q[2] * q[3]) / chi
-            sinPh2 = (q[1] * q[3] + q[0] * q[2]) / chi
-
-            eulers[0] = np.arctan2(sinPh1, cosPh1)
-            eulers[1] = np.arctan2(sinPhi, cosPhi)
-            eulers[2] = np.arctan2(sinPh2, cosPh2)
-
-        if eulers[0] < 0:
-            eulers[0] += 2 * np.pi
-        if eulers[2] < 0:
-            eulers[2] += 2 * np.pi
-
-        return eulers
+        return Quat.calcEulerAngles(self.quatCoef)
 
     def rotMatrix(self):
         """Calculate the rotation matrix representation for this rotation
@@ -185,24 +179,7 @@ class Quat(object):
             Model. Simul. Mater. Sci. Eng., 23(8)
 
         """
-        rotMatrix = np.empty((3, 3), dtype=float)
-
-        q = self.quatCoef
-        qbar = q[0]**2 - q[1]**2 - q[2]**2 - q[3]**2
-
-        rotMatrix[0, 0] = qbar + 2 * q[1]**2
-        rotMatrix[0, 1] = 2 * (q[1] * q[2] - q[0] * q[3])
-        rotMatrix[0, 2] = 2 * (q[1] * q[3] + q[0] * q[2])
-
-        rotMatrix[1, 0] = 2 * (q[1] * q[2] + q[0] * q[3])
-        rotMatrix[1, 1] = qbar + 2 * q[2]**2
-        rotMatrix[1, 2] = 2 * (q[2] * q[3] - q[0] * q[1])
-
-        rotMatrix[2, 0] = 2 * (q[1] * q[3] - q[0] * q[2])
-        rotMatrix[2, 1] = 2 * (q[2] * q[3] + q[0] * q[1])
-        rotMatrix[2, 2] = qbar + 2 * q[3]**2
-
-        return rotMatrix
+        return Quat.calcRotMatrix(self.quatCoef)
 
     # show components when the quat is printed
     def __repr__(self):
@@ -217,24 +194,22 @@ class Quat(object):
     # overload * operator for quaternion product and vector product
     def __mul__(self, right):
         if isinstance(right, type(self)):   # another quat
-            newQuatCoef = np.zeros(4, dtype=float)
-            newQuatCoef[0] = (
-                    self.quatCoef[0] * right.quatCoef[0] -
-                    np.dot(self.quatCoef[1:4], right.quatCoef[1:4])
-            )
-            newQuatCoef[1:4] = (
-                    self.quatCoef[0] * right.quatCoef[1:4] +
-                    right.quatCoef[0] * self.quatCoef[1:4] +
-                    np.cross(self.quatCoef[1:4], right.quatCoef[1:4])
-            )
-            return Quat(newQuatCoef)
-        raise TypeError()
+            # work with python floats to avoid temporary arrays
+            l0, l1, l2, l3 = self.quatCoef.tolist()
+            r0, r1, r2, r3 = right.quatCoef.tolist()
+            return Quat._fromCoef(np.array([
+                l0 * r0 - (l1 * r1 + l2 * r2 + l3 * r3),
+                (l0 * r1 + r0 * l1) + (l2 * r3 - l3 * r2),
+                (l0 * r2 + r0 * l2) + (l3 * r1 - l1 * r3),
+                (l0 * r3 + r0 * l3) + (l1 * r2 - l2 * r1)
+            ]))
+        return NotImplemented
 
     # # overload % operator for dot product
     # def __mod__(self, right):
     def dot(self, right):
         if isinstance(right, type(self)):
-            return np.dot(self.quatCoef, right.quatCoef)
+            return self.quatCoef.dot(right.quatCoef)
         raise TypeError()
 
     # overload + operator
@@ -268,31 +243,34 @@ class Quat(object):
     # also the inverse if this is a unit quaternion
     @property
     def conjugate(self):
-        return Quat(self[0], -self[1], -self[2], -self[3])
+        return Quat._fromCoef(self.quatCoef * _conjugateSigns)
 
-    def transformVector(self, vector):
+    def transformVector(self, vector, inverse=False):
         """Transforms vector by the quaternion. For EBSD quaterions this
         is a transformation from sample space to crystal space. Perform
-        on conjugate of quaternion for crystal to sample.
+        on conjugate of quaternion (or set inverse) for crystal to
+        sample.
 
         Parameters
         ----------
-        vector : array_like shape 3
-            Vector to transform
+        vector : array_like shape (3) or (3, m)
+            Vector or vectors to transform
+        inverse : bool, optional
+            Transform by the inverse (conjugate) of the quaternion
 
         Returns
         -------
-        np.ndarray shape 3
+        np.ndarray shape (3) or (3, m)
             Transformed vector
 
         """
-        if isinstance(vector, np.ndarray) and vector.shape == (3,):
-            vectorQuat = Quat(0, vector[0], vector[1], vector[2])
-            vectorQuatTransformed = self * (vectorQuat * self.conjugate)
-            vectorTransformed = vectorQuatTransformed.quatCoef[1:4]
-            return vectorTransformed
+        vector = np.asarray(vector)
+        if vector.ndim not in (1, 2) or vector.shape[0] != 3:
+            raise TypeError("Vector must be a size 3 numpy array or "
+                            "an array of shape (3, m).")
 
-        raise TypeError("Vector must be a size 3 numpy array.")
+        return Quat.calcTransformVectors(self.quatCoef, vector,
+                                         inverse=inverse)
 
     def misOri(self, right, symGroup, returnQuat=0):
         """Calculate misorientation angle between 2 orientations taking
@@ -318,15 +296,21 @@ class Quat(object):
 
         """
         if isinstance(right, type(self)):
+            symTables = Quat._symTables(symGroup)
+            # self . (sym * right) for all symmetries in one product,
             # looking for max of this as it is cos of misorientation angle
-            minMisOri = 0
-            # loop over symmetrically equivalent orientations
-            for sym in Quat.symEqv(symGroup):
-                quatSym = sym * right
-                currentMisOri = abs(self.dot(quatSym))
-                if currentMisOri > minMisOri:   # keep if misorientation lower
-                    minMisOri = currentMisOri
-                    minQuatSym = quatSym
+            misOris = abs(np.dot(
+                symTables['misOriMatrices'],
+                np.multiply.outer(self.quatCoef, right.quatCoef).ravel()
+            ))
+            minIdx = misOris.argmax()
+            minMisOri = misOris[minIdx]
+
+            if returnQuat == 0:
+                return minMisOri
+            minQuatSym = Quat._fromCoef(np.dot(
+                symTables['productMatrices'][minIdx], right.quatCoef
+            ))
 
             if returnQuat == 1:
                 return minQuatSym
@@ -362,7 +346,7 @@ class Quat(object):
     def plotIPF(self, direction, symGroup, projection=None,
                 plot=None, fig=None, ax=None, makeInteractive=False,
                 plotColourBar=False, cLabel="",
-                markerColour=None, markerSize=40, **kwargs):
+                markerColour=None, markerSize=40, density=False, **kwargs):
         """
         Plot IPF of orientations for specified sample diection.
 
@@ -386,10 +370,15 @@ class Quat(object):
         markerSize : int
             Size of markers (only used for half and half colouring,
             otherwise us arguemnt s)
+        density : bool
+            Plot the density of orientations as a single layer instead
+            of a marker for each, see `plotting.PolePlot.addDensity`.
+            Use for large numbers of orientations
         kwargs
             All other arguments are passed to the matplotlib scatter call
+            or `plotting.PolePlot.addDensity`
         """
-        plotParams = {'marker': '+'}
+        plotParams = {} if density else {'marker': '+'}
         plotParams.update(kwargs)
 
         # Works as an instance or static method on a list of Quats
@@ -398,16 +387,28 @@ class Quat(object):
         else:
             quats = self
 
-        alphaFund, betaFund = Quat.calcFundDirs(quats, direction, symGroup)
+        if density:
+            # only the density is needed so reduce the crystal directions
+            # directly rather than forming symmetric equivalents
+            quatArray = QuatArray._fromComps(Quat._asQuatComps(quats))
+            alphaFund, betaFund = Quat.fundDirsFromVectors(
+                quatArray.transformVector(direction), symGroup
+            )
+        else:
+            alphaFund, betaFund = Quat.calcFundDirs(quats, direction,
+                                                    symGroup)
 
         if plot is None:
             plot = plotting.PolePlot(
                 "IPF", symGroup, projection=projection,
                 ax=ax, fig=fig, makeInteractive=makeInteractive
             )
-        plot.addPoints(alphaFund, betaFund,
-                       markerColour=markerColour, markerSize=markerSize,
-                       **plotParams)
+        if density:
+            plot.addDensity(alphaFund, betaFund, **plotParams)
+        else:
+            plot.addPoints(alphaFund, betaFund,
+                           markerColour=markerColour, markerSize=markerSize,
+                           **plotParams)
 
         if plotColourBar:
             plot.addColourBar(cLabel)
@@ -535,56 +536,228 @@ class Quat(object):
 
         Returns
         -------
-        quats : np.ndarray of defdap.quat.Quat
-            Array of quat objects of shape n x ... x m
+        quats : defdap.quat.QuatArray
+            Array of quats of shape n x ... x m
+
+        """
+        return QuatArray.fromEulerAngles(*eulerArray)
+
+    @staticmethod
+    def extractQuatComps(quats):
+        """Return the components of a collection of quats as a single
+        array.
+
+        Parameters
+        ----------
+        quats : defdap.quat.QuatArray or array_like of defdap.quat.Quat
+            Orientations to extract components from
+
+        Returns
+        -------
+        quatComps : np.ndarray shape (4, n)
+            Quat components, flattened if a multidimensional QuatArray
+            is given
+
+        """
+        if isinstance(quats, QuatArray):
+            return quats.quatCoef.reshape((4, -1))
+
+        quats = np.array(quats, dtype=object).ravel()
+        quatComps = np.empty((4, len(quats)), dtype=float)
+        for i, quat in enumerate(quats):
+            quatComps[:, i] = quat.quatCoef
+
+        return quatComps
+
+    @staticmethod
+    def quatProduct(leftComps, rightComps):
+        """Quaternion product of 2 arrays of quat components. Standard
+        numpy broadcasting rules apply to all but the first axis. No
+        hemisphere correction is applied to the result.
+
+        Parameters
+        ----------
+        leftComps : np.ndarray shape (4, ...)
+            Components of quats on left of product
+        rightComps : np.ndarray shape (4, ...)
+            Components of quats on right of product
+
+        Returns
+        -------
+        np.ndarray shape (4, ...)
+            Components of product
+
+        """
+        l0, l1, l2, l3 = leftComps
+        r0, r1, r2, r3 = rightComps
+
+        return np.array([
+            l0 * r0 - l1 * r1 - l2 * r2 - l3 * r3,
+            l0 * r1 + r0 * l1 + l2 * r3 - l3 * r2,
+            l0 * r2 + r0 * l2 + l3 * r1 - l1 * r3,
+            l0 * r3 + r0 * l3 + l1 * r2 - l2 * r1
+        ])
+
+    @staticmethod
+    def calcEulerAngles(quatComps):
+        """Calculate the Euler angle representation for an array of
+        rotations. `Quat.eulerAngles` uses this so results for single
+        and many quats are identical.
+
+        Parameters
+        ----------
+        quatComps : np.ndarray shape (4, ...)
+            Quat components
+
+        Returns
+        -------
+        eulers : np.ndarray shape (3, ...)
+            Bunge euler angles (in radians)
+
+        """
+        quatComps = np.asarray(quatComps)
+        dtype = np.result_type(quatComps, np.float32)
+        q = quatComps.reshape((4, -1)).astype(dtype, copy=False)
+        eulers = np.empty((3, q.shape[1]), dtype=dtype)
+
+        q03 = q[0]**2 + q[3]**2
+        q12 = q[1]**2 + q[2]**2
+        chi = np.sqrt(q03 * q12)
+
+        # masks for the degenerate cases where phi is 0 or pi
+        phi0 = (chi == 0) & (q12 == 0)
+        phiPi = (chi == 0) & (q03 == 0) & ~phi0
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            cosPh1 = (-q[0] * q[1] - q[2] * q[3]) / chi
+            sinPh1 = (-q[0] * q[2] + q[1] * q[3]) / chi
+
+            cosPhi = q[0]**2 + q[3]**2 - q[1]**2 - q[2]**2
+            sinPhi = 2 * chi
+
+            cosPh2 = (-q[0] * q[1] + q[2] * q[3]) / chi
+            sinPh2 = (q[1] * q[3] + q[0] * q[2]) / chi
+
+        eulers[0] = np.arctan2(sinPh1, cosPh1)
+        eulers[1] = np.arctan2(sinPhi, cosPhi)
+        eulers[2] = np.arctan2(sinPh2, cosPh2)
+
+        eulers[0][phi0] = np.arctan2(-2 * q[0][phi0] * q[3][phi0],
+                                     q[0][phi0]**2 - q[3][phi0]**2)
+        eulers[1][phi0] = 0
+        eulers[2][phi0] = 0
+
+        eulers[0][phiPi] = np.arctan2(2 * q[1][phiPi] * q[2][phiPi],
+                                      q[1][phiPi]**2 - q[2][phiPi]**2)
+        eulers[1][phiPi] = np.pi
+        eulers[2][phiPi] = 0
+
+        eulers[0][eulers[0] < 0] += 2 * np.pi
+        eulers[2][eulers[2] < 0] += 2 * np.pi
+
+        return eulers.reshape((3,) + quatComps.shape[1:])
+
+    @staticmethod
+    def calcRotMatrix(quatComps):
+        """Calculate the rotation matrix representation for an array
+        of rotations. `Quat.rotMatrix` uses this so results for single
+        and many quats are identical.
+
+        Parameters
+        ----------
+        quatComps : np.ndarray shape (4, ...)
+            Quat components
+
+        Returns
+        -------
+        rotMatrix : np.ndarray shape (3, 3, ...)
+            Rotation matrices
 
         """
-        ph1 = eulerArray[0]
-        phi = eulerArray[1]
-        ph2 = eulerArray[2]
-        oriShape = eulerArray.shape[1:]
+        quatComps = np.asarray(quatComps)
+        dtype = np.result_type(quatComps, np.float32)
+        q = quatComps.reshape((4, -1)).astype(dtype, copy=False)
+        rotMatrix = np.empty((3, 3, q.shape[1]), dtype=dtype)
+
+        qbar = q[0]**2 - q[1]**2 - q[2]**2 - q[3]**2
 
-        quatComps = np.zeros((4,) + oriShape, dtype=float)
+        rotMatrix[0, 0] = qbar + 2 * q[1]**2
+        rotMatrix[0, 1] = 2 * (q[1] * q[2] - q[0] * q[3])
+        rotMatrix[0, 2] = 2 * (q[1] * q[3] + q[0] * q[2])
+
+        rotMatrix[1, 0] = 2 * (q[1] * q[2] + q[0] * q[3])
+        rotMatrix[1, 1] = qbar + 2 * q[2]**2
+        rotMatrix[1, 2] = 2 * (q[2] * q[3] - q[0] * q[1])
+
+        rotMatrix[2, 0] = 2 * (q[1] * q[3] - q[0] * q[2])
+        rotMatrix[2, 1] = 2 * (q[2] * q[3] + q[0] * q[1])
+        rotMatrix[2, 2] = qbar + 2 * q[3]**2
+
+        return rotMatrix.reshape((3, 3) + quatComps.shape[1:])
+
+    @staticmethod
+    def calcTransformVectors(quatComps, vectors, inverse=False):
+        """Transform vectors by rotations using the closed form of
+        q * v * q^-1 (v' = 2(q.v)q + (q0^2 - q.q)v + 2q0(q x v), where
+        q is the vector part of the quaternion). Every vector is
+        transformed by every rotation, so one vector by many rotations,
+        many vectors by one rotation and many by many are all handled.
+        For EBSD orientations this is sample to crystal, or crystal to
+        sample if inverse is set.
+
+        Parameters
+        ----------
+        quatComps : np.ndarray shape (4, ...)
+            Quat components of the rotations
+        vectors : np.ndarray shape (3, ...)
+            Vectors to transform
+        inverse : bool, optional
+            Transform by the inverse (conjugate) of the rotations
+
+        Returns
+        -------
+        np.ndarray shape (3, vector dims..., quat dims...)
+            Transformed vectors
 
-        quatComps[0] = np.cos(phi / 2.0) * np.cos((ph1 + ph2) / 2.0)
-        quatComps[1] = -np.sin(phi / 2.0) * np.cos((ph1 - ph2) / 2.0)
-        quatComps[2] = -np.sin(phi / 2.0) * np.sin((ph1 - ph2) / 2.0)
-        quatComps[3] = -np.cos(phi / 2.0) * np.sin((ph1 + ph2) / 2.0)
+        """
+        quatComps = np.asarray(quatComps)
+        vectors = np.asarray(vectors)
+        quatDims = quatComps.ndim - 1
+        vectorDims = vectors.ndim - 1
 
-        quats = np.empty(oriShape, dtype=Quat)
+        # broadcast as (component, vector dims..., quat dims...)
+        q = quatComps[(slice(None),) + (np.newaxis,) * vectorDims]
+        v = vectors[(Ellipsis,) + (np.newaxis,) * quatDims]
+        q0 = q[0]
+        qv = -q[1:4] if inverse else q[1:4]
 
-        for i, idx in enumerate(np.ndindex(oriShape)):
-            quats[idx] = Quat(quatComps[(slice(None),) + idx])
+        qDotV = qv[0] * v[0] + qv[1] * v[1] + qv[2] * v[2]
+        temp = q0**2 - qv[0]**2 - qv[1]**2 - qv[2]**2
 
-        return quats
+        return (2 * qDotV * qv + temp * v +
+                2 * q0 * np.stack((qv[1] * v[2] - qv[2] * v[1],
+                                   qv[2] * v[0] - qv[0] * v[2],
+                                   qv[0] * v[1] - qv[1] * v[0])))
 
     @staticmethod
     def calcSymEqvs(quats, symGroup, dtype=np.float):
-        syms = Quat.symEqv(symGroup)
-        quatComps = np.empty((len(syms), 4, len(quats)), dtype=dtype)
+        productMatrices = Quat.symProductMatrices(symGroup)
+        initQuatComps = Quat.extractQuatComps(quats)
+        quatComps = np.empty(
+            (len(productMatrices), 4, initQuatComps.shape[1]), dtype=dtype
+        )
 
         # store quat components in array
-        for i, quat in enumerate(quats):
-            quatComps[0, :, i] = quat.quatCoef
-
-        # calculate symmetrical equivalents
-        for i, sym in enumerate(syms[1:], start=1):
-            # sym[i] * quat for all points (* is quaternion product)
-            quatComps[i, 0, :] = (
-                quatComps[0, 0, :] * sym[0] - quatComps[0, 1, :] * sym[1] -
-                quatComps[0, 2, :] * sym[2] - quatComps[0, 3, :] * sym[3])
-            quatComps[i, 1, :] = (
-                quatComps[0, 0, :] * sym[1] + quatComps[0, 1, :] * sym[0] -
-                quatComps[0, 2, :] * sym[3] + quatComps[0, 3, :] * sym[2])
-            quatComps[i, 2, :] = (
-                quatComps[0, 0, :] * sym[2] + quatComps[0, 2, :] * sym[0] -
-                quatComps[0, 3, :] * sym[1] + quatComps[0, 1, :] * sym[3])
-            quatComps[i, 3, :] = (
-                quatComps[0, 0, :] * sym[3] + quatComps[0, 3, :] * sym[0] -
-                quatComps[0, 1, :] * sym[2] + quatComps[0, 2, :] * sym[1])
-
-            # swap into positive hemisphere if required
-            quatComps[i, :, quatComps[i, 0, :] < 0] *= -1
+        quatComps[0] = initQuatComps
+
+        # calculate symmetrical equivalents, sym[i] * quat for all
+        # points (* is quaternion product). First symmetry is the
+        # identity so skip it
+        np.matmul(productMatrices[1:].astype(dtype), quatComps[0],
+                  out=quatComps[1:])
+
+        # swap into positive hemisphere if required
+        np.negative(quatComps, out=quatComps, where=quatComps[:, 0:1] < 0)
 
         return quatComps
 
@@ -611,9 +784,77 @@ class Quat(object):
 
         return avOri
 
+    @staticmethod
+    def calcAverageOriMany(quatComps, labels, symGroup, numLabels=None):
+        """Calculate the mean orientation of many groups of orientations
+        (e.g. all grains of a map) at once. Each orientation is first
+        replaced with its symmetric equivalent closest to the first
+        orientation of its group, the mean is then the eigenvector with
+        largest eigenvalue of the sum of outer products q q^T of the
+        group (Markley et al.). The reduction and mean are repeated
+        once with the first mean in place of the first orientation.
+
+        Parameters
+        ----------
+        quatComps : np.ndarray shape (4, n)
+            Quat components
+        labels : np.ndarray shape (n)
+            Group of each orientation, from 0 to numLabels - 1
+        symGroup : str
+            Crystal type (cubic, hexagonal)
+        numLabels : int, optional
+            Number of groups, max(labels) + 1 if not given
+
+        Returns
+        -------
+        avOriComps : np.ndarray shape (4, numLabels)
+            Components of the mean orientations, NaN for empty groups
+
+        References
+        ----------
+            Markley F. L. et al., 'Averaging quaternions',
+            Journal of Guidance, Control, and Dynamics, 30(4) 1193-1197
+
+        """
+        quatComps = Quat._asQuatComps(quatComps)
+        labels = np.asarray(labels)
+        if numLabels is None:
+            numLabels = labels.max() + 1 if len(labels) > 0 else 0
+
+        # first orientation in each group
+        seedIdxs = np.full(numLabels, -1)
+        seedIdxs[labels[::-1]] = np.arange(len(labels))[::-1]
+        refComps = quatComps[:, seedIdxs]
+
+        for _ in range(2):
+            # symmetric equivalents closest to the reference of the group
+            _, symComps = Quat.misOriMany(refComps[:, labels], quatComps,
+                                          symGroup, returnQuat=True)
+
+            # sum of outer products for each group, only the upper
+            # triangle is needed as the matrix is symmetric
+            outerSums = np.empty((numLabels, 4, 4))
+            for i in range(4):
+                for j in range(i, 4):
+                    outerSums[:, i, j] = np.bincount(
+                        labels, weights=symComps[i] * symComps[j],
+                        minlength=numLabels
+                    )
+                    outerSums[:, j, i] = outerSums[:, i, j]
+
+            # eigenvector with largest eigenvalue
+            refComps = np.linalg.eigh(outerSums)[1][:, :, -1].T
+            refComps = refComps.astype(quatComps.dtype)
+            refComps[:, refComps[0] < 0] *= -1
+
+        refComps[:, seedIdxs < 0] = np.nan
+
+        return refComps
+
     @staticmethod
     def calcMisOri(quatComps, refOri):
-        misOris = np.empty((quatComps.shape[0], quatComps.shape[2]))
+        misOris = np.empty((quatComps.shape[0], quatComps.shape[2]),
+                           dtype=quatComps.dtype)
 
         # Dot product of each quat in quatComps with refOri
         misOris[:, :] = abs(np.einsum("ijk,j->ik", quatComps, refOri.quatCoef))
@@ -629,6 +870,205 @@ class Quat(object):
 
         return minMisOris, minQuatComps
 
+    @staticmethod
+    def misOriMany(quatsA, quatsB, symGroup, returnQuat=False,
+                   calcAxis=False, returnSymIdx=False, chunkSize=65536):
+        """Calculate misorientation between pairs of orientations taking
+        into account the symmetries of the crystal structure. The same
+        as `Quat.misOri` and `Quat.misOriAxis` for each pair but for
+        many pairs at once. Angle is 2*arccos(output).
+
+        As a.(s * b) is equal to (b * a^-1).s^-1 only the single product
+        D = b * a^-1 is formed for each pair and then dotted with the
+        (inverse) symmetry operators.
+
+        Parameters
+        ----------
+        quatsA : np.ndarray shape (4, n) or defdap.quat.QuatArray
+            First orientation of each pair
+        quatsB : np.ndarray shape (4, n) or defdap.quat.QuatArray
+            Second orientation of each pair, the symmetric equivalent
+            of these is found
+        symGroup : str
+            Crystal type (cubic, hexagonal)
+        returnQuat : bool, optional
+            Also return the symmetric equivalent of each quatsB with
+            minimum misorientation
+        calcAxis : bool, optional
+            Also return the misorientation axis of each pair
+        returnSymIdx : bool, optional
+            Also return the index of the symmetry operator applied to
+            each quatsB to give minimum misorientation
+        chunkSize : int, optional
+            Maximum number of pairs to process at once
+
+        Returns
+        -------
+        minMisOris : np.ndarray shape (n)
+            Minimum misorientation
+        minQuatComps : np.ndarray shape (4, n)
+            Symmetric equivalents of quatsB with minimum misorientation.
+            Only returned if returnQuat is True
+        misOriAxis : np.ndarray shape (3, n)
+            Misorientation axes. Only returned if calcAxis is True
+        minSymIdxs : np.ndarray shape (n)
+            Index of the symmetry operator (see `Quat.symEqvComps`)
+            giving the minimum misorientation equivalent of quatsB.
+            Only returned if returnSymIdx is True
+
+        """
+        quatCompsA = Quat._asQuatComps(quatsA)
+        quatCompsB = Quat._asQuatComps(quatsB)
+        if quatCompsA.shape != quatCompsB.shape:
+            raise ValueError("Orientation arrays must be the same shape.")
+        numPairs = quatCompsA.shape[1]
+        dtype = np.result_type(quatCompsA, quatCompsB, np.float32)
+
+        symComps = Quat.symEqvComps(symGroup).astype(dtype)
+        searchCos = np.cos(Quat._symTables(symGroup)['minAngle'] / 4) + 1e-6
+
+        minMisOris = np.empty(numPairs, dtype=dtype)
+        if returnQuat:
+            minQuatComps = np.empty((4, numPairs), dtype=dtype)
+        if calcAxis:
+            misOriAxis = np.empty((3, numPairs), dtype=dtype)
+        if returnSymIdx:
+            minSymIdxs = np.empty(numPairs, dtype=np.int8)
+            # index of the inverse of each operator
+            symInvIdxs = np.argmax(Quat.symMulTable(symGroup) == 0, axis=1)
+
+        for start in range(0, numPairs, chunkSize):
+            end = min(start + chunkSize, numPairs)
+            compsA = quatCompsA[:, start:end]
+            compsB = quatCompsB[:, start:end]
+
+            # D = b * a^-1
+            compsAInv = compsA * np.array([[1], [-1], [-1], [-1]], dtype=dtype)
+            D = Quat.quatProduct(compsB, compsAInv)
+
+            # Pairs closer than half the smallest rotation of the group
+            # already have minimum misorientation with the identity
+            # (first symmetry), so only search the others. This covers
+            # most neighbouring points in fundamental zone reduced maps
+            misOris = abs(D[0])
+            symIdxs = np.zeros(end - start, dtype=int)
+            search = misOris <= searchCos
+            if np.any(search):
+                # looking for max of this as it is cos of misorientation
+                # angle. Summed explicitly rather than with matmul so
+                # each result does not depend on how pairs are chunked
+                searchD = D[:, search]
+                searchMisOris = np.multiply.outer(symComps[:, 0], searchD[0])
+                for i in range(1, 4):
+                    searchMisOris += np.multiply.outer(symComps[:, i],
+                                                       searchD[i])
+                np.abs(searchMisOris, out=searchMisOris)
+                searchIdxs = np.argmax(searchMisOris, axis=0)
+                symIdxs[search] = searchIdxs
+                misOris[search] = searchMisOris[
+                    searchIdxs, np.arange(len(searchIdxs))
+                ]
+            minMisOris[start:end] = misOris
+
+            if returnSymIdx:
+                # the operator applied to b is the inverse of the one found
+                minSymIdxs[start:end] = symInvIdxs[symIdxs]
+
+            if not (returnQuat or calcAxis):
+                continue
+
+            # the operator applied to b is the inverse of the one found
+            symInvComps = symComps[symIdxs].T * np.array([[1], [-1], [-1], [-1]], dtype=dtype)
+
+            if returnQuat:
+                quatComps = Quat.quatProduct(symInvComps, compsB)
+                quatComps[:, quatComps[0] < 0] *= -1
+                minQuatComps[:, start:end] = quatComps
+
+            if calcAxis:
+                # (s * b) * a^-1 = s * D
+                Dq = Quat.quatProduct(symInvComps, D)
+                Dq[:, Dq[0] < 0] *= -1
+                with np.errstate(divide='ignore', invalid='ignore'):
+                    misOriAxis[:, start:end] = (
+                        2 * Dq[1:4] * np.arccos(np.minimum(Dq[0], 1)) /
+                        np.sqrt(1 - np.power(Dq[0], 2))
+                    )
+
+        minMisOris[minMisOris > 1] = 1
+
+        output = [minMisOris]
+        if returnQuat:
+            output.append(minQuatComps)
+        if calcAxis:
+            output.append(misOriAxis)
+        if returnSymIdx:
+            output.append(minSymIdxs)
+
+        return output[0] if len(output) == 1 else tuple(output)
+
+    @staticmethod
+    def calcFundZone(quats, symGroup, chunkSize=65536):
+        """Reduce orientations into the fundamental zone of the crystal
+        symmetry, i.e. the symmetric equivalent with smallest rotation
+        angle (largest scalar component), in the positive hemisphere.
+
+        Parameters
+        ----------
+        quats : np.ndarray shape (4, n) or defdap.quat.QuatArray
+            Orientations to reduce
+        symGroup : str
+            Crystal type (cubic, hexagonal)
+        chunkSize : int, optional
+            Maximum number of orientations to process at once
+
+        Returns
+        -------
+        fzQuatComps : np.ndarray shape (4, n)
+            Components of the reduced orientations
+        symIdxs : np.ndarray shape (n)
+            Index of the symmetry operator s where fzQuat = s * quat
+
+        """
+        quatComps = Quat._asQuatComps(quats)
+        numQuats = quatComps.shape[1]
+        dtype = np.result_type(quatComps, np.float32)
+
+        productMatrices = Quat.symProductMatrices(symGroup).astype(dtype)
+        symComps = Quat.symEqvComps(symGroup).astype(dtype)
+        conjSign = np.array([[1], [-1], [-1], [-1]], dtype=dtype)
+
+        fzQuatComps = np.empty((4, numQuats), dtype=dtype)
+        symIdxs = np.empty(numQuats, dtype=int)
+
+        for start in range(0, numQuats, chunkSize):
+            end = min(start + chunkSize, numQuats)
+            comps = quatComps[:, start:end]
+
+            # scalar component of s * q is the dot product of s and q^-1
+            scalarComps = abs(np.matmul(symComps, comps * conjSign))
+            chunkSymIdxs = np.argmax(scalarComps, axis=0)
+
+            fzComps = np.einsum('nij,jn->in', productMatrices[chunkSymIdxs],
+                                comps)
+            fzComps[:, fzComps[0] < 0] *= -1
+
+            fzQuatComps[:, start:end] = fzComps
+            symIdxs[start:end] = chunkSymIdxs
+
+        return fzQuatComps, symIdxs
+
+    @staticmethod
+    def _asQuatComps(quats):
+        """Components of quats given as a (4, n) array, a QuatArray
+        or a collection of Quat objects."""
+        if isinstance(quats, np.ndarray) and quats.dtype != object:
+            if quats.shape[0] != 4:
+                raise ValueError("First dimension of input array must be 4")
+            return quats.reshape((4, -1))
+
+        return Quat.extractQuatComps(quats)
+
     @staticmethod
     def polarAngles(x, y, z):      # spherical coordinates as per Wikipedia
         mod = np.sqrt(x**2 + y**2 + z**2)
@@ -644,130 +1084,347 @@ class Quat(object):
         return alpha, beta
 
     @staticmethod
-    def calcIPFcolours(quats, direction, symGroup):
-        if symGroup != "cubic":
-            raise NotImplementedError("Only available for cubic currently")
+    def calcIPFcolours(quats, direction, symGroup, chunkSize=2**20):
+        """Calculate IPF colours of orientations for a sample direction.
+        Colours are interpolated from a lookup table over the
+        fundamental triangle, see `Quat.ipfColourLUT`.
 
-        numQuats = len(quats)
-
-        # Calculating as float32 seems to speed this up
-        alphaFund, betaFund = Quat.calcFundDirs(
-            quats, direction, symGroup, dtype=np.float32
-        )
+        Parameters
+        ----------
+        quats : defdap.quat.QuatArray or array_like of defdap.quat.Quat
+            Orientations to calculate colours of
+        direction : array_like shape 3
+            Sample direction
+        symGroup : str
+            Crystal type (cubic, hexagonal)
+        chunkSize : int, optional
+            Maximum number of orientations to process at once
 
-        # revert to cartesians
-        # at some this should be changed to have the quats dimention
-        # last to fit with numpys row major storage direction vector in
-        # cartesians. Changes this to float32 causes errors in arccos,
-        # so leave to default to 64
-        dirvec = np.empty((numQuats, 3))
-        dirvec[:, 0] = np.sin(alphaFund) * np.cos(betaFund)
-        dirvec[:, 1] = np.sin(alphaFund) * np.sin(betaFund)
-        dirvec[:, 2] = np.cos(alphaFund)
-
-        rvect = np.repeat(np.array([0., 0., 1.])[np.newaxis, :],
-                          numQuats, axis=0)
-        gvect = np.repeat(np.array([1., 0., 1.])[np.newaxis, :] / np.sqrt(2),
-                          numQuats, axis=0)
-        bvect = np.repeat(np.array([1., 1., 1.])[np.newaxis, :] / np.sqrt(3),
-                          numQuats, axis=0)
-        rgb = np.zeros((numQuats, 3))
-
-        # Red Component; these subroutines are converted from
-        # Stephen Cluff's IPF_rgbcalc.m (BYU)
-        RDirPlane = np.cross(dirvec, rvect)
-        GBplane = np.cross(bvect, gvect)
-        Rintersect = np.cross(RDirPlane, GBplane)
-        NORM = np.sqrt(np.power(Rintersect[:, 0], 2) +
-                       np.power(Rintersect[:, 1], 2) +
-                       np.power(Rintersect[:, 2], 2))
-        Rintersect[NORM != 0, :] = np.divide(
-            Rintersect[NORM != 0, :],
-            np.repeat(NORM[NORM != 0][:, np.newaxis], 3, axis=1)
-        )
+        Returns
+        -------
+        rgb : np.ndarray shape (n, 3)
+            RGB colours
 
-        temp = np.arccos(np.einsum("ij,ij->i", dirvec, Rintersect))
-        Rintersect[temp > (np.pi / 2), :] *= -1
-        rgb[:, 0] = np.divide(
-            np.arccos(np.einsum("ij,ij->i", dirvec, Rintersect)),
-            np.arccos(np.einsum("ij,ij->i", rvect, Rintersect))
-        )
+        """
+        if symGroup not in ("cubic", "hexagonal"):
+            raise NotImplementedError("Only available for cubic and "
+                                      "hexagonal currently")
+        lut = Quat.ipfColourLUT(symGroup)
 
-        # Green Component
-        GDirPlane = np.cross(dirvec, gvect)
-        RBplane = np.cross(rvect, bvect)
-        Gintersect = np.cross(GDirPlane, RBplane)
-        NORM = np.sqrt(np.power(Gintersect[:, 0], 2) +
-                       np.power(Gintersect[:, 1], 2) +
-                       np.power(Gintersect[:, 2], 2))
-        Gintersect[NORM != 0, :] = np.divide(
-            Gintersect[NORM != 0, :],
-            np.repeat(NORM[NORM != 0][:, np.newaxis], 3, axis=1)
-        )
+        quatComps = Quat.extractQuatComps(quats)
+        numQuats = quatComps.shape[1]
 
-        temp = np.arccos(np.einsum("ij,ij->i", dirvec, Gintersect))
-        Gintersect[temp > (np.pi / 2), :] *= -1
-        rgb[:, 1] = np.divide(
-            np.arccos(np.einsum("ij,ij->i", dirvec, Gintersect)),
-            np.arccos(np.einsum("ij,ij->i", gvect, Gintersect))
-        )
+        rgb = np.empty((numQuats, 3))
+        for start in range(0, numQuats, chunkSize):
+            end = min(start + chunkSize, numQuats)
 
-        # Blue Component
-        BDirPlane = np.cross(dirvec, bvect)
-        RGplane = np.cross(gvect, rvect)
-        Bintersect = np.cross(BDirPlane, RGplane)
-        NORM = np.sqrt(np.power(Bintersect[:, 0], 2) +
-                       np.power(Bintersect[:, 1], 2) +
-                       np.power(Bintersect[:, 2], 2))
-        Bintersect[NORM != 0, :] = np.divide(
-            Bintersect[NORM != 0, :],
-            np.repeat(NORM[NORM != 0][:, np.newaxis], 3, axis=1)
-        )
+            # sample direction in crystal coordinates
+            directions = QuatArray._fromComps(
+                quatComps[:, start:end]
+            ).transformVector(np.array(direction, dtype=quatComps.dtype))
+            alpha, beta = Quat.fundDirsFromVectors(directions, symGroup)
 
-        temp = np.arccos(np.einsum("ij,ij->i", dirvec, Bintersect))
-        Bintersect[temp > (np.pi / 2), :] *= -1
-        rgb[:, 2] = np.divide(
-            np.arccos(np.einsum("ij,ij->i", dirvec, Bintersect)),
-            np.arccos(np.einsum("ij,ij->i", bvect, Bintersect))
-        )
-        rgb = np.divide(
-            rgb,
-            np.repeat(np.amax(rgb, axis=1)[:, np.newaxis], 3, axis=1)
-        )
+            rgb[start:end] = Quat._interpIPFcolours(alpha, beta, lut)
 
         return rgb
 
     @staticmethod
-    def calcFundDirs(quats, direction, symGroup, dtype=np.float):
-        # convert direction to float array
-        direction = np.array(direction, dtype=dtype)
+    def fundDirsFromVectors(directions, symGroup):
+        """Move crystal directions into the fundamental triangle (or
+        sector) of the IPF using the Laue symmetry of the crystal
+        (rotations and inversion), without forming symmetric
+        equivalents of the orientations.
 
-        # get array of symmetry operations. shape - (numSym, 4, numQuats)
-        quatCompsSym = Quat.calcSymEqvs(quats, symGroup, dtype=dtype)
+        Parameters
+        ----------
+        directions : np.ndarray shape (3, n)
+            Directions in crystal coordinates
+        symGroup : str
+            Crystal type (cubic, hexagonal)
 
-        # array to store crystal directions for all orientations and symmetries
-        directionCrystal = np.empty(
-            (3, quatCompsSym.shape[0], quatCompsSym.shape[2]), dtype=dtype
-        )
+        Returns
+        -------
+        alphaFund : np.ndarray
+            Polar angle of the directions
+        betaFund : np.ndarray
+            Azimuthal angle of the directions
 
-        # temp variables to use bleow
-        quatDotVec = (quatCompsSym[:, 1, :] * direction[0] +
-                      quatCompsSym[:, 2, :] * direction[1] +
-                      quatCompsSym[:, 3, :] * direction[2])
-        temp = (np.square(quatCompsSym[:, 0, :]) -
-                np.square(quatCompsSym[:, 1, :]) -
-                np.square(quatCompsSym[:, 2, :]) -
-                np.square(quatCompsSym[:, 3, :]))
+        """
+        directions = abs(directions)
 
-        # transform the pole direction to crystal coords for all
-        # orientations and symmetries
-        # (quatCompsSym * vectorQuat) * quatCompsSym.conjugate
-        directionCrystal[0, :, :] = (
-                2 * quatDotVec * quatCompsSym[:, 1, :] +
-                temp * direction[0] +
-                2 * quatCompsSym[:, 0, :] * (
-                        quatCompsSym[:, 2, :] * direction[2] -
-                        quatCompsSym[:, 3, :] * direction[1]
+        if symGroup == "cubic":
+            # [001]-[101]-[111] triangle has z >= x >= y >= 0
+            y, x, z = np.sort(directions, axis=0)
+            alphaFund, betaFund = Quat.polarAngles(x, y, z)
+
+        elif symGroup == "hexagonal":
+            # [0001]-[2-1-10]-[10-10] sector has z >= 0 and
+            # 0 <= beta <= 30 deg
+            alphaFund, betaFund = Quat.polarAngles(*directions)
+            betaFund = np.mod(betaFund, np.pi / 3)
+            mirror = betaFund > np.pi / 6
+            betaFund[mirror] = np.pi / 3 - betaFund[mirror]
+
+        else:
+            raise Exception("symGroup must be cubic or hexagonal")
+
+        return alphaFund, betaFund
+
+    @staticmethod
+    def ipfTriangleVertices(symGroup):
+        """Directions at the corners of the fundamental triangle of
+        the IPF, coloured red, green and blue respectively.
+
+        Parameters
+        ----------
+        symGroup : str
+            Crystal type (cubic, hexagonal)
+
+        Returns
+        -------
+        np.ndarray shape (3, 3)
+            Unit vectors of the corners, one per row
+
+        """
+        if symGroup == "cubic":
+            vertices = np.array([[0., 0., 1.], [1., 0., 1.], [1., 1., 1.]])
+        elif symGroup == "hexagonal":
+            vertices = np.array([[0., 0., 1.], [1., 0., 0.],
+                                 [np.sqrt(3), 1., 0.]])
+        else:
+            raise Exception("symGroup must be cubic or hexagonal")
+
+        return vertices / np.linalg.norm(vertices, axis=1)[:, np.newaxis]
+
+    @staticmethod
+    def calcIPFcolourKey(alpha, beta, symGroup):
+        """Exact IPF colour of directions in the fundamental triangle.
+        Each component is the fraction of the way from the opposite
+        edge to the corner of that colour, measured along the great
+        circle through the corner, then the colour is scaled to have a
+        maximum component of 1. Converted from Stephen Cluff's
+        IPF_rgbcalc.m (BYU).
+
+        Parameters
+        ----------
+        alpha : np.ndarray
+            Polar angle of directions
+        beta : np.ndarray
+            Azimuthal angle of directions
+        symGroup : str
+            Crystal type (cubic, hexagonal)
+
+        Returns
+        -------
+        rgb : np.ndarray shape (n, 3)
+            RGB colours
+
+        """
+        alpha = np.ravel(alpha)
+        beta = np.ravel(beta)
+        vertices = Quat.ipfTriangleVertices(symGroup)
+
+        dirvec = np.empty((len(alpha), 3))
+        dirvec[:, 0] = np.sin(alpha) * np.cos(beta)
+        dirvec[:, 1] = np.sin(alpha) * np.sin(beta)
+        dirvec[:, 2] = np.cos(alpha)
+
+        rgb = np.zeros((len(alpha), 3))
+        for i in range(3):
+            cornerVec = vertices[i]
+            # great circle through the other 2 corners
+            edgePlane = np.cross(vertices[(i + 2) % 3], vertices[(i + 1) % 3])
+
+            # intersection of the great circle through the direction and
+            # corner with the opposite edge
+            dirPlane = np.cross(dirvec, cornerVec)
+            intersect = np.cross(dirPlane, edgePlane)
+            norm = np.linalg.norm(intersect, axis=1)
+            intersect[norm != 0] /= norm[norm != 0, np.newaxis]
+            intersect[np.einsum("ij,ij->i", dirvec, intersect) < 0] *= -1
+
+            rgb[:, i] = np.divide(
+                np.arccos(np.clip(np.einsum("ij,ij->i", dirvec, intersect), -1, 1)),
+                np.arccos(np.clip(np.dot(intersect, cornerVec), -1, 1))
+            )
+
+        rgb /= np.amax(rgb, axis=1)[:, np.newaxis]
+
+        return rgb
+
+    @staticmethod
+    def ipfColourLUT(symGroup, resolution=512):
+        """Lookup table of IPF colours over a regular grid of polar
+        angles covering the fundamental triangle. Tables are built once
+        and kept in memory. Tables are only saved to disk if
+        `defdap.quat.ipfLUTCacheDir` is set to a directory, which is off
+        by default.
+
+        Parameters
+        ----------
+        symGroup : str
+            Crystal type (cubic, hexagonal)
+        resolution : int, optional
+            Number of grid points along each angle
+
+        Returns
+        -------
+        dict
+            'rgb' : np.ndarray shape (resolution, resolution, 3)
+                Colours on the grid, float32
+            'alphaMax', 'betaMax' : float
+                Extent of the grid, which starts from 0 for both angles
+
+        """
+        key = (symGroup, resolution)
+        if key in _ipfLUTCache:
+            return _ipfLUTCache[key]
+
+        if symGroup == "cubic":
+            alphaMax = np.arccos(1 / np.sqrt(3))
+            betaMax = np.pi / 4
+        elif symGroup == "hexagonal":
+            alphaMax = np.pi / 2
+            betaMax = np.pi / 6
+        else:
+            raise Exception("symGroup must be cubic or hexagonal")
+
+        fileName = None
+        rgb = None
+        if ipfLUTCacheDir is not None:
+            fileName = os.path.join(
+                ipfLUTCacheDir,
+                "ipf_lut_v{:d}_{:}_{:d}.npy".format(
+                    _ipfLUTVersion, symGroup, resolution
+                )
+            )
+            try:
+                rgb = np.load(fileName)
+            except (OSError, ValueError):
+                rgb = None
+
+        if rgb is None or rgb.shape != (resolution, resolution, 3):
+            alpha, beta = np.meshgrid(
+                np.linspace(0, alphaMax, resolution),
+                np.linspace(0, betaMax, resolution),
+                indexing='ij'
+            )
+            rgb = Quat.calcIPFcolourKey(alpha, beta, symGroup)
+            rgb = rgb.reshape((resolution, resolution, 3)).astype(np.float32)
+
+            if fileName is not None:
+                try:
+                    os.makedirs(ipfLUTCacheDir, exist_ok=True)
+                    np.save(fileName, rgb)
+                except OSError:
+                    pass
+
+        rgb.flags.writeable = False
+        lut = {'rgb': rgb, 'alphaMax': alphaMax, 'betaMax': betaMax}
+        _ipfLUTCache[key] = lut
+
+        return lut
+
+    @staticmethod
+    def _interpIPFcolours(alpha, beta, lut):
+        """Bilinear interpolation of colours from a lookup table."""
+        rgbTable = lut['rgb']
+        numAlpha, numBeta = rgbTable.shape[:2]
+
+        # fractional position on grid, clipped so points just outside
+        # the triangle take the colour of the edge
+        alphaPos = np.clip(alpha * ((numAlpha - 1) / lut['alphaMax']),
+                           0, numAlpha - 1)
+        betaPos = np.clip(beta * ((numBeta - 1) / lut['betaMax']),
+                          0, numBeta - 1)
+
+        alphaIdx = np.minimum(alphaPos.astype(int), numAlpha - 2)
+        betaIdx = np.minimum(betaPos.astype(int), numBeta - 2)
+        alphaWeight = (alphaPos - alphaIdx)[:, np.newaxis]
+        betaWeight = (betaPos - betaIdx)[:, np.newaxis]
+
+        rgb = (
+            rgbTable[alphaIdx, betaIdx] * (1 - alphaWeight) * (1 - betaWeight) +
+            rgbTable[alphaIdx + 1, betaIdx] * alphaWeight * (1 - betaWeight) +
+            rgbTable[alphaIdx, betaIdx + 1] * (1 - alphaWeight) * betaWeight +
+            rgbTable[alphaIdx + 1, betaIdx + 1] * alphaWeight * betaWeight
+        )
+
+        return rgb
+
+    @staticmethod
+    def calcFundDirs(quats, direction, symGroup, dtype=np.float,
+                     chunkSize=32768):
+        """Calculate the direction of a sample direction in the
+        fundamental triangle (or sector) of the IPF for each orientation.
+
+        Parameters
+        ----------
+        quats : defdap.quat.QuatArray or array_like of defdap.quat.Quat
+            Orientations to calculate directions for
+        direction : array_like shape 3
+            Sample direction
+        symGroup : str
+            Crystal type (cubic, hexagonal)
+        dtype : numpy.dtype, optional
+            Data type to perform the calculation in
+        chunkSize : int, optional
+            Maximum number of orientations to process at once, this
+            bounds the memory used
+
+        Returns
+        -------
+        alphaFund : np.ndarray
+            Polar angle of the directions
+        betaFund : np.ndarray
+            Azimuthal angle of the directions
+
+        """
+        quatComps = Quat.extractQuatComps(quats)
+        numQuats = quatComps.shape[1]
+
+        alphaFund = np.empty(numQuats)
+        betaFund = np.empty(numQuats)
+        for start in range(0, numQuats, chunkSize):
+            end = min(start + chunkSize, numQuats)
+            alphaFund[start:end], betaFund[start:end] = Quat._calcFundDirs(
+                QuatArray._fromComps(quatComps[:, start:end]),
+                direction, symGroup, dtype
+            )
+
+        return alphaFund, betaFund
+
+    @staticmethod
+    def _calcFundDirs(quats, direction, symGroup, dtype):
+        # convert direction to float array
+        direction = np.array(direction, dtype=dtype)
+
+        # get array of symmetry operations. shape - (numSym, 4, numQuats)
+        quatCompsSym = Quat.calcSymEqvs(quats, symGroup, dtype=dtype)
+
+        # array to store crystal directions for all orientations and symmetries
+        directionCrystal = np.empty(
+            (3, quatCompsSym.shape[0], quatCompsSym.shape[2]), dtype=dtype
+        )
+
+        # temp variables to use bleow
+        quatDotVec = (quatCompsSym[:, 1, :] * direction[0] +
+                      quatCompsSym[:, 2, :] * direction[1] +
+                      quatCompsSym[:, 3, :] * direction[2])
+        temp = (np.square(quatCompsSym[:, 0, :]) -
+                np.square(quatCompsSym[:, 1, :]) -
+                np.square(quatCompsSym[:, 2, :]) -
+                np.square(quatCompsSym[:, 3, :]))
+
+        # transform the pole direction to crystal coords for all
+        # orientations and symmetries
+        # (quatCompsSym * vectorQuat) * quatCompsSym.conjugate
+        directionCrystal[0, :, :] = (
+                2 * quatDotVec * quatCompsSym[:, 1, :] +
+                temp * direction[0] +
+                2 * quatCompsSym[:, 0, :] * (
+                        quatCompsSym[:, 2, :] * direction[2] -
+                        quatCompsSym[:, 3, :] * direction[1]
                 )
         )
         directionCrystal[1, :, :] = (
@@ -808,30 +1465,21 @@ class Quat(object):
 
             # if less than 3 left need to expand search slighly to
             # catch edge cases
-            if np.sum(np.sum(trialPoles, axis=0) < 3) > 0:
+            missingPoles = np.sum(trialPoles, axis=0) < 3
+            if np.any(missingPoles):
                 deltaBeta = 1e-8
-                trialPoles = np.logical_and(beta >= -deltaBeta,
-                                            beta <= np.pi / 4 + deltaBeta)
-
-            # create array to store angles of pols in fundamental triangle
-            alphaFund = np.empty((quatCompsSym.shape[2]))
-            betaFund = np.empty((quatCompsSym.shape[2]))
+                trialPoles[:, missingPoles] = np.logical_and(
+                    beta[:, missingPoles] >= -deltaBeta,
+                    beta[:, missingPoles] <= np.pi / 4 + deltaBeta
+                )
 
             # now of symmetric equivalents left we want the one with
-            # minimum alpha, loop over different orientations
-            # this seems quite slow so might be worth finding a
-            # different way to do it
-            for i in range(trialPoles.shape[1]):
-                # create array of indexes of poles kept in previous step
-                trialPoleIdxs = np.arange(trialPoles.shape[0])[trialPoles[:, i]]
+            # minimum alpha, for all orientations at once
+            poleIdxs = np.argmin(np.where(trialPoles, alpha, np.inf), axis=0)
+            quatIdxs = np.arange(trialPoles.shape[1])
 
-                # find pole with minimum alpha of those kept in previous step
-                # then use trialPoleIdxs to get its index in original arrays
-                poleIdx = trialPoleIdxs[np.argmin(alpha[trialPoles[:, i], i])]
-
-                # add to final array of poles
-                alphaFund[i] = alpha[poleIdx, i]
-                betaFund[i] = beta[poleIdx, i]
+            alphaFund = alpha[poleIdxs, quatIdxs]
+            betaFund = beta[poleIdxs, quatIdxs]
 
         elif symGroup == "hexagonal":
             # first beta should be between 0 and 30 deg leaving 1
@@ -840,13 +1488,20 @@ class Quat(object):
 
             # if less than 1 left need to expand search slighly to
             # catch edge cases
-            if np.sum(np.sum(trialPoles, axis=0) < 1) > 0:
+            missingPoles = np.sum(trialPoles, axis=0) < 1
+            if np.any(missingPoles):
                 deltaBeta = 1e-8
-                trialPoles = np.logical_and(beta >= -deltaBeta,
-                                            beta <= np.pi / 6 + deltaBeta)
+                trialPoles[:, missingPoles] = np.logical_and(
+                    beta[:, missingPoles] >= -deltaBeta,
+                    beta[:, missingPoles] <= np.pi / 6 + deltaBeta
+                )
 
-            alphaFund = alpha[trialPoles]
-            betaFund = beta[trialPoles]
+            # take the first pole kept for each orientation
+            poleIdxs = np.argmax(trialPoles, axis=0)
+            quatIdxs = np.arange(trialPoles.shape[1])
+
+            alphaFund = alpha[poleIdxs, quatIdxs]
+            betaFund = beta[poleIdxs, quatIdxs]
 
         else:
             raise Exception("symGroup must be cubic or hexagonal")
@@ -855,67 +1510,664 @@ class Quat(object):
 
     @staticmethod
     def symEqv(group):
+        """Symmetry operators of a crystal symmetry group as a list of
+        Quat objects. New objects are created on each call, use
+        `Quat.symEqvComps` where possible.
+
+        Parameters
+        ----------
+        group : str
+            Crystal type (cubic, hexagonal)
+
+        Returns
+        -------
+        list of defdap.quat.Quat
+
+        """
+        return [Quat(sym) for sym in Quat.symEqvComps(group)]
+
+    @staticmethod
+    def symEqvComps(group):
+        """Symmetry operators of a crystal symmetry group. The first
+        operator is always the identity. The array is calculated once
+        and cached so must not be modified.
+
+        Parameters
+        ----------
+        group : str
+            Crystal type (cubic, hexagonal). Any other value returns
+            only the identity
+
+        Returns
+        -------
+        np.ndarray shape (numSyms, 4)
+            Read-only array of quat components of the operators
+
+        """
+        return Quat._symTables(group)['comps']
+
+    @staticmethod
+    def symMulTable(group):
+        """Multiplication table of a crystal symmetry group. Element
+        [i, j] is the index of the operator equal to sym_i * sym_j (up
+        to the sign of the quaternion).
+
+        Parameters
+        ----------
+        group : str
+            Crystal type (cubic, hexagonal)
+
+        Returns
+        -------
+        np.ndarray shape (numSyms, numSyms)
+            Read-only array of operator indexes
+
+        """
+        return Quat._symTables(group)['mulTable']
+
+    @staticmethod
+    def symProductMatrices(group):
+        """Matrices giving the quaternion product with each symmetry
+        operator, such that the components of sym_i * q are
+        `matrices[i] @ q`.
+
+        Parameters
+        ----------
+        group : str
+            Crystal type (cubic, hexagonal)
+
+        Returns
+        -------
+        np.ndarray shape (numSyms, 4, 4)
+            Read-only array of product matrices
+
+        """
+        return Quat._symTables(group)['productMatrices']
+
+    @staticmethod
+    def symRotMatrices(group):
+        """Rotation matrices of the symmetry operators of a crystal
+        symmetry group.
+
+        Parameters
+        ----------
+        group : str
+            Crystal type (cubic, hexagonal)
+
+        Returns
+        -------
+        np.ndarray shape (numSyms, 3, 3)
+            Read-only array of rotation matrices
+
+        """
+        return Quat._symTables(group)['rotMatrices']
+
+    @staticmethod
+    def _symTables(group):
+        if group not in ('cubic', 'hexagonal'):
+            group = None
+        try:
+            return _symTablesCache[group]
+        except KeyError:
+            pass
+
         overRoot2 = np.sqrt(2) / 2
         sqrt3over2 = np.sqrt(3) / 2
 
         # from Pete Bate's fspl_orir.f90 code
         # checked for consistency with mtex
-        qsym = [
+        qsym = np.array([
             # identity - this should always be returned as the first symmetry
-            Quat(1.0, 0.0, 0.0, 0.0),
+            [1.0, 0.0, 0.0, 0.0],
 
             # cubic tetrads(100)
-            Quat(overRoot2, overRoot2, 0.0, 0.0),
-            Quat(0.0, 1.0, 0.0, 0.0),
-            Quat(overRoot2, -overRoot2, 0.0, 0.0),
+            [overRoot2, overRoot2, 0.0, 0.0],
+            [0.0, 1.0, 0.0, 0.0],
+            [overRoot2, -overRoot2, 0.0, 0.0],
 
-            Quat(overRoot2, 0.0, overRoot2, 0.0),
-            Quat(0.0, 0.0, 1.0, 0.0),
-            Quat(overRoot2, 0.0, -overRoot2, 0.0),
+            [overRoot2, 0.0, overRoot2, 0.0],
+            [0.0, 0.0, 1.0, 0.0],
+            [overRoot2, 0.0, -overRoot2, 0.0],
 
-            Quat(overRoot2, 0.0, 0.0, overRoot2),
-            Quat(0.0, 0.0, 0.0, 1.0),
-            Quat(overRoot2, 0.0, 0.0, -overRoot2),
+            [overRoot2, 0.0, 0.0, overRoot2],
+            [0.0, 0.0, 0.0, 1.0],
+            [overRoot2, 0.0, 0.0, -overRoot2],
 
             # cubic dyads (110)
-            Quat(0.0, overRoot2, overRoot2, 0.0),
-            Quat(0.0, -overRoot2, overRoot2, 0.0),
+            [0.0, overRoot2, overRoot2, 0.0],
+            [0.0, -overRoot2, overRoot2, 0.0],
 
-            Quat(0.0, overRoot2, 0.0, overRoot2),
-            Quat(0.0, -overRoot2, 0.0, overRoot2),
+            [0.0, overRoot2, 0.0, overRoot2],
+            [0.0, -overRoot2, 0.0, overRoot2],
 
-            Quat(0.0, 0.0, overRoot2, overRoot2),
-            Quat(0.0, 0.0, -overRoot2, overRoot2),
+            [0.0, 0.0, overRoot2, overRoot2],
+            [0.0, 0.0, -overRoot2, overRoot2],
 
             # cubic triads (111)
-            Quat(0.5, 0.5, 0.5, 0.5),
-            Quat(0.5, -0.5, -0.5, -0.5),
+            [0.5, 0.5, 0.5, 0.5],
+            [0.5, -0.5, -0.5, -0.5],
 
-            Quat(0.5, -0.5, 0.5, 0.5),
-            Quat(0.5, 0.5, -0.5, -0.5),
+            [0.5, -0.5, 0.5, 0.5],
+            [0.5, 0.5, -0.5, -0.5],
 
-            Quat(0.5, 0.5, -0.5, 0.5),
-            Quat(0.5, -0.5, 0.5, -0.5),
+            [0.5, 0.5, -0.5, 0.5],
+            [0.5, -0.5, 0.5, -0.5],
 
-            Quat(0.5, 0.5, 0.5, -0.5),
-            Quat(0.5, -0.5, -0.5, 0.5),
+            [0.5, 0.5, 0.5, -0.5],
+            [0.5, -0.5, -0.5, 0.5],
 
             # hexagonal hexads
-            Quat(sqrt3over2, 0.0, 0.0, 0.5),
-            Quat(0.5, 0.0, 0.0, sqrt3over2),
-            Quat(0.5, 0.0, 0.0, -sqrt3over2),
-            Quat(sqrt3over2, 0.0, 0.0, -0.5),
+            [sqrt3over2, 0.0, 0.0, 0.5],
+            [0.5, 0.0, 0.0, sqrt3over2],
+            [0.5, 0.0, 0.0, -sqrt3over2],
+            [sqrt3over2, 0.0, 0.0, -0.5],
 
             # hexagonal diads
-            Quat(0.0, -0.5, -sqrt3over2, 0.0),
-            Quat(0.0, 0.5, -sqrt3over2, 0.0),
-            Quat(0.0, sqrt3over2, -0.5, 0.0),
-            Quat(0.0, -sqrt3over2, -0.5, 0.0)
-        ]
+            [0.0, -0.5, -sqrt3over2, 0.0],
+            [0.0, 0.5, -sqrt3over2, 0.0],
+            [0.0, sqrt3over2, -0.5, 0.0],
+            [0.0, -sqrt3over2, -0.5, 0.0]
+        ])
 
         if group == 'cubic':
-            return qsym[0:24]
+            comps = qsym[0:24]
         elif group == 'hexagonal':
-            return [qsym[0], qsym[2], qsym[5], qsym[8]] + qsym[-8:32]
+            comps = qsym[[0, 2, 5, 8] + list(range(24, 32))]
+        else:
+            comps = qsym[0:1]
+
+        # sym_i * q = productMatrices[i] @ q
+        s0, s1, s2, s3 = comps.T
+        productMatrices = np.array([
+            [s0, -s1, -s2, -s3],
+            [s1, s0, -s3, s2],
+            [s2, s3, s0, -s1],
+            [s3, -s2, s1, s0]
+        ]).transpose((2, 0, 1))
+
+        # sym_i * sym_j, compared to all operators ignoring sign
+        products = np.matmul(productMatrices, comps.T).transpose((0, 2, 1))
+        mulTable = np.argmax(
+            abs(np.einsum('ijk,lk->ijl', products, comps)), axis=2
+        )
+
+        rotMatrices = Quat.calcRotMatrix(comps.T).transpose((2, 0, 1))
+
+        tables = {
+            'comps': comps,
+            'mulTable': mulTable,
+            'productMatrices': productMatrices,
+            'rotMatrices': rotMatrices,
+        }
+        # flattened product matrices, for scalar misorientations as
+        # misOriMatrices @ outer(left, right)
+        tables['misOriMatrices'] = productMatrices.reshape(-1, 16)
+        for table in tables.values():
+            table.flags.writeable = False
+
+        # smallest rotation angle of the operators (excluding identity)
+        if len(comps) > 1:
+            tables['minAngle'] = 2 * np.arccos(np.max(abs(comps[1:, 0])))
         else:
-            return [qsym[0]]
+            tables['minAngle'] = 2 * np.pi
+        _symTablesCache[group] = tables
+
+        return tables
+
+
+# symmetry operator tables for each crystal symmetry, built on first use
+_symTablesCache = {}
+
+# component signs for the conjugate of a quaternion
+_conjugateSigns = np.array([1., -1., -1., -1.])
+
+# IPF colour lookup tables, built on first use. Set a directory to also
+# save tables there and reuse them between sessions. The version is part
+# of the file name and must be bumped whenever the colour key changes
+ipfLUTCacheDir = None
+_ipfLUTVersion = 1
+_ipfLUTCache = {}
+
+
+class QuatArray(object):
+    """An array of quaternions stored as a single array of components
+    rather than as an array of Quat objects. Components are stored
+    with shape (4, ...) and all operations are vectorised over the
+    array. Indexing a single element returns a Quat object and any
+    other indexing returns a QuatArray.
+
+    Attributes
+    ----------
+    quatCoef : np.ndarray shape (4, ...)
+        Quat components
+    """
+    __slots__ = ['quatCoef']
+
+    def __init__(self, quatCoef, dtype=float):
+        """
+        Construct a QuatArray from an array of quat components.
+
+        Parameters
+        ----------
+        quatCoef : array_like shape (4, ...)
+            Quat components, the first axis must be of length 4
+        dtype : numpy.dtype, optional
+            Data type to store components as
+
+        """
+        quatCoef = np.array(quatCoef, dtype=dtype)
+        if quatCoef.ndim < 1 or quatCoef.shape[0] != 4:
+            raise TypeError("First dimension of input array must be 4")
+
+        # move to northern hemisphere
+        quatCoef[:, quatCoef[0] < 0] *= -1
+
+        self.quatCoef = quatCoef
+
+    @classmethod
+    def _fromComps(cls, quatCoef):
+        """Wrap an existing component array without copying it or
+        moving it to the northern hemisphere.
+        """
+        quatArray = cls.__new__(cls)
+        quatArray.quatCoef = quatCoef
+
+        return quatArray
+
+    @classmethod
+    def fromEulerAngles(cls, ph1, phi, ph2, dtype=float):
+        """Create a QuatArray from arrays of Bunge euler angles
+
+        Parameters
+        ----------
+        ph1 : np.ndarray
+            First Euler angle, rotation around Z in radians
+        phi : np.ndarray
+            Second Euler angle, rotation around new X in radians
+        ph2 : np.ndarray
+            Third Euler angle, rotation around new Z in radians
+        dtype : numpy.dtype, optional
+            Data type to store components as
+
+        Returns
+        -------
+        defdap.quat.QuatArray
+            Initialised QuatArray with same shape as the input arrays
+
+        """
+        quatCoef = np.empty((4,) + np.shape(ph1), dtype=dtype)
+
+        quatCoef[0] = np.cos(phi / 2.0) * np.cos((ph1 + ph2) / 2.0)
+        quatCoef[1] = -np.sin(phi / 2.0) * np.cos((ph1 - ph2) / 2.0)
+        quatCoef[2] = -np.sin(phi / 2.0) * np.sin((ph1 - ph2) / 2.0)
+        quatCoef[3] = -np.cos(phi / 2.0) * np.sin((ph1 + ph2) / 2.0)
+
+        # move to northern hemisphere
+        quatCoef[:, quatCoef[0] < 0] *= -1
+
+        return cls._fromComps(quatCoef)
+
+    def eulerAngles(self):
+        """Calculate the Euler angle representation for all rotations
+
+        Returns
+        -------
+        eulers : np.ndarray shape (3, ...)
+            Bunge euler angles (in radians)
+
+        """
+        return Quat.calcEulerAngles(self.quatCoef)
+
+    def rotMatrix(self):
+        """Calculate the rotation matrix representation for all
+        rotations
+
+        Returns
+        -------
+        rotMatrix : np.ndarray shape (3, 3, ...)
+            Rotation matrices
+
+        """
+        return Quat.calcRotMatrix(self.quatCoef)
+
+    @property
+    def shape(self):
+        return self.quatCoef.shape[1:]
+
+    @property
+    def ndim(self):
+        return self.quatCoef.ndim - 1
+
+    @property
+    def size(self):
+        return int(np.prod(self.shape))
+
+    def __len__(self):
+        if self.ndim == 0:
+            raise TypeError("len() of unsized QuatArray")
+        return self.quatCoef.shape[1]
+
+    def __repr__(self):
+        return "QuatArray(shape={:})".format(self.shape)
+
+    def __str__(self):
+        return self.__repr__()
+
+    # allow array like setting/getting of quats. A Quat is only
+    # created when a single element is selected
+    def __getitem__(self, key):
+        if not isinstance(key, tuple):
+            key = (key,)
+        quatCoef = self.quatCoef[(slice(None),) + key]
+
+        if quatCoef.ndim == 1:
+            return Quat(quatCoef)
+        return QuatArray._fromComps(quatCoef)
+
+    def __setitem__(self, key, value):
+        if not isinstance(key, tuple):
+            key = (key,)
+        if isinstance(value, (Quat, QuatArray)):
+            value = value.quatCoef
+        else:
+            raise TypeError("Value must be a Quat or QuatArray")
+        # reshape so a Quat broadcasts across the selected elements
+        value = value.reshape(value.shape + (1,) * (
+            self.quatCoef[(slice(None),) + key].ndim - value.ndim
+        ))
+
+        self.quatCoef[(slice(None),) + key] = value
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self[i]
+
+    def copy(self):
+        return QuatArray._fromComps(self.quatCoef.copy())
+
+    def flatten(self):
+        """Return a 1D QuatArray. A copy is only made if the
+        components are not contiguous."""
+        return QuatArray._fromComps(self.quatCoef.reshape((4, -1)))
+
+    def reshape(self, *shape):
+        if len(shape) == 1 and isinstance(shape[0], tuple):
+            shape = shape[0]
+        return QuatArray._fromComps(self.quatCoef.reshape((4,) + shape))
+
+    # overload * operator for quaternion product
+    def __mul__(self, right):
+        if isinstance(right, (Quat, QuatArray)):
+            rightComps = right.quatCoef
+            if isinstance(right, Quat):
+                rightComps = rightComps.reshape((4,) + (1,) * self.ndim)
+
+            return QuatArray(Quat.quatProduct(self.quatCoef, rightComps))
+        return NotImplemented
+
+    def __rmul__(self, left):
+        if isinstance(left, Quat):
+            leftComps = left.quatCoef.reshape((4,) + (1,) * self.ndim)
+
+            return QuatArray(Quat.quatProduct(leftComps, self.quatCoef))
+        return NotImplemented
+
+    def dot(self, right):
+        """Dot product of each quat with a Quat or with the
+        corresponding quat of another QuatArray.
+
+        Parameters
+        ----------
+        right : defdap.quat.Quat or defdap.quat.QuatArray
+
+        Returns
+        -------
+        np.ndarray
+            Array of dot products with the same shape as this array
+
+        """
+        if isinstance(right, Quat):
+            rightComps = right.quatCoef.reshape((4,) + (1,) * self.ndim)
+        elif isinstance(right, QuatArray):
+            rightComps = right.quatCoef
+        else:
+            raise TypeError()
+
+        return (self.quatCoef[0] * rightComps[0] +
+                self.quatCoef[1] * rightComps[1] +
+                self.quatCoef[2] * rightComps[2] +
+                self.quatCoef[3] * rightComps[3])
+
+    def norm(self):
+        return np.sqrt(self.dot(self))
+
+    def normalise(self):
+        self.quatCoef /= self.norm()
+        return
+
+    # also the inverse if these are unit quaternions
+    @property
+    def conjugate(self):
+        quatCoef = self.quatCoef.copy()
+        quatCoef[1:4] *= -1
+
+        return QuatArray._fromComps(quatCoef)
+
+    def transformVector(self, vector, inverse=False):
+        """Transforms a vector by all quaternions in the array. For
+        EBSD quaterions this is a transformation from sample space to
+        crystal space. Perform on conjugate of quaternions (or set
+        inverse) for crystal to sample.
+
+        Parameters
+        ----------
+        vector : array_like shape (3) or (3, m)
+            Vector or vectors to transform
+        inverse : bool, optional
+            Transform by the inverse (conjugate) of the quaternions
+
+        Returns
+        -------
+        np.ndarray shape (3, ...) or (3, m, ...)
+            Transformed vectors with the shape of this array
+
+        """
+        vector = np.asarray(vector)
+        if vector.ndim not in (1, 2) or vector.shape[0] != 3:
+            raise TypeError("Vector must be a size 3 array or an array "
+                            "of shape (3, m).")
+
+        return Quat.calcTransformVectors(self.quatCoef, vector,
+                                         inverse=inverse)
+
+
+class OriIndex(object):
+    """Nearest neighbour index of orientations for finding all
+    orientations within a misorientation angle of another, or the
+    closest orientations to another, taking into account crystal
+    symmetry.
+
+    Orientations are reduced to the fundamental zone and stored in a
+    KD-tree on their quaternion components. The chord distance between
+    unit quaternions is a monotonic function of the angle between them,
+    so a query is made with every symmetric equivalent (and its
+    negative) of each query orientation and the results merged.
+
+    Attributes
+    ----------
+    symGroup : str
+        Crystal type (cubic, hexagonal)
+    quatComps : np.ndarray shape (4, n)
+        Fundamental zone reduced components of the indexed orientations
+    tree : scipy.spatial.cKDTree
+        KD-tree of the components
+
+    """
+    __slots__ = ['symGroup', 'quatComps', 'tree']
+
+    def __init__(self, quats, symGroup, leafSize=16):
+        """
+        Parameters
+        ----------
+        quats : np.ndarray shape (4, n) or defdap.quat.QuatArray or list(defdap.quat.Quat)
+            Orientations to index
+        symGroup : str
+            Crystal type (cubic, hexagonal)
+        leafSize : int, optional
+            Leaf size of the KD-tree
+
+        """
+        self.symGroup = symGroup
+        self.quatComps = Quat.calcFundZone(
+            OriIndex._asQuatComps(quats), symGroup
+        )[0].astype(float)
+        self.tree = cKDTree(self.quatComps.T, leafsize=leafSize)
+
+    def __len__(self):
+        return self.quatComps.shape[1]
+
+    @staticmethod
+    def _asQuatComps(quats):
+        if isinstance(quats, Quat):
+            quats = [quats]
+        return Quat._asQuatComps(quats)
+
+    def _queryComps(self, quats):
+        """Components of the query orientations, shape (4, m), and of
+        all their symmetric equivalents in both hemispheres, shape
+        (m * 2 * numSyms, 4)."""
+        quatComps = OriIndex._asQuatComps(quats).astype(float)
+
+        symComps = np.matmul(Quat.symProductMatrices(self.symGroup),
+                             quatComps)
+        symComps = np.concatenate((symComps, -symComps))
+
+        return quatComps, symComps.transpose((2, 0, 1)).reshape((-1, 4))
+
+    def _misOriAngles(self, quatComps, queryIdxs, idxs):
+        """Misorientation angle in degrees between pairs of query and
+        indexed orientations."""
+        misOris = Quat.misOriMany(quatComps[:, queryIdxs],
+                                  self.quatComps[:, idxs], self.symGroup)
+
+        return np.rad2deg(2 * np.arccos(misOris))
+
+    def queryRadius(self, quats, angle):
+        """Find all indexed orientations within a misorientation angle
+        of each query orientation.
+
+        Parameters
+        ----------
+        quats : defdap.quat.Quat or np.ndarray shape (4, m) or defdap.quat.QuatArray
+            Query orientations
+        angle : float
+            Maximum misorientation angle in degrees
+
+        Returns
+        -------
+        idxs : list(np.ndarray)
+            Indices of the indexed orientations for each query, sorted
+            by misorientation angle
+        angles : list(np.ndarray)
+            Misorientation angles in degrees
+
+        """
+        queryIdxs, idxs, angles = self.queryRadiusPairs(quats, angle)
+
+        numQueries = OriIndex._asQuatComps(quats).shape[1]
+        splits = np.cumsum(np.bincount(queryIdxs, minlength=numQueries))[:-1]
+
+        return np.split(idxs, splits), np.split(angles, splits)
+
+    def queryRadiusPairs(self, quats, angle):
+        """Find all indexed orientations within a misorientation angle
+        of each query orientation, returned as flat arrays of pairs.
+
+        Parameters
+        ----------
+        quats : defdap.quat.Quat or np.ndarray shape (4, m) or defdap.quat.QuatArray
+            Query orientations
+        angle : float
+            Maximum misorientation angle in degrees
+
+        Returns
+        -------
+        queryIdxs : np.ndarray
+            Index of the query orientation of each pair
+        idxs : np.ndarray
+            Index of the indexed orientation of each pair
+        angles : np.ndarray
+            Misorientation angle in degrees of each pair
+
+        Pairs are sorted by query then by misorientation angle.
+
+        """
+        quatComps, queryComps = self._queryComps(quats)
+        numVariants = len(Quat.symEqvComps(self.symGroup)) * 2
+
+        # chord distance between unit quats with dot product cos(angle/2)
+        radius = np.sqrt(2 - 2 * np.cos(np.deg2rad(angle) / 2)) + 1e-9
+        hits = cKDTree(queryComps).sparse_distance_matrix(
+            self.tree, radius, output_type='ndarray'
+        )
+
+        # merge hits of the symmetric equivalents of each query
+        pairs = np.unique((hits['i'] // numVariants) * len(self) + hits['j'])
+        queryIdxs, idxs = np.divmod(pairs, len(self))
+
+        angles = self._misOriAngles(quatComps, queryIdxs, idxs)
+
+        # filter and sort on the exact angle for each query
+        keep = angles <= angle + 1e-9
+        queryIdxs, idxs, angles = queryIdxs[keep], idxs[keep], angles[keep]
+        order = np.argsort(angles, kind='stable')
+        order = order[np.argsort(queryIdxs[order], kind='stable')]
+
+        return queryIdxs[order], idxs[order], angles[order]
+
+    def queryNearest(self, quats, k=1):
+        """Find the k indexed orientations with the smallest
+        misorientation to each query orientation.
+
+        Parameters
+        ----------
+        quats : defdap.quat.Quat or np.ndarray shape (4, m) or defdap.quat.QuatArray
+            Query orientations
+        k : int, optional
+            Number of orientations to find
+
+        Returns
+        -------
+        idxs : np.ndarray shape (m, k)
+            Indices of the indexed orientations, sorted by
+            misorientation angle
+        angles : np.ndarray shape (m, k)
+            Misorientation angles in degrees
+
+        """
+        if k > len(self):
+            raise ValueError("k must not be greater than the number of "
+                             "indexed orientations.")
+        quatComps, queryComps = self._queryComps(quats)
+        numQueries = quatComps.shape[1]
+
+        # the k nearest of each query are within the k nearest of one
+        # of its symmetric equivalents
+        _, idxs = self.tree.query(queryComps, k=k)
+        idxs = idxs.reshape((numQueries, -1))
+        queryIdxs = np.repeat(np.arange(numQueries), idxs.shape[1])
+
+        # remove orientations found by more than one equivalent
+        pairs = np.unique(queryIdxs * len(self) + idxs.ravel())
+        queryIdxs, idxs = np.divmod(pairs, len(self))
+
+        angles = self._misOriAngles(quatComps, queryIdxs, idxs)
+
+        # keep the k smallest angles for each query
+        order = np.lexsort((idxs, angles, queryIdxs))
+        queryIdxs, idxs, angles = queryIdxs[order], idxs[order], angles[order]
+        starts = np.searchsorted(queryIdxs, np.arange(numQueries))
+        select = (starts[:, np.newaxis] + np.arange(k)).ravel()
+
+        return idxs[select].reshape((numQueries, k)), \
+            angles[select].reshape((numQueries, k))
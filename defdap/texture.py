@@ -0,0 +1,427 @@
+# Copyright 2019 Mechanics of Microstructures Group
+#    at The University of Manchester
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import numpy as np
+from scipy import sparse
+from scipy.spatial import cKDTree
+
+from defdap.quat import Quat, QuatArray, OriIndex
+
+# Sparse kernel matrices of the orientation grids, keyed by
+# (symGroup, resolution, halfWidth)
+_kernelCache = {}
+
+
+def eulerBox(symGroup):
+    """Extent of Bunge Euler space used for the orientation grid of a
+    crystal symmetry. The box contains whole copies of the fundamental
+    zone (3 for cubic, 1 for hexagonal).
+
+    Parameters
+    ----------
+    symGroup : str
+        Crystal type (cubic, hexagonal)
+
+    Returns
+    -------
+    tuple(float)
+        Maximum phi1, Phi and phi2 in degrees
+
+    """
+    if symGroup == "cubic":
+        return 360., 90., 90.
+    elif symGroup == "hexagonal":
+        return 360., 90., 60.
+    else:
+        return 360., 180., 360.
+
+
+def _sphereKernel(angles, halfWidth):
+    """Bell shaped kernel of angle (degrees), 0.5 at the half width."""
+    return np.exp(-np.log(2) * (angles / halfWidth)**2)
+
+
+class ODF(object):
+    """Orientation distribution function (ODF) of a set of orientations
+    binned on a regular grid in Bunge Euler space.
+
+    Every symmetric equivalent of each orientation that lies in the
+    Euler box of the crystal symmetry (`eulerBox`) is counted, so the
+    binned density is symmetric. Densities are in multiples of a
+    random distribution (MRD). Smoothing uses a kernel of
+    misorientation angle between grid cells, with the neighbours of
+    each cell within the kernel cutoff stored as a sparse matrix.
+
+    Attributes
+    ----------
+    symGroup : str
+        Crystal type (cubic, hexagonal)
+    resolution : float
+        Size of grid cells in degrees
+    halfWidth : float
+        Half width of the smoothing kernel in degrees, 0 if unsmoothed
+    binEdges : list(np.ndarray)
+        Edges of the cells for phi1, Phi and phi2 in degrees
+    cellVolumes : np.ndarray shape (n1, n2, n3)
+        Volume of each cell in orientation space (sin(Phi) dphi1
+        dPhi dphi2), radians
+    rawDensity : np.ndarray shape (n1, n2, n3)
+        Binned density of the orientations before smoothing
+    density : np.ndarray shape (n1, n2, n3)
+        Smoothed density
+
+    """
+
+    def __init__(self, quats, symGroup, weights=None, resolution=5.,
+                 halfWidth=None, chunkSize=65536):
+        """Bin orientations on the grid and smooth.
+
+        Parameters
+        ----------
+        quats : np.ndarray shape (4, n) or defdap.quat.QuatArray or list(defdap.quat.Quat)
+            Orientations
+        symGroup : str
+            Crystal type (cubic, hexagonal)
+        weights : np.ndarray shape (n), optional
+            Weight of each orientation, equal if not given
+        resolution : float, optional
+            Size of grid cells in degrees. Must divide the Euler box of
+            the symmetry
+        halfWidth : float, optional
+            Half width of the smoothing kernel in degrees, defaults to
+            the resolution. 0 for no smoothing
+        chunkSize : int, optional
+            Maximum number of orientations to process at once
+
+        """
+        self.symGroup = symGroup
+        self.resolution = resolution
+
+        boxSize = eulerBox(symGroup)
+        numBins = [int(round(size / resolution)) for size in boxSize]
+        if not np.allclose(np.array(numBins) * resolution, boxSize):
+            raise ValueError("Resolution must divide the Euler box "
+                             "{:}.".format(boxSize))
+        self.binEdges = [np.linspace(0, size, num + 1)
+                         for size, num in zip(boxSize, numBins)]
+
+        edgesRad = [np.deg2rad(edges) for edges in self.binEdges]
+        PhiVolumes = np.cos(edgesRad[1][:-1]) - np.cos(edgesRad[1][1:])
+        self.cellVolumes = (np.diff(edgesRad[0])[:, np.newaxis, np.newaxis] *
+                            PhiVolumes[np.newaxis, :, np.newaxis] *
+                            np.diff(edgesRad[2])[np.newaxis, np.newaxis, :])
+
+        counts = self._binOrientations(quats, weights, chunkSize)
+        self.rawDensity = (counts / counts.sum() * self.cellVolumes.sum() /
+                           self.cellVolumes)
+
+        self.halfWidth = 0
+        self.density = self.rawDensity
+        self.smooth(resolution if halfWidth is None else halfWidth)
+
+    @classmethod
+    def fromEbsdMap(cls, ebsdMap, weightByGrain=False, **kwargs):
+        """Calculate the ODF of an EBSD map.
+
+        Parameters
+        ----------
+        ebsdMap : defdap.ebsd.Map
+            EBSD map
+        weightByGrain : bool, optional
+            Use the mean orientation of each grain with equal weight
+            instead of the orientation of every indexed point of the map
+        kwargs
+            Passed to `ODF`
+
+        Returns
+        -------
+        defdap.texture.ODF
+
+        """
+        if weightByGrain:
+            ebsdMap.checkGrainsDetected()
+            if any(grain.refOri is None for grain in ebsdMap):
+                ebsdMap.calcGrainAvOris()
+            quats = [grain.refOri for grain in ebsdMap]
+        else:
+            ebsdMap.buildFZQuatArray()
+            # non-indexed points have zero Euler angles (the identity)
+            indexed = ebsdMap.eulerAngleArray.any(axis=0)
+            quats = ebsdMap.fzQuatArray.quatCoef[:, indexed]
+
+        return cls(quats, ebsdMap.crystalSym, **kwargs)
+
+    @property
+    def binCentres(self):
+        """Centres of the cells for phi1, Phi and phi2 in degrees."""
+        return [(edges[:-1] + edges[1:]) / 2 for edges in self.binEdges]
+
+    @property
+    def shape(self):
+        return self.density.shape
+
+    def _binOrientations(self, quats, weights, chunkSize):
+        """Weighted count of symmetric equivalents in each cell."""
+        quatComps = Quat._asQuatComps(
+            [quats] if isinstance(quats, Quat) else quats
+        )
+        numQuats = quatComps.shape[1]
+        if weights is None:
+            weights = np.ones(numQuats)
+        weights = np.asarray(weights, dtype=float)
+        if weights.shape != (numQuats,):
+            raise ValueError("Must be one weight per orientation.")
+
+        productMatrices = Quat.symProductMatrices(self.symGroup)
+        symRotMatrices = Quat.symRotMatrices(self.symGroup)
+        numBins = [len(edges) - 1 for edges in self.binEdges]
+        boxSize = np.deg2rad([edges[-1] for edges in self.binEdges])
+
+        counts = np.zeros(np.prod(numBins))
+        for start in range(0, numQuats, chunkSize):
+            end = min(start + chunkSize, numQuats)
+            comps = quatComps[:, start:end].astype(float)
+
+            # Phi and phi2 of each symmetric equivalent from the last
+            # column of its rotation matrix, S R, to find those in the box
+            lastCols = np.einsum('sij,jn->sin', symRotMatrices,
+                                 Quat.calcRotMatrix(comps)[:, 2])
+            Phis = np.arccos(np.clip(lastCols[:, 2], -1, 1))
+            phi2s = np.arctan2(lastCols[:, 0], lastCols[:, 1]) % (2 * np.pi)
+            symIdxs, quatIdxs = np.nonzero((Phis <= boxSize[1] + 1e-9) &
+                                           (phi2s <= boxSize[2] + 1e-9))
+
+            # Euler angles of only the equivalents in the box
+            symComps = np.einsum('nij,jn->in', productMatrices[symIdxs],
+                                 comps[:, quatIdxs])
+            eulers = Quat.calcEulerAngles(symComps)
+
+            binIdxs = [
+                np.minimum((eulers[i] / boxSize[i] * numBins[i]).astype(int),
+                           numBins[i] - 1)
+                for i in range(3)
+            ]
+            counts += np.bincount(
+                np.ravel_multi_index(binIdxs, numBins),
+                weights=weights[start:end][quatIdxs], minlength=len(counts)
+            )
+
+        return counts.reshape(numBins)
+
+    def cellOris(self):
+        """Orientations at the centres of the grid cells.
+
+        Returns
+        -------
+        defdap.quat.QuatArray shape (n1, n2, n3)
+
+        """
+        centres = np.meshgrid(*[np.deg2rad(c) for c in self.binCentres],
+                              indexing='ij')
+        return QuatArray.fromEulerAngles(*centres)
+
+    def kernelMatrix(self, halfWidth):
+        """Sparse matrix of kernel values between all pairs of grid
+        cells closer than twice the half width, weighted by cell volume
+        and normalised so each row sums to 1. Cached between calls.
+
+        Parameters
+        ----------
+        halfWidth : float
+            Half width of the kernel in degrees
+
+        Returns
+        -------
+        scipy.sparse.csr_matrix
+
+        """
+        key = (self.symGroup, self.resolution, halfWidth)
+        if key in _kernelCache:
+            return _kernelCache[key]
+
+        cellComps = self.cellOris().quatCoef
+        oriIndex = OriIndex(cellComps.reshape((4, -1)), self.symGroup)
+
+        # Misorientation is unchanged by a rotation of the sample about
+        # Z so the kernel only depends on the difference in phi1. Find
+        # neighbours of the cells in the first phi1 slice then shift
+        numPhi1 = cellComps.shape[1]
+        sliceSize = cellComps[0, 0].size
+        rowIdxs, colIdxs, angles = oriIndex.queryRadiusPairs(
+            cellComps[:, 0].reshape((4, -1)), 2 * halfWidth
+        )
+        colPhi1Idxs, colIdxs = np.divmod(colIdxs, sliceSize)
+
+        shifts = np.arange(numPhi1)[:, np.newaxis]
+        rowIdxs = (shifts * sliceSize + rowIdxs).ravel()
+        colIdxs = ((colPhi1Idxs + shifts) % numPhi1 * sliceSize +
+                   colIdxs).ravel()
+        values = (np.tile(_sphereKernel(angles, halfWidth), numPhi1) *
+                  self.cellVolumes.ravel()[colIdxs])
+
+        numCells = numPhi1 * sliceSize
+        kernel = sparse.csr_matrix((values, (rowIdxs, colIdxs)),
+                                   shape=(numCells, numCells))
+        kernel = sparse.diags(1 / np.asarray(kernel.sum(axis=1)).ravel()) @ kernel
+        _kernelCache[key] = kernel.tocsr()
+
+        return _kernelCache[key]
+
+    def smooth(self, halfWidth):
+        """Smooth the binned density with a kernel of misorientation
+        angle. Updates self.density.
+
+        Parameters
+        ----------
+        halfWidth : float
+            Half width of the kernel in degrees. 0 for no smoothing
+
+        """
+        self.halfWidth = halfWidth
+        if halfWidth == 0:
+            self.density = self.rawDensity
+            return
+
+        kernel = self.kernelMatrix(halfWidth)
+        self.density = (kernel @ self.rawDensity.ravel()).reshape(
+            self.rawDensity.shape
+        )
+
+    def section(self, phi2):
+        """Section of the ODF at constant phi2.
+
+        Parameters
+        ----------
+        phi2 : float
+            Angle of the section in degrees, the nearest cell is used
+
+        Returns
+        -------
+        np.ndarray shape (n1, n2)
+            Density against phi1 and Phi
+
+        """
+        idx = np.argmin(abs(self.binCentres[2] - phi2))
+
+        return self.density[:, :, idx]
+
+    def textureIndex(self):
+        """Texture index, the mean square of the density. 1 for a
+        random texture.
+
+        Returns
+        -------
+        float
+
+        """
+        return (np.sum(self.density**2 * self.cellVolumes) /
+                np.sum(self.cellVolumes))
+
+    def _directionDensity(self, cellDirs, directions, halfWidth):
+        """Density at directions from sets of unit vectors for each cell
+        (shape (3, numVecs, numCells)), each vector weighted by the
+        ODF of its cell. Divided by the same for a uniform ODF so the
+        result is in MRD."""
+        directions = np.asarray(directions, dtype=float).reshape((3, -1))
+        directions = directions / np.linalg.norm(directions, axis=0)
+        numVecs, numCells = cellDirs.shape[1:]
+        cellDirs = np.concatenate((cellDirs, -cellDirs), axis=1)
+
+        # pairs of cell vectors and directions closer than the cutoff
+        radius = 2 * np.sin(np.deg2rad(2 * halfWidth) / 2)
+        vecTree = cKDTree(cellDirs.reshape((3, -1)).T)
+        dirTree = cKDTree(directions.T)
+        pairs = vecTree.sparse_distance_matrix(dirTree, radius,
+                                               output_type='ndarray')
+
+        angles = np.rad2deg(2 * np.arcsin(np.minimum(pairs['v'] / 2, 1)))
+        kernelValues = _sphereKernel(angles, halfWidth)
+        cellIdxs = pairs['i'] % numCells
+        cellWeights = self.cellVolumes.ravel()[cellIdxs] * kernelValues
+
+        numDirs = directions.shape[1]
+        uniform = np.bincount(pairs['j'], weights=cellWeights,
+                              minlength=numDirs)
+        weighted = np.bincount(
+            pairs['j'], weights=cellWeights * self.density.ravel()[cellIdxs],
+            minlength=numDirs
+        )
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return weighted / uniform
+
+    def poleDensity(self, pole, directions, halfWidth=None):
+        """Pole figure density of a crystal direction at sample
+        directions.
+
+        Parameters
+        ----------
+        pole : np.ndarray shape (3)
+            Crystal direction (cartesian), symmetric equivalents are
+            included
+        directions : np.ndarray shape (3, m)
+            Sample directions to evaluate the density at
+        halfWidth : float, optional
+            Half width of the kernel on the sphere in degrees, defaults
+            to the ODF resolution
+
+        Returns
+        -------
+        np.ndarray shape (m)
+            Density in MRD
+
+        """
+        halfWidth = self.resolution if halfWidth is None else halfWidth
+        pole = np.asarray(pole, dtype=float)
+        pole = pole / np.linalg.norm(pole)
+        symPoles = np.matmul(Quat.symRotMatrices(self.symGroup), pole)
+
+        # sample frame pole directions of each cell, R^T h
+        rotMatrices = Quat.calcRotMatrix(self.cellOris().quatCoef.reshape((4, -1)))
+        cellDirs = np.einsum('jik,sj->isk', rotMatrices, symPoles)
+
+        return self._directionDensity(cellDirs, directions, halfWidth)
+
+    def ipfDensity(self, direction, crystalDirections, halfWidth=None):
+        """Inverse pole figure density of a sample direction at crystal
+        directions.
+
+        Parameters
+        ----------
+        direction : np.ndarray shape (3)
+            Sample direction
+        crystalDirections : np.ndarray shape (3, m)
+            Crystal directions (cartesian) to evaluate the density at
+        halfWidth : float, optional
+            Half width of the kernel on the sphere in degrees, defaults
+            to the ODF resolution
+
+        Returns
+        -------
+        np.ndarray shape (m)
+            Density in MRD
+
+        """
+        halfWidth = self.resolution if halfWidth is None else halfWidth
+        direction = np.asarray(direction, dtype=float)
+        direction = direction / np.linalg.norm(direction)
+
+        # crystal frame directions of each cell and symmetric
+        # equivalents, S R r
+        rotMatrices = Quat.calcRotMatrix(self.cellOris().quatCoef.reshape((4, -1)))
+        crystalDirs = np.einsum('ijk,j->ik', rotMatrices, direction)
+        cellDirs = np.einsum('sij,jk->isk', Quat.symRotMatrices(self.symGroup),
+                             crystalDirs)
+
+        return self._directionDensity(cellDirs, crystalDirections, halfWidth)
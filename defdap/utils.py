@@ -1,4 +1,9 @@
+import os
 import functools
+import multiprocessing
+from multiprocessing import shared_memory
+
+import numpy as np
 
 
 # taking inspiration from:
@@ -38,3 +43,160 @@ def reportProgress(message=""):
         return wrapper
     return decorator
 
+
+
+# Number of worker processes used by calculations that can run in
+# parallel when nWorkers is not given, see `setNumWorkers`
+numWorkers = 1
+
+# arrays attached to shared memory in a worker process
+_workerArrays = {}
+_workerSharedMemory = []
+
+
+def setNumWorkers(nWorkers=None):
+    """Set the default number of worker processes used by calculations
+    that can run in parallel. 1 runs them in the calling process.
+
+    On platforms that start worker processes by spawning a new
+    interpreter (Windows and macOS) scripts using more than 1 worker
+    must guard their main code with ``if __name__ == '__main__':``.
+
+    Parameters
+    ----------
+    nWorkers : int, optional
+        Number of worker processes, the number of CPUs if not given
+    """
+    global numWorkers
+    if nWorkers is None:
+        nWorkers = os.cpu_count()
+    if nWorkers < 1:
+        raise ValueError("Number of workers must be at least 1.")
+    numWorkers = int(nWorkers)
+
+
+def getNumWorkers(nWorkers=None):
+    """Number of worker processes to use, the default set with
+    `setNumWorkers` if nWorkers is not given."""
+    if nWorkers is None:
+        return numWorkers
+    if nWorkers < 1:
+        raise ValueError("Number of workers must be at least 1.")
+    return int(nWorkers)
+
+
+def _attachSharedArrays(arraySpecs):
+    # worker initialiser, create arrays backed by the shared memory
+    for name, (memoryName, shape, dtype) in arraySpecs.items():
+        sharedMemory = shared_memory.SharedMemory(name=memoryName)
+        _workerSharedMemory.append(sharedMemory)
+        _workerArrays[name] = np.ndarray(shape, dtype=dtype,
+                                         buffer=sharedMemory.buf)
+
+
+def _runTask(funcTask):
+    func, task = funcTask
+    return func(_workerArrays, task)
+
+
+def runParallel(func, tasks, inputs, outputs=None, nWorkers=None):
+    """Run a function for each of a list of tasks, in a pool of worker
+    processes if more than 1 worker is used. Arrays are copied once into
+    shared memory and accessed by the workers without pickling. Only
+    the (small) task arguments and return values are sent between
+    processes. Workers write results into output arrays, which are
+    copied back into the given arrays when the run ends, also if it is
+    stopped early or raises, so results of finished tasks are kept.
+
+    Parameters
+    ----------
+    func : callable
+        Function called as ``func(arrays, task)``, where arrays is a
+        dict of the input and output arrays by name. Must be defined at
+        the top level of a module so it can be sent to workers.
+    tasks : list
+        Argument passed to func for each call, e.g. a range of grains
+    inputs : dict(str, numpy.ndarray)
+        Arrays read by func
+    outputs : dict(str, numpy.ndarray), optional
+        Arrays written to by func
+    nWorkers : int, optional
+        Number of worker processes, defaults to the number set with
+        `setNumWorkers`
+
+    Yields
+    ------
+    Return value of func for each task, in order of the tasks
+
+    """
+    if outputs is None:
+        outputs = {}
+    nWorkers = min(getNumWorkers(nWorkers), len(tasks))
+
+    arrays = dict(inputs, **outputs)
+    if nWorkers <= 1:
+        for task in tasks:
+            yield func(arrays, task)
+        return
+
+    sharedMemories = []
+    sharedArrays = {}
+    try:
+        arraySpecs = {}
+        for name, array in arrays.items():
+            sharedMemory = shared_memory.SharedMemory(
+                create=True, size=max(array.nbytes, 1)
+            )
+            sharedMemories.append(sharedMemory)
+            sharedArrays[name] = np.ndarray(array.shape, dtype=array.dtype,
+                                            buffer=sharedMemory.buf)
+            sharedArrays[name][...] = array
+            arraySpecs[name] = (sharedMemory.name, array.shape,
+                                array.dtype.str)
+
+        with multiprocessing.Pool(nWorkers, initializer=_attachSharedArrays,
+                                  initargs=(arraySpecs,)) as pool:
+            for result in pool.imap(_runTask,
+                                    [(func, task) for task in tasks]):
+                yield result
+
+    finally:
+        # workers have stopped once the pool is closed
+        for name, array in outputs.items():
+            if name in sharedArrays:
+                array[...] = sharedArrays[name]
+
+        # views of the shared memory must be released before closing
+        sharedArrays.clear()
+        for sharedMemory in sharedMemories:
+            sharedMemory.close()
+            sharedMemory.unlink()
+
+
+def splitRanges(sizes, numRanges):
+    """Split consecutive items (e.g. grains) into ranges with roughly
+    equal total size (e.g. number of points).
+
+    Parameters
+    ----------
+    sizes : numpy.ndarray
+        Size of each item
+    numRanges : int
+        Maximum number of ranges
+
+    Returns
+    -------
+    list(tuple(int, int))
+        Start and end index of each range
+
+    """
+    totals = np.cumsum(sizes)
+    if len(totals) == 0:
+        return []
+    bounds = np.searchsorted(
+        totals, totals[-1] * np.arange(1, numRanges) / numRanges,
+        side='right'
+    )
+    bounds = np.unique(np.concatenate(([0], bounds, [len(sizes)])))
+
+    return list(zip(bounds[:-1].tolist(), bounds[1:].tolist()))
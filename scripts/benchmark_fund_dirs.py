@@ -0,0 +1,41 @@
+"""Benchmark of Quat.calcFundDirs against number of orientations.
+
+Run from the repository root with:
+    python scripts/benchmark_fund_dirs.py
+"""
+import timeit
+
+import numpy as np
+
+from defdap.quat import Quat, QuatArray
+
+
+def randomOrientations(numQuats, seed=0):
+    rng = np.random.default_rng(seed)
+    quats = QuatArray(rng.normal(size=(4, numQuats)))
+    quats.normalise()
+
+    return quats
+
+
+def main():
+    direction = np.array([0, 0, 1])
+    mapSizes = [10**3, 10**4, 10**5, 10**6]
+
+    print("{:>10}  {:>10}  {:>10}  {:>12}".format(
+        "symmetry", "size", "time (s)", "us per quat"))
+    for symGroup in ["cubic", "hexagonal"]:
+        for mapSize in mapSizes:
+            quats = randomOrientations(mapSize)
+            numRepeats = max(1, 10**5 // mapSize)
+            runTime = timeit.timeit(
+                lambda: Quat.calcFundDirs(quats, direction, symGroup),
+                number=numRepeats
+            ) / numRepeats
+
+            print("{:>10}  {:>10}  {:>10.4f}  {:>12.3f}".format(
+                symGroup, mapSize, runTime, runTime / mapSize * 1e6))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,63 @@
+"""Benchmark of EBSD neighbour misorientation against memory budget.
+
+Run from the repository root with:
+    python scripts/benchmark_neighbour_misori.py [EBSD file] [symmetry]
+
+The test map in tests/data is used by default. Peak memory is measured
+with tracemalloc, which slows the calculation down, so run times are
+taken from a separate untraced run.
+"""
+import sys
+import timeit
+import tracemalloc
+
+from defdap import ebsd
+
+
+def peakMemory(ebsdMap, memoryBudget):
+    """Peak memory in bytes allocated while calculating neighbour
+    misorientation with the given memory budget."""
+    ebsdMap.pixelNeighbourMisOri = None
+    tracemalloc.start()
+    try:
+        startMemory = tracemalloc.get_traced_memory()[0]
+        ebsdMap.calcPixelNeighbourMisOri(memoryBudget=memoryBudget)
+        return tracemalloc.get_traced_memory()[1] - startMemory
+    finally:
+        tracemalloc.stop()
+
+
+def runTime(ebsdMap, memoryBudget):
+    """Time in seconds to calculate neighbour misorientation with the
+    given memory budget."""
+    def run():
+        ebsdMap.pixelNeighbourMisOri = None
+        ebsdMap.calcPixelNeighbourMisOri(memoryBudget=memoryBudget)
+
+    return timeit.timeit(run, number=1)
+
+
+def main():
+    fileName = sys.argv[1] if len(sys.argv) > 1 else "tests/data/testDataEBSD"
+    crystalSym = sys.argv[2] if len(sys.argv) > 2 else "cubic"
+
+    ebsdMap = ebsd.Map(fileName, crystalSym)
+    ebsdMap.buildFZQuatArray()
+    memoryBudgets = [2**20, 2**24, 2**26, 2**28, 2**40]
+
+    results = []
+    for memoryBudget in memoryBudgets:
+        results.append((memoryBudget, runTime(ebsdMap, memoryBudget),
+                        peakMemory(ebsdMap, memoryBudget)))
+
+    print()
+    print("Map size {:d} x {:d}".format(ebsdMap.xDim, ebsdMap.yDim))
+    print("{:>12}  {:>10}  {:>12}".format(
+        "budget (MB)", "time (s)", "peak (MB)"))
+    for memoryBudget, time, peak in results:
+        print("{:>12.0f}  {:>10.3f}  {:>12.1f}".format(
+            memoryBudget / 2**20, time, peak / 2**20))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,55 @@
+"""Benchmark of grain calculations against number of worker processes.
+
+Run from the repository root with:
+    python scripts/benchmark_parallel.py [EBSD file] [symmetry]
+
+The test map in tests/data is used by default, which is too small to
+show a speedup; use a map with many grains. Worker counts are doubled
+up to the number of CPUs.
+"""
+import os
+import sys
+import timeit
+
+from defdap import ebsd
+
+
+def main():
+    fileName = sys.argv[1] if len(sys.argv) > 1 else "tests/data/testDataEBSD"
+    crystalSym = sys.argv[2] if len(sys.argv) > 2 else "cubic"
+
+    ebsdMap = ebsd.Map(fileName, crystalSym)
+    ebsdMap.findBoundaries(boundDef=10)
+    ebsdMap.findGrains(minGrainSize=10)
+
+    operations = [
+        ("calcGrainAvOris",
+         lambda nWorkers: ebsdMap.calcGrainAvOris(nWorkers=nWorkers)),
+        ("calcGrainMisOri",
+         lambda nWorkers: ebsdMap.calcGrainMisOri(calcAxis=True,
+                                                  nWorkers=nWorkers)),
+    ]
+    workerCounts = [1]
+    while workerCounts[-1] * 2 <= os.cpu_count():
+        workerCounts.append(workerCounts[-1] * 2)
+
+    results = []
+    for name, operation in operations:
+        for nWorkers in workerCounts:
+            runTime = timeit.timeit(lambda: operation(nWorkers), number=1)
+            results.append((name, nWorkers, runTime))
+
+    print()
+    print("{:d} grains, {:d} points".format(len(ebsdMap),
+                                            ebsdMap.xDim * ebsdMap.yDim))
+    print("{:>16}  {:>8}  {:>10}  {:>8}".format(
+        "operation", "workers", "time (s)", "speedup"))
+    serialTimes = {}
+    for name, nWorkers, runTime in results:
+        serialTimes.setdefault(name, runTime)
+        print("{:>16}  {:>8d}  {:>10.3f}  {:>8.2f}".format(
+            name, nWorkers, runTime, serialTimes[name] / runTime))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,40 @@
+"""Benchmark of scalar Quat operations.
+
+Run from the repository root with:
+    python scripts/benchmark_quat.py
+"""
+import timeit
+
+import numpy as np
+
+from defdap.quat import Quat
+
+
+def main():
+    rng = np.random.default_rng(0)
+    quat1 = Quat.fromEulerAngles(*rng.uniform(0, np.pi, size=3))
+    quat2 = Quat.fromEulerAngles(*rng.uniform(0, np.pi, size=3))
+    quatCoef = quat1.quatCoef.copy()
+
+    operations = [
+        ("Quat(array)", lambda: Quat(quatCoef)),
+        ("Quat.fromEulerAngles", lambda: Quat.fromEulerAngles(0.1, 0.2, 0.3)),
+        ("product", lambda: quat1 * quat2),
+        ("conjugate", lambda: quat1.conjugate),
+        ("dot", lambda: quat1.dot(quat2)),
+        ("misOri (cubic)", lambda: quat1.misOri(quat2, "cubic")),
+        ("misOri (hexagonal)", lambda: quat1.misOri(quat2, "hexagonal")),
+        ("misOri with quat (cubic)",
+         lambda: quat1.misOri(quat2, "cubic", returnQuat=2)),
+        ("misOriAxis", lambda: quat1.misOriAxis(quat2)),
+    ]
+
+    numRepeats = 10**5
+    print("{:>26}  {:>10}".format("operation", "us per call"))
+    for name, operation in operations:
+        runTime = timeit.timeit(operation, number=numRepeats) / numRepeats
+        print("{:>26}  {:>10.3f}".format(name, runTime * 1e6))
+
+
+if __name__ == '__main__':
+    main()
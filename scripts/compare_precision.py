@@ -0,0 +1,95 @@
+"""Compare results of EBSD map analysis run in float32 and float64.
+
+Run from the repository root with:
+    python scripts/compare_precision.py [EBSD file name] [crystal symmetry]
+
+The test map in tests/data is used by default.
+"""
+import sys
+
+import numpy as np
+
+from defdap import ebsd
+from defdap.quat import Quat
+
+
+def runAnalysis(fileName, crystalSym, precision):
+    ebsdMap = ebsd.Map(fileName, crystalSym, precision=precision)
+    ebsdMap.buildQuatArray()
+    ebsdMap.findBoundaries(boundDef=8)
+    ebsdMap.findGrains(minGrainSize=10)
+    ebsdMap.calcGrainAvOris()
+    ebsdMap.calcGrainMisOri(calcAxis=True)
+    ebsdMap.calcKam()
+    ebsdMap.calcNye()
+
+    return ebsdMap
+
+
+def angleDiff(cosHalfAngle1, cosHalfAngle2):
+    """Difference in degrees between 2 arrays of misorientation."""
+    angle1 = 2 * np.arccos(np.clip(cosHalfAngle1.astype(float), -1, 1))
+    angle2 = 2 * np.arccos(np.clip(cosHalfAngle2.astype(float), -1, 1))
+
+    return np.rad2deg(abs(angle1 - angle2))
+
+
+def main():
+    fileName = sys.argv[1] if len(sys.argv) > 1 else "tests/data/testDataEBSD"
+    crystalSym = sys.argv[2] if len(sys.argv) > 2 else "cubic"
+
+    map64 = runAnalysis(fileName, crystalSym, np.float64)
+    map32 = runAnalysis(fileName, crystalSym, np.float32)
+
+    results = []
+
+    quatDiff = abs(map32.quatArray.quatCoef - map64.quatArray.quatCoef)
+    results.append(("Orientations (quat components)",
+                    quatDiff.max(), quatDiff.mean()))
+
+    results.append(("Boundary pixels changed (count)",
+                    np.sum(map32.boundaries != map64.boundaries), 0))
+
+    results.append(("Grain labels changed (count)",
+                    np.sum(map32.grains != map64.grains), 0))
+
+    if np.array_equal(map32.grains, map64.grains):
+        avOris64 = Quat.extractQuatComps([grain.refOri for grain in map64])
+        avOris32 = Quat.extractQuatComps([grain.refOri for grain in map32])
+        avOriDiff = np.rad2deg(2 * np.arccos(np.clip(
+            Quat.misOriMany(avOris64, avOris32, crystalSym), -1, 1
+        )))
+        results.append(("Grain mean orientation (deg)",
+                        avOriDiff.max(), avOriDiff.mean()))
+
+        misOriDiff = angleDiff(
+            np.concatenate([grain.misOriList for grain in map32]),
+            np.concatenate([grain.misOriList for grain in map64])
+        )
+        results.append(("Grain misorientation (deg)",
+                        misOriDiff.max(), misOriDiff.mean()))
+
+    kamDiff = angleDiff(map32.kam, map64.kam)
+    results.append(("KAM (deg)", kamDiff.max(), kamDiff.mean()))
+
+    nyeDiff = abs(map32.Nye - map64.Nye) / abs(map64.Nye).max()
+    results.append(("Nye tensor (relative to max)",
+                    nyeDiff.max(), nyeDiff.mean()))
+
+    gndDiff = abs(map32.GND - map64.GND) / abs(map64.GND).max()
+    results.append(("GND density (relative to max)",
+                    gndDiff.max(), gndDiff.mean()))
+
+    ipf64 = Quat.calcIPFcolours(map64.quatArray, [0, 0, 1], crystalSym)
+    ipf32 = Quat.calcIPFcolours(map32.quatArray, [0, 0, 1], crystalSym)
+    ipfDiff = abs(ipf32 - ipf64)
+    results.append(("IPF colour (RGB 0-1)", ipfDiff.max(), ipfDiff.mean()))
+
+    print()
+    print("{:<34}  {:>10}  {:>10}".format("Stage", "Max diff", "Mean diff"))
+    for name, maxDiff, meanDiff in results:
+        print("{:<34}  {:>10.3g}  {:>10.3g}".format(name, maxDiff, meanDiff))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,547 @@
+import pytest
+import numpy as np
+
+import defdap.ebsd
+from defdap.quat import Quat
+
+DATA_DIR = "data/"
+
+
+@pytest.fixture(scope="module")
+def loadedMap():
+    return defdap.ebsd.Map(DATA_DIR + "testDataEBSD", "cubic")
+
+
+def copyMap(ebsdMap):
+    newMap = defdap.ebsd.Map.__new__(defdap.ebsd.Map)
+    newMap.__dict__.update(ebsdMap.__dict__)
+    newMap.quatArray = None
+
+    return newMap
+
+
+## transformData
+# Orientations of sample vectors should be unchanged when the map and
+# vectors are rotated together. Euler angles should match the quats.
+@pytest.mark.parametrize('axis, angle', [
+    ([0, 0, 1], np.pi),
+    ([0, 0, 1], np.pi / 2),
+    ([0, 0, 1], -np.pi / 2),
+    ([1, 0, 0], np.pi),
+    ([0, 1, 0], np.pi),
+])
+def testTransformData(loadedMap, axis, angle):
+    ebsdMap = copyMap(loadedMap)
+    ebsdMap.buildQuatArray()
+    quatComps = ebsdMap.quatArray.quatCoef.copy()
+    rotation = Quat.fromAxisAngle(axis, angle)
+    ebsdMap.transformData(rotation)
+
+    rotMatrix = rotation.rotMatrix()
+    mapMatrix = np.round(rotMatrix[:2, :2]).astype(int)
+    assert ebsdMap.quatArray.shape == ebsdMap.phaseArray.shape
+    assert ebsdMap.quatArray.shape == (ebsdMap.yDim, ebsdMap.xDim)
+
+    vector = np.array([0.3, -0.5, 0.8])
+    for x, y in [(0, 0), (20, 10), (loadedMap.xDim - 1, 5)]:
+        # flipped coordinates are measured from the other side of the map
+        newX, newY = mapMatrix.dot([x, y])
+        newX += (ebsdMap.xDim - 1) * (mapMatrix[0].sum() < 0)
+        newY += (ebsdMap.yDim - 1) * (mapMatrix[1].sum() < 0)
+        newQuat = ebsdMap.quatArray[newY, newX]
+        assert np.allclose(Quat(quatComps[:, y, x]).transformVector(vector),
+                           newQuat.transformVector(rotMatrix.dot(vector)))
+
+    indexed = ebsdMap.eulerAngleArray.any(axis=0)
+    eulerQuats = defdap.quat.QuatArray.fromEulerAngles(
+        *ebsdMap.eulerAngleArray
+    )
+    assert np.allclose(abs(eulerQuats.dot(ebsdMap.quatArray))[indexed], 1)
+
+
+# Transforming a map with an existing quat array should match building
+# the quat array afterwards
+def testTransformDataQuatArrayBuilt(loadedMap):
+    ebsdMap = copyMap(loadedMap)
+    ebsdMap.transformData()
+    builtMap = copyMap(loadedMap)
+    builtMap.buildQuatArray()
+    builtMap.transformData()
+
+    assert np.allclose(ebsdMap.quatArray.quatCoef, builtMap.quatArray.quatCoef)
+
+
+# Rotations that do not map the grid onto itself can only be applied to
+# the orientations
+def testTransformDataNonGrid(loadedMap):
+    ebsdMap = copyMap(loadedMap)
+    rotation = Quat.fromAxisAngle([0, 0, 1], 0.1)
+    with pytest.raises(ValueError):
+        ebsdMap.transformData(rotation)
+
+    ebsdMap.transformData(rotation, transformMap=False)
+    assert ebsdMap.quatArray.shape == loadedMap.phaseArray.shape
+
+
+# Grains and results for the old layout of the map should be cleared
+def testTransformDataClearsGrains(loadedMap):
+    ebsdMap = copyMap(loadedMap)
+    ebsdMap.findBoundaries(boundDef=10)
+    ebsdMap.findGrains(minGrainSize=10)
+    ebsdMap.calcGrainMisOri(calcAxis=True)
+    ebsdMap.calcKam()
+    ebsdMap.transformData(Quat.fromAxisAngle([0, 0, 1], np.pi / 2))
+
+    for name in ['boundaries', 'grains', 'kam', 'misOri', 'misOriAxis',
+                 'grainList', 'grainPointIdxs', 'grainOffsets',
+                 'grainOriIndex']:
+        assert getattr(ebsdMap, name) is None
+    with pytest.raises(Exception):
+        ebsdMap.checkGrainsDetected()
+
+    ebsdMap.findBoundaries(boundDef=10)
+    ebsdMap.findGrains(minGrainSize=10)
+    assert ebsdMap.grains.shape == (loadedMap.xDim, loadedMap.yDim)
+
+
+## buildQuatArray
+# Changing precision should rebuild the orientations and the
+# orientation indexes built from them
+def testBuildQuatArrayPrecision(loadedMap):
+    ebsdMap = copyMap(loadedMap)
+    ebsdMap.findBoundaries(boundDef=10)
+    ebsdMap.findGrains(minGrainSize=10)
+    ebsdMap.buildPixelOriIndex()
+    ebsdMap.buildGrainOriIndex()
+    quat = ebsdMap[0].refOri
+    matches, _ = ebsdMap.findPixelsByOri(quat, 5)
+
+    ebsdMap.precision = np.dtype(np.float32)
+    ebsdMap.buildQuatArray()
+    assert ebsdMap.quatArray.quatCoef.dtype == np.float32
+    assert ebsdMap.pixelOriIndex is None
+    assert ebsdMap.grainOriIndex is None
+
+    matches32, _ = ebsdMap.findPixelsByOri(quat, 5)
+    assert ebsdMap.fzQuatArray.quatCoef.dtype == np.float32
+    assert np.count_nonzero(matches32 != matches) <= 10
+
+
+## calcPixelNeighbourMisOri
+# Boundaries, KAM and Nye should all use the cached neighbour
+# misorientation, which is cleared when the map is transformed
+def testPixelNeighbourMisOri(loadedMap):
+    ebsdMap = copyMap(loadedMap)
+    ebsdMap.findBoundaries(boundDef=10)
+    neighbourMisOri = ebsdMap.pixelNeighbourMisOri
+    assert neighbourMisOri.shape == (2, ebsdMap.yDim, ebsdMap.xDim)
+    assert np.all(neighbourMisOri[0, :, -1] == 0)
+    assert np.all(neighbourMisOri[1, -1, :] == 0)
+
+    quatComps = ebsdMap.quatArray.quatCoef
+    misOriX = Quat.misOriMany(quatComps[:, 5, 10:20], quatComps[:, 5, 11:21],
+                              'cubic')
+    assert np.allclose(neighbourMisOri[0, 5, 10:20], misOriX)
+    boundaries = np.any(
+        2 * np.rad2deg(np.arccos(neighbourMisOri)) > 10, axis=0
+    )
+    assert np.array_equal(ebsdMap.boundaries == -1, boundaries)
+
+    ebsdMap.calcKam()
+    ebsdMap.calcNye()
+    assert ebsdMap.pixelNeighbourMisOri is neighbourMisOri
+    assert ebsdMap.kam.max() <= 1
+
+    ebsdMap.transformData()
+    assert ebsdMap.pixelNeighbourMisOri is None
+
+
+# Processing in bands of rows should give identical results for any
+# memory budget
+@pytest.mark.parametrize('memoryBudget', [1, 2**20])
+def testPixelNeighbourMisOriBands(loadedMap, memoryBudget):
+    ebsdMap = copyMap(loadedMap)
+    ebsdMap.pixelNeighbourMisOri = None
+    ebsdMap.calcPixelNeighbourMisOri(memoryBudget=2**40)
+    misOris = ebsdMap.pixelNeighbourMisOri
+    symIdxs = ebsdMap.pixelNeighbourSymIdxs
+
+    ebsdMap.pixelNeighbourMisOri = None
+    ebsdMap.calcPixelNeighbourMisOri(memoryBudget=memoryBudget)
+    assert np.array_equal(ebsdMap.pixelNeighbourMisOri, misOris)
+    assert np.array_equal(ebsdMap.pixelNeighbourSymIdxs, symIdxs)
+
+
+## findBoundaries
+# Stacked boundaries for a list of thresholds should match finding
+# boundaries for each threshold in turn
+def testBoundaryThresholds(loadedMap):
+    ebsdMap = copyMap(loadedMap)
+    thresholds = [2, 5, 10, 15]
+    boundaryStack = ebsdMap.findBoundaries(boundaryThresholds=thresholds)
+    assert boundaryStack.shape == (len(thresholds), ebsdMap.yDim, ebsdMap.xDim)
+    assert ebsdMap.boundaries is None
+
+    for threshold, boundaries in zip(thresholds, boundaryStack):
+        ebsdMap.findBoundaries(boundDef=threshold)
+        assert np.array_equal(ebsdMap.boundaries, boundaries)
+    assert np.all(boundaryStack[0] <= boundaryStack[-1])
+
+
+## findGrains
+def floodFillGrains(boundaries, minGrainSize):
+    """Reference grain labelling by flood filling from the first
+    unassigned point in raster order."""
+    grains = boundaries.copy()
+    yDim, xDim = grains.shape
+    grainIndex = 1
+    while np.any(grains == 0):
+        y, x = np.argwhere(grains == 0)[0]
+        grains[y, x] = grainIndex
+        points, edge = [(y, x)], [(y, x)]
+        while edge:
+            newEdge = []
+            for y, x in edge:
+                for t, s in [(y, x + 1), (y, x - 1), (y + 1, x), (y - 1, x)]:
+                    if not (0 <= s < xDim and 0 <= t < yDim):
+                        continue
+                    if grains[t, s] == 0:
+                        newEdge.append((t, s))
+                    elif not (grains[t, s] == -1 and (s > x or t > y)):
+                        continue
+                    grains[t, s] = grainIndex
+                    points.append((t, s))
+            edge = newEdge
+        if len(points) < minGrainSize:
+            grains[tuple(np.array(points).T)] = -2
+        else:
+            grainIndex += 1
+
+    return grains
+
+
+# Labelling should match flood filling, including assignment of
+# boundary points and removal of small grains
+@pytest.mark.parametrize('minGrainSize', [1, 4])
+def testLabelGrains(minGrainSize):
+    rng = np.random.default_rng(0)
+    boundaries = -(rng.random((30, 40)) < 0.35).astype(int)
+
+    grains = defdap.ebsd.Map.labelGrains(boundaries, minGrainSize)
+    assert np.array_equal(grains, floodFillGrains(boundaries, minGrainSize))
+
+
+# Grains should hold their points in raster order
+def testFindGrains(loadedMap):
+    ebsdMap = copyMap(loadedMap)
+    ebsdMap.findBoundaries(boundDef=10)
+    ebsdMap.findGrains(minGrainSize=10)
+
+    assert len(ebsdMap) == ebsdMap.grains.max()
+    for grainId in [0, len(ebsdMap) // 2, len(ebsdMap) - 1]:
+        grain = ebsdMap[grainId]
+        y, x = np.nonzero(ebsdMap.grains == grainId + 1)
+        assert np.array_equal(np.array(grain.coordList), np.array([x, y]).T)
+        assert np.array_equal(grain.quatList[0].quatCoef,
+                              ebsdMap.quatArray[y[0], x[0]].quatCoef)
+
+
+# Grains should be views of the grain index of the map
+def testGrainIndex(loadedMap):
+    ebsdMap = copyMap(loadedMap)
+    ebsdMap.findBoundaries(boundDef=10)
+    ebsdMap.findGrains(minGrainSize=10)
+
+    grainsFlat = ebsdMap.grains.ravel()
+    assert ebsdMap.grainOffsets[-1] == np.count_nonzero(grainsFlat > 0)
+    assert np.array_equal(np.diff(ebsdMap.grainOffsets),
+                          [len(grain) for grain in ebsdMap])
+
+    mapData = np.arange(ebsdMap.yDim * ebsdMap.xDim).reshape(ebsdMap.shape)
+    for grainId in [0, len(ebsdMap) - 1]:
+        grain = ebsdMap[grainId]
+        assert np.shares_memory(grain.pointIdxs, ebsdMap.grainPointIdxs)
+        assert np.all(grainsFlat[grain.pointIdxs] == grainId + 1)
+
+        y, x = np.nonzero(ebsdMap.grains == grainId + 1)
+        assert grain.extremeCoords == (x.min(), y.min(), x.max(), y.max())
+        assert np.allclose(grain.centroid, (x.mean(), y.mean()))
+        assert np.array_equal(grain.grainData(mapData), grain.pointIdxs)
+
+        grainMapData = grain.grainMapData(mapData, bg=-1)
+        assert np.array_equal(grainMapData[y - y.min(), x - x.min()],
+                              mapData[y, x])
+        assert np.count_nonzero(grainMapData >= 0) == len(grain)
+
+
+# Replacing the coord list of a grain should detach it from the grain
+# index and keep its orientations
+def testSetCoordList(loadedMap):
+    ebsdMap = copyMap(loadedMap)
+    ebsdMap.findBoundaries(boundDef=10)
+    ebsdMap.findGrains(minGrainSize=10)
+    grain = ebsdMap[0]
+    quatComps = grain.quatList.quatCoef.copy()
+    assert grain.extremeCoords is not None
+
+    coordList = [(x + 1, y + 2) for x, y in grain.coordList]
+    grain.coordList = coordList
+
+    x, y = grain.coords
+    assert grain.pointIdxs is None
+    assert grain.coordList is coordList
+    assert grain.extremeCoords == (x.min(), y.min(), x.max(), y.max())
+    assert np.allclose(grain.centroid, (x.mean(), y.mean()))
+    assert np.array_equal(Quat.extractQuatComps(grain.quatList), quatComps)
+
+
+# Deprecated flood filling should match labelling the grains
+def testFloodFill(loadedMap):
+    ebsdMap = copyMap(loadedMap)
+    ebsdMap.findBoundaries(boundDef=10)
+    ebsdMap.grains = ebsdMap.boundaries.copy()
+
+    grainIndex = 1
+    while np.any(ebsdMap.grains == 0):
+        y, x = np.argwhere(ebsdMap.grains == 0)[0]
+        with pytest.deprecated_call():
+            grain = ebsdMap.floodFill(x, y, grainIndex)
+        assert len(grain) == np.count_nonzero(ebsdMap.grains == grainIndex)
+        grainIndex += 1
+
+    assert np.array_equal(
+        ebsdMap.grains, defdap.ebsd.Map.labelGrains(ebsdMap.boundaries, 1)
+    )
+
+
+# Painting grain values through the grain map should fill each grain
+# and leave other points as background
+@pytest.mark.parametrize('numValues', [1, 3])
+def testGrainDataToMapData(loadedMap, numValues):
+    ebsdMap = copyMap(loadedMap)
+    ebsdMap.findBoundaries(boundDef=10)
+    ebsdMap.findGrains(minGrainSize=10)
+
+    grainIds = [0, 2, len(ebsdMap) - 1]
+    grainData = np.random.default_rng(0).random((len(grainIds), numValues))
+    grainData = grainData.squeeze()
+    mapData = ebsdMap.grainDataToMapData(grainData, grainIds=grainIds, bg=-1)
+
+    expected = np.full(ebsdMap.shape + grainData.shape[1:], -1.)
+    for grainId, value in zip(grainIds, grainData):
+        x, y = ebsdMap[grainId].coords
+        expected[y, x] = value
+    assert np.array_equal(mapData, expected)
+
+
+## calcGrainMisOri
+# Whole map misorientation should match calculating each grain in turn
+# and grains should hold views of the results
+@pytest.mark.parametrize('memoryBudget', [2**12, None])
+def testCalcGrainMisOri(loadedMap, memoryBudget):
+    ebsdMap = copyMap(loadedMap)
+    ebsdMap.findBoundaries(boundDef=10)
+    ebsdMap.findGrains(minGrainSize=10)
+    ebsdMap.calcGrainAvOris()
+    ebsdMap.calcGrainMisOri(calcAxis=True, memoryBudget=memoryBudget)
+
+    assert ebsdMap.misOri.shape == ebsdMap.shape
+    assert ebsdMap.misOriAxis.shape == (3,) + ebsdMap.shape
+    assert np.all(ebsdMap.misOri[ebsdMap.grains < 1] == 1)
+    assert np.all(ebsdMap.misOriAxis[:, ebsdMap.grains < 1] == 0)
+
+    for grainId in [0, len(ebsdMap) // 2, len(ebsdMap) - 1]:
+        grain = ebsdMap[grainId]
+        x, y = grain.coords
+        misOris = grain.misOriList
+        misOriAxes = grain.misOriAxisList
+        averageMisOri = grain.averageMisOri
+        assert np.array_equal(ebsdMap.misOri[y, x], misOris)
+        assert np.array_equal(ebsdMap.misOriAxis[:, y, x], misOriAxes.T)
+
+        grain.buildMisOriList(calcAxis=True)
+        assert np.allclose(misOris, grain.misOriList)
+        assert np.allclose(misOriAxes, grain.misOriAxisList)
+        assert np.isclose(averageMisOri, grain.averageMisOri)
+
+
+# Recalculating without the axis should clear axes from an earlier call
+def testCalcGrainMisOriClearsAxis(loadedMap):
+    ebsdMap = copyMap(loadedMap)
+    ebsdMap.findBoundaries(boundDef=10)
+    ebsdMap.findGrains(minGrainSize=10)
+    ebsdMap.calcGrainMisOri(calcAxis=True)
+    ebsdMap.calcGrainMisOri()
+
+    assert ebsdMap.misOriAxis is None
+    assert all(grain.misOriAxisList is None for grain in ebsdMap)
+
+
+# Sharing grains between worker processes should give the same results
+def testGrainCalculationsParallel(loadedMap):
+    ebsdMap = copyMap(loadedMap)
+    ebsdMap.findBoundaries(boundDef=10)
+    ebsdMap.findGrains(minGrainSize=10)
+
+    results = []
+    for nWorkers in [1, 2]:
+        ebsdMap.calcGrainAvOris(nWorkers=nWorkers)
+        ebsdMap.calcGrainMisOri(calcAxis=True, memoryBudget=2**18,
+                                nWorkers=nWorkers)
+        results.append((
+            Quat.extractQuatComps([grain.refOri for grain in ebsdMap]),
+            ebsdMap.misOri, ebsdMap.misOriAxis,
+            [grain.averageMisOri for grain in ebsdMap]
+        ))
+
+    for serialResult, parallelResult in zip(*results):
+        assert np.array_equal(serialResult, parallelResult)
+
+
+## calcSchmidFactorMaps
+# Schmid factors of each point should match calculating from the
+# orientation of the point, and grain averages the mean over the grain
+@pytest.mark.parametrize('memoryBudget', [2**14, None])
+def testCalcSchmidFactorMaps(loadedMap, memoryBudget):
+    ebsdMap = copyMap(loadedMap)
+    ebsdMap.loadSlipSystems('cubic_fcc')
+    ebsdMap.findBoundaries(boundDef=10)
+    ebsdMap.findGrains(minGrainSize=10)
+    loadVector = np.array([1, 0, 0])
+
+    schmidFactors, maxSchmidFactor, maxSystem, grainSchmidFactors = \
+        ebsdMap.calcSchmidFactorMaps(loadVector, calcGrainAverages=True,
+                                     memoryBudget=memoryBudget)
+    slipSystems = [ss for ssGroup in ebsdMap.slipSystems for ss in ssGroup]
+    assert schmidFactors.shape == (len(slipSystems),) + ebsdMap.shape
+    assert schmidFactors.dtype == np.float32
+    assert np.array_equal(maxSchmidFactor, schmidFactors.max(axis=0))
+    assert np.array_equal(maxSystem, schmidFactors.argmax(axis=0))
+
+    for x, y in [(0, 0), (100, 50), (ebsdMap.xDim - 1, ebsdMap.yDim - 1)]:
+        loadVectorCrystal = ebsdMap.quatArray[y, x].transformVector(
+            loadVector
+        )
+        expected = [abs(np.dot(loadVectorCrystal, ss.slipPlane) *
+                        np.dot(loadVectorCrystal, ss.slipDir))
+                    for ss in slipSystems]
+        assert np.allclose(schmidFactors[:, y, x], expected, atol=1e-6)
+
+    assert grainSchmidFactors.shape == (len(slipSystems), len(ebsdMap))
+    for grainId in [0, len(ebsdMap) - 1]:
+        x, y = ebsdMap[grainId].coords
+        assert np.allclose(grainSchmidFactors[:, grainId],
+                           schmidFactors[:, y, x].mean(axis=1))
+
+
+## plotAverageGrainSchmidFactorsMap
+# Grains should be filled with the maximum Schmid factor of the chosen
+# slip systems of the grain
+@pytest.mark.parametrize('planes, directions', [
+    (None, None),
+    ([1, 3], None),
+    ([0, 2], [1]),
+])
+def testPlotAverageGrainSchmidFactorsMap(loadedMap, planes, directions):
+    ebsdMap = copyMap(loadedMap)
+    ebsdMap.loadSlipSystems('cubic_fcc')
+    ebsdMap.findBoundaries(boundDef=10)
+    ebsdMap.findGrains(minGrainSize=10)
+    ebsdMap.calcAverageGrainSchmidFactors(np.array([1, 0, 0]))
+    ebsdMap.plotAverageGrainSchmidFactorsMap(planes=planes,
+                                             directions=directions)
+
+    for grainId in [0, len(ebsdMap) // 2, len(ebsdMap) - 1]:
+        grain = ebsdMap[grainId]
+        expected = max(
+            schmidFactor
+            for plane, planeFactors in enumerate(grain.averageSchmidFactors)
+            if planes is None or plane in planes
+            for direction, schmidFactor in enumerate(planeFactors)
+            if directions is None or direction in directions
+        )
+        x, y = grain.coords
+        assert np.allclose(ebsdMap.averageSchmidFactor[y, x], expected)
+    assert np.all(ebsdMap.averageSchmidFactor[ebsdMap.grains < 1] == 0.5)
+
+
+## segmentGrains
+def unionFindGrains(misOris, shifts, threshold):
+    """Reference segmentation joining neighbouring points with
+    misorientation at or below the threshold, numbered in raster order
+    of the first point of each grain."""
+    yDim, xDim = misOris[0].shape
+    parents = list(range(yDim * xDim))
+
+    def root(i):
+        while parents[i] != i:
+            i = parents[i]
+        return i
+
+    thresholdCos = np.cos(np.deg2rad(threshold) / 2)
+    for misOri, (dy, dx) in zip(misOris, shifts):
+        for y, x in np.argwhere(misOri >= thresholdCos):
+            if 0 <= x + dx < xDim and y + dy < yDim:
+                i, j = root(y * xDim + x), root((y + dy) * xDim + x + dx)
+                parents[max(i, j)] = min(i, j)
+
+    roots = np.array([root(i) for i in range(yDim * xDim)])
+    return np.unique(roots, return_inverse=True)[1].reshape((yDim, xDim)) + 1
+
+
+# Grains at each threshold should match joining points with union-find
+# and be nested within grains at higher thresholds
+@pytest.mark.parametrize('connectivity', [4, 8])
+def testSegmentGrains(loadedMap, connectivity):
+    ebsdMap = copyMap(loadedMap)
+    thresholds = [2, 10]
+    grainStack = ebsdMap.segmentGrains(thresholds, minGrainSize=1,
+                                       connectivity=connectivity)
+    assert grainStack.shape == (len(thresholds), ebsdMap.yDim, ebsdMap.xDim)
+    assert ebsdMap.segmentationConnectivity == connectivity
+    assert np.all(np.diff(ebsdMap.segmentationMisOri) <= 0)
+
+    misOris = list(ebsdMap.pixelNeighbourMisOri)
+    shifts = [(0, 1), (1, 0)]
+    if connectivity == 8:
+        quatComps = ebsdMap.fzQuatArray.quatCoef
+        cornerPairs = [(np.s_[:, :-1, :-1], np.s_[:, 1:, 1:], 1),
+                       (np.s_[:, :-1, 1:], np.s_[:, 1:, :-1], -1)]
+        for startSlice, endSlice, dx in cornerPairs:
+            misOri = np.zeros((ebsdMap.yDim, ebsdMap.xDim))
+            misOri[startSlice[1:]] = Quat.misOriMany(
+                quatComps[startSlice], quatComps[endSlice],
+                ebsdMap.crystalSym
+            ).reshape((ebsdMap.yDim - 1, ebsdMap.xDim - 1))
+            misOris.append(misOri)
+            shifts.append((1, dx))
+
+    for threshold, grains in zip(thresholds, grainStack):
+        assert np.array_equal(grains,
+                              unionFindGrains(misOris, shifts, threshold))
+
+    grainPairs = np.unique(grainStack.reshape((2, -1)), axis=1)
+    assert len(np.unique(grainPairs[0])) == grainPairs.shape[1]
+
+    grains = ebsdMap.segmentGrains(10, minGrainSize=10,
+                                   connectivity=connectivity)
+    assert np.array_equal(
+        grains,
+        defdap.ebsd.Map._removeSmallGrains(grainStack[1],
+                                           grainStack[1].max(), 10)
+    )
+
+
+# Finding grains from the segmentation tree should set boundaries
+# between grains
+def testFindGrainsSegmentation(loadedMap):
+    ebsdMap = copyMap(loadedMap)
+    ebsdMap.findGrains(minGrainSize=10, misOriThreshold=10)
+
+    assert len(ebsdMap) == ebsdMap.grains.max()
+    assert np.array_equal(ebsdMap.grains, ebsdMap.segmentGrains(10))
+    grains = ebsdMap.grains
+    isBoundary = np.ones_like(grains, dtype=bool)
+    isBoundary[:-1, :-1] = ((grains[:-1, :-1] != grains[:-1, 1:]) |
+                            (grains[:-1, :-1] != grains[1:, :-1]))
+    assert np.array_equal(ebsdMap.boundaries == -1, isBoundary)
@@ -1,3 +1,52 @@
+import pytest
+import numpy as np
+
+import defdap.hrdic
+
+
+@pytest.fixture(scope="module")
+def bandedMap():
+    """Map of elliptical grains, each with parallel bands of high shear
+    at a random angle."""
+    rng = np.random.default_rng(0)
+    dicMap = defdap.hrdic.Map.__new__(defdap.hrdic.Map)
+    dicMap.grainList = []
+
+    y, x = np.mgrid[0:30, 0:40]
+    inGrain = (x - 20)**2 / 400 + (y - 15)**2 / 225 < 1
+    for grainId in range(6):
+        angle = rng.random() * np.pi
+        bands = np.sin(0.8 * (x * np.cos(angle) + y * np.sin(angle))) > 0.7
+        maxShear = bands + 0.01 * rng.random(x.shape)
+
+        grain = defdap.hrdic.Grain(dicMap)
+        for coord, value in zip(zip(x[inGrain] + 50 * grainId, y[inGrain]),
+                                maxShear[inGrain]):
+            grain.addPoint(coord, value)
+        dicMap.grainList.append(grain)
+
+    return dicMap
+
+
+## calcGrainSlipBands
+# Detecting bands for all grains, in serial or shared between worker
+# processes, should match detecting bands of each grain in turn
+@pytest.mark.parametrize('nWorkers', [1, 2])
+def testCalcGrainSlipBands(bandedMap, nWorkers):
+    expected = [
+        grain.calcSlipBands(grain.grainMapData(grainData=grain.maxShearList))
+        for grain in bandedMap
+    ]
+
+    for grain in bandedMap:
+        grain.slipBandAngles = None
+    bandedMap.calcGrainSlipBands(nWorkers=nWorkers)
+
+    for grain, angles in zip(bandedMap, expected):
+        assert len(angles) > 0
+        assert np.array_equal(grain.slipBandAngles, angles)
+
+
 
 # methods to test
 # '_grad',
@@ -101,6 +101,356 @@ def testFromAxisAngleStr2(axis, angle):
         defdap.quat.Quat.fromAxisAngle(axis, angle)
 
 
+## QuatArray
+# Indexing a single element should give a Quat matching the scalar constructor
+@pytest.mark.parametrize('ph1, phi, ph2', [
+    (0, 0, 0),
+    (np.pi/2., np.pi/4., np.pi/3.),
+    (5., 2., 1.),
+])
+def testQuatArrayFromEuler(ph1, phi, ph2):
+    quatArray = defdap.quat.QuatArray.fromEulerAngles(
+        np.full((2, 3), ph1), np.full((2, 3), phi), np.full((2, 3), ph2)
+    )
+    returnedQuat = quatArray[1, 2]
+    expectedQuat = defdap.quat.Quat.fromEulerAngles(ph1, phi, ph2)
+    assert isinstance(returnedQuat, defdap.quat.Quat)
+    assert np.allclose(returnedQuat.quatCoef, expectedQuat.quatCoef)
+
+# Slicing should return a QuatArray view of the components
+def testQuatArraySlice():
+    rng = np.random.default_rng(0)
+    quatArray = defdap.quat.QuatArray(rng.random((4, 5, 6)))
+    sliced = quatArray[1:3, 2]
+    assert isinstance(sliced, defdap.quat.QuatArray)
+    assert sliced.shape == (2,)
+    assert np.shares_memory(sliced.quatCoef, quatArray.quatCoef)
+
+# First dimension of a QuatArray must be 4
+def testQuatArrayInitDimension():
+    with pytest.raises(TypeError):
+        defdap.quat.QuatArray(np.ones((3, 5)))
+
+# Products, dots and vector transforms should match the Quat versions
+# (vector transform is checked against the rotation matrix)
+def testQuatArrayOperations():
+    rng = np.random.default_rng(0)
+    quatArray = defdap.quat.QuatArray(rng.random((4, 3, 2)) - 0.5)
+    quatArray.normalise()
+    quat = defdap.quat.Quat.fromAxisAngle(np.array([1, 2, 3]), 0.7)
+    vector = np.array([0.2, -1., 0.5])
+
+    rightProd = quatArray * quat
+    leftProd = quat * quatArray
+    selfProd = quatArray * quatArray.conjugate
+    vectors = quatArray.transformVector(vector)
+    assert vectors.shape == (3, 3, 2)
+    for idx in np.ndindex(quatArray.shape):
+        assert np.allclose(rightProd[idx].quatCoef, (quatArray[idx] * quat).quatCoef)
+        assert np.allclose(leftProd[idx].quatCoef, (quat * quatArray[idx]).quatCoef)
+        assert np.allclose(selfProd[idx].quatCoef, [1, 0, 0, 0])
+        assert np.isclose(quatArray.dot(quat)[idx], quatArray[idx].dot(quat))
+        assert np.allclose(vectors[(slice(None),) + idx],
+                           quatArray[idx].rotMatrix().dot(vector))
+
+## calcEulerAngles / calcRotMatrix
+# Batch conversions should exactly match the single quat methods,
+# including the degenerate cases where phi is 0 or pi
+@pytest.mark.parametrize('quatCoef', [
+    [1, 0, 0, 0],
+    [0.6, 0, 0, -0.8],
+    [0, 0.6, 0.8, 0],
+    [0, 1, 0, 0],
+    [0.5, -0.5, 0.5, 0.5],
+    [0.7666, 0.5234, 0.2449, -0.2799],
+])
+def testBatchConversions(quatCoef):
+    quat = defdap.quat.Quat(quatCoef)
+    quatComps = np.repeat(quat.quatCoef[:, np.newaxis], 3, axis=1)
+
+    eulers = defdap.quat.Quat.calcEulerAngles(quatComps)
+    rotMatrices = defdap.quat.Quat.calcRotMatrix(quatComps)
+    assert eulers.shape == (3, 3)
+    assert rotMatrices.shape == (3, 3, 3)
+    assert np.array_equal(eulers[:, 1], quat.eulerAngles())
+    assert np.array_equal(rotMatrices[:, :, 1], quat.rotMatrix())
+
+## symmetry tables
+# Tables should be cached, read-only and consistent with the operators
+@pytest.mark.parametrize('symGroup, numSyms', [
+    ('cubic', 24),
+    ('hexagonal', 12),
+])
+def testSymTables(symGroup, numSyms):
+    symComps = defdap.quat.Quat.symEqvComps(symGroup)
+    assert symComps.shape == (numSyms, 4)
+    assert symComps is defdap.quat.Quat.symEqvComps(symGroup)
+    assert not symComps.flags.writeable
+    assert np.array_equal(symComps[0], [1, 0, 0, 0])
+
+    productMatrices = defdap.quat.Quat.symProductMatrices(symGroup)
+    mulTable = defdap.quat.Quat.symMulTable(symGroup)
+    for i, j in [(1, 2), (3, 5), (numSyms - 1, numSyms - 2)]:
+        product = defdap.quat.Quat(symComps[i]) * defdap.quat.Quat(symComps[j])
+        assert np.allclose(abs(np.dot(productMatrices[i], symComps[j])),
+                           abs(product.quatCoef))
+        assert np.isclose(abs(np.dot(symComps[mulTable[i, j]], product.quatCoef)), 1)
+
+# misOri should find the symmetric equivalent with minimum misorientation
+def testMisOri():
+    quat1 = defdap.quat.Quat.fromAxisAngle([1, 2, 3], 0.3)
+    quat2 = defdap.quat.Quat.fromAxisAngle([0, 0, 1], np.pi / 2) * quat1
+    misOri, quatSym = quat1.misOri(quat2, 'cubic', returnQuat=2)
+    assert np.isclose(misOri, 1)
+    assert np.allclose(quatSym.quatCoef, quat1.quatCoef)
+
+# Scalar arithmetic should match the batch versions
+@pytest.mark.parametrize('symGroup', ['cubic', 'hexagonal'])
+def testScalarArithmetic(symGroup):
+    rng = np.random.default_rng(0)
+    quatComps = rng.normal(size=(4, 2))
+    quatComps /= np.linalg.norm(quatComps, axis=0)
+    quat1 = defdap.quat.Quat(quatComps[:, 0])
+    quat2 = defdap.quat.Quat(quatComps[:, 1])
+
+    product = defdap.quat.Quat.quatProduct(quat1.quatCoef, quat2.quatCoef)
+    product *= np.sign(product[0])
+    assert np.allclose((quat1 * quat2).quatCoef, product)
+    assert (quat1 * quat2).quatCoef[0] >= 0
+    assert np.allclose((quat1 * quat1.conjugate).quatCoef, [1, 0, 0, 0])
+    assert np.isclose(quat1.dot(quat2), np.dot(quat1.quatCoef, quat2.quatCoef))
+
+    misOri, quatSym = quat1.misOri(quat2, symGroup, returnQuat=2)
+    assert np.isclose(misOri, defdap.quat.Quat.misOriMany(
+        quat1.quatCoef[:, np.newaxis], quat2.quatCoef[:, np.newaxis], symGroup
+    )[0])
+    assert np.isclose(misOri, abs(quat1.dot(quatSym)))
+
+## calcFundDirs
+# Directions should lie in the fundamental triangle and not depend on
+# the chunk size used
+@pytest.mark.parametrize('symGroup, maxBeta', [
+    ('cubic', np.pi / 4),
+    ('hexagonal', np.pi / 6),
+])
+def testCalcFundDirs(symGroup, maxBeta):
+    rng = np.random.default_rng(0)
+    quats = defdap.quat.QuatArray(rng.normal(size=(4, 500)))
+    quats.normalise()
+    direction = np.array([0, 0, 1])
+
+    alpha, beta = defdap.quat.Quat.calcFundDirs(quats, direction, symGroup)
+    alphaChunk, betaChunk = defdap.quat.Quat.calcFundDirs(
+        quats, direction, symGroup, chunkSize=64
+    )
+    assert alpha.shape == (500,)
+    assert np.all((beta >= -1e-8) & (beta <= maxBeta + 1e-8))
+    assert np.all(alpha <= np.pi / 2 + 1e-8)
+    assert np.array_equal(alpha, alphaChunk)
+    assert np.array_equal(beta, betaChunk)
+
+## calcIPFcolours
+# Corners of the fundamental triangle should be pure red, green and blue
+@pytest.mark.parametrize('symGroup, corners', [
+    ('cubic', [[0, 0, 1], [1, 0, 1], [1, 1, 1]]),
+    ('hexagonal', [[0, 0, 1], [1, 0, 0], [np.sqrt(3), 1, 0]]),
+])
+def testCalcIPFcolours(symGroup, corners):
+    direction = np.array([0, 0, 1])
+    quats = []
+    for corner in corners:
+        # orientation that takes the sample direction to the corner
+        corner = np.array(corner) / np.linalg.norm(corner)
+        axis = np.cross(corner, direction)
+        angle = np.arccos(np.dot(corner, direction))
+        if np.allclose(axis, 0):
+            quats.append(defdap.quat.Quat(1., 0, 0, 0))
+        else:
+            quats.append(defdap.quat.Quat.fromAxisAngle(axis, angle))
+
+    rgb = defdap.quat.Quat.calcIPFcolours(quats, direction, symGroup)
+    assert np.allclose(rgb, np.eye(3), atol=0.01)
+
+# Interpolated colours should be close to the exact colour key
+@pytest.mark.parametrize('symGroup', ['cubic', 'hexagonal'])
+def testIPFcolourLUT(symGroup):
+    rng = np.random.default_rng(0)
+    quats = defdap.quat.QuatArray(rng.normal(size=(4, 1000)))
+    quats.normalise()
+    direction = np.array([1, 0, 0])
+
+    alpha, beta = defdap.quat.Quat.calcFundDirs(quats, direction, symGroup)
+    rgbExact = defdap.quat.Quat.calcIPFcolourKey(alpha, beta, symGroup)
+    rgb = defdap.quat.Quat.calcIPFcolours(quats, direction, symGroup)
+    assert np.allclose(rgb, rgbExact, atol=1 / 255)
+
+## misOriMany
+# Should match misOri and misOriAxis applied to each pair
+@pytest.mark.parametrize('symGroup', ['cubic', 'hexagonal'])
+def testMisOriMany(symGroup):
+    rng = np.random.default_rng(0)
+    quatsA = defdap.quat.QuatArray(rng.normal(size=(4, 50)))
+    quatsB = defdap.quat.QuatArray(rng.normal(size=(4, 50)))
+    quatsA.normalise()
+    quatsB.normalise()
+
+    misOris, minQuatComps, misOriAxes, symIdxs = defdap.quat.Quat.misOriMany(
+        quatsA, quatsB, symGroup, returnQuat=True, calcAxis=True,
+        returnSymIdx=True, chunkSize=16
+    )
+    symComps = defdap.quat.Quat.symEqvComps(symGroup)
+    for i in range(50):
+        misOri, minQuat = quatsA[i].misOri(quatsB[i], symGroup, returnQuat=2)
+        assert np.isclose(misOris[i], misOri)
+        assert np.allclose(minQuatComps[:, i], minQuat.quatCoef)
+        assert np.allclose(misOriAxes[:, i], quatsA[i].misOriAxis(minQuat))
+        symQuat = defdap.quat.Quat(symComps[symIdxs[i]]) * quatsB[i]
+        assert np.allclose(symQuat.quatCoef, minQuat.quatCoef)
+
+## calcAverageOriMany
+# Mean should be recovered when points are given as random symmetric
+# equivalents of a small spread around the mean
+@pytest.mark.parametrize('symGroup', ['cubic', 'hexagonal'])
+def testCalcAverageOriMany(symGroup):
+    rng = np.random.default_rng(2)
+    numGroups, numPoints = 5, 40
+    means = rng.normal(size=(4, numGroups))
+    means /= np.linalg.norm(means, axis=0)
+    means[:, means[0] < 0] *= -1
+    labels = np.repeat(np.arange(numGroups), numPoints)
+
+    quatComps = means[:, labels] + rng.normal(scale=1e-3,
+                                              size=(4, len(labels)))
+    quatComps /= np.linalg.norm(quatComps, axis=0)
+    symComps = defdap.quat.Quat.symEqvComps(symGroup)
+    syms = symComps[rng.integers(len(symComps), size=len(labels))]
+    quatComps = defdap.quat.Quat.quatProduct(syms.T, quatComps)
+
+    avOriComps = defdap.quat.Quat.calcAverageOriMany(quatComps, labels, symGroup)
+    misOris = defdap.quat.Quat.misOriMany(avOriComps, means, symGroup)
+    assert avOriComps.shape == (4, numGroups)
+    assert np.all(2 * np.arccos(misOris) < 1e-3)
+
+# Single precision inputs should give single precision results
+def testMisOriManyFloat32():
+    rng = np.random.default_rng(0)
+    quatsA = defdap.quat.QuatArray(rng.normal(size=(4, 20)), dtype=np.float32)
+    quatsB = defdap.quat.QuatArray(rng.normal(size=(4, 20)), dtype=np.float32)
+    quatsA.normalise()
+    quatsB.normalise()
+
+    misOris32 = defdap.quat.Quat.misOriMany(quatsA, quatsB, 'cubic')
+    misOris64 = defdap.quat.Quat.misOriMany(
+        quatsA.quatCoef.astype(float), quatsB.quatCoef.astype(float), 'cubic'
+    )
+    assert misOris32.dtype == np.float32
+    assert np.allclose(misOris32, misOris64, atol=1e-6)
+
+
+# Reduced orientations are the same for all symmetric equivalents and
+# small misorientations (identity shortcut) match the full search
+@pytest.mark.parametrize('symGroup', ['cubic', 'hexagonal'])
+def testCalcFundZone(symGroup):
+    rng = np.random.default_rng(0)
+    quats = defdap.quat.QuatArray(rng.normal(size=(4, 50)))
+    quats.normalise()
+    symComps = defdap.quat.Quat.symEqvComps(symGroup)
+    symQuats = defdap.quat.Quat.quatProduct(
+        symComps[rng.integers(len(symComps), size=50)].T, quats.quatCoef
+    )
+
+    fzComps, symIdxs = defdap.quat.Quat.calcFundZone(quats, symGroup)
+    fzSymComps, _ = defdap.quat.Quat.calcFundZone(symQuats, symGroup)
+    expected = defdap.quat.Quat.quatProduct(symComps[symIdxs].T,
+                                            quats.quatCoef)
+    expected[:, expected[0] < 0] *= -1
+
+    assert np.allclose(fzComps, expected)
+    assert np.allclose(fzComps, fzSymComps)
+    assert np.all(fzComps[0] >= abs(np.matmul(symComps, fzComps))[1:] - 1e-12)
+
+    # neighbours 1 degree apart
+    nearComps = defdap.quat.Quat.quatProduct(
+        defdap.quat.Quat.fromAxisAngle(np.array([1, 1, 0]),
+                                       np.pi / 180).quatCoef[:, np.newaxis],
+        fzComps
+    )
+    misOris = defdap.quat.Quat.misOriMany(fzComps, nearComps, symGroup)
+    fullMisOris = [q1.misOri(q2, symGroup) for q1, q2 in
+                   zip(defdap.quat.QuatArray(fzComps),
+                       defdap.quat.QuatArray(nearComps))]
+    assert np.allclose(misOris, fullMisOris)
+    assert np.allclose(misOris, np.cos(np.pi / 360))
+
+
+# Orientation index queries match a brute force search
+@pytest.mark.parametrize('symGroup', ['cubic', 'hexagonal'])
+def testOriIndex(symGroup):
+    rng = np.random.default_rng(0)
+    quats = defdap.quat.QuatArray(rng.normal(size=(4, 500)))
+    quats.normalise()
+    queries = defdap.quat.QuatArray(rng.normal(size=(4, 10)))
+    queries.normalise()
+    oriIndex = defdap.quat.OriIndex(quats, symGroup)
+
+    angles = np.array([np.rad2deg(2 * np.arccos(defdap.quat.Quat.misOriMany(
+        np.repeat(query.quatCoef[:, np.newaxis], 500, axis=1), quats,
+        symGroup
+    ))) for query in queries])
+
+    idxs, foundAngles = oriIndex.queryRadius(queries, 20)
+    for i in range(10):
+        assert np.array_equal(np.sort(idxs[i]),
+                              np.nonzero(angles[i] <= 20)[0])
+        assert np.all(np.diff(foundAngles[i]) >= 0)
+
+    idxs, foundAngles = oriIndex.queryNearest(queries, k=3)
+    assert idxs.shape == (10, 3)
+    assert np.allclose(foundAngles, np.sort(angles, axis=1)[:, :3])
+
+
+# Density IPF of random orientations is close to 1 MRD
+@pytest.mark.parametrize('symGroup', ['cubic', 'hexagonal'])
+@pytest.mark.parametrize('projection', ['stereographic', 'lambert'])
+def testPlotIPFDensity(symGroup, projection):
+    rng = np.random.default_rng(0)
+    quats = defdap.quat.QuatArray(rng.normal(size=(4, 200000)))
+    quats.normalise()
+
+    plot = defdap.quat.Quat.plotIPF(quats, np.array([0, 0, 1]), symGroup,
+                                    projection=projection, density=True,
+                                    bins=50, smoothing=2)
+    density = plot.imgLayers[0].get_array()
+
+    assert abs(density.mean() - 1) < 0.02
+    assert np.allclose(density.compressed(), 1, atol=0.25)
+
+
+# Broadcast vector transforms match rotation matrices in both directions
+def testCalcTransformVectors():
+    rng = np.random.default_rng(0)
+    quats = defdap.quat.QuatArray(rng.normal(size=(4, 5)))
+    quats.normalise()
+    vectors = rng.normal(size=(3, 7))
+    rotMatrices = quats.rotMatrix()
+
+    transformed = defdap.quat.Quat.calcTransformVectors(quats.quatCoef,
+                                                        vectors)
+    inverse = defdap.quat.Quat.calcTransformVectors(quats.quatCoef, vectors,
+                                                    inverse=True)
+    assert transformed.shape == (3, 7, 5)
+    assert np.allclose(transformed,
+                       np.einsum('ijn,jm->imn', rotMatrices, vectors))
+    assert np.allclose(inverse,
+                       np.einsum('jin,jm->imn', rotMatrices, vectors))
+
+    assert defdap.quat.Quat.calcTransformVectors(
+        quats.quatCoef, vectors[:, 0]).shape == (3, 5)
+    assert np.allclose(quats[0].transformVector(vectors),
+                       rotMatrices[:, :, 0].dot(vectors))
+    assert np.allclose(quats[0].transformVector(vectors[:, 0], inverse=True),
+                       quats[0].conjugate.transformVector(vectors[:, 0]))
+
 
 ''' Functions left to test
 eulerAngles(self):
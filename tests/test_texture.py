@@ -0,0 +1,88 @@
+import pytest
+import numpy as np
+
+import defdap.ebsd
+import defdap.quat
+import defdap.texture
+
+
+def randomOrientations(numQuats, rng):
+    quatComps = rng.normal(size=(4, numQuats))
+    quatComps /= np.linalg.norm(quatComps, axis=0)
+
+    return quatComps
+
+
+# A random texture should be close to 1 MRD everywhere
+@pytest.mark.parametrize('symGroup', ['cubic', 'hexagonal'])
+def testRandomTexture(symGroup):
+    rng = np.random.default_rng(0)
+    odf = defdap.texture.ODF(randomOrientations(100000, rng), symGroup,
+                             resolution=10)
+
+    volumes = odf.cellVolumes
+    assert np.isclose(np.sum(odf.rawDensity * volumes) / volumes.sum(), 1)
+    assert np.isclose(np.sum(odf.density * volumes) / volumes.sum(), 1,
+                      rtol=1e-2)
+    assert abs(odf.textureIndex() - 1) < 0.05
+
+    directions = randomOrientations(50, rng)[1:]
+    assert np.allclose(odf.poleDensity([0, 0, 1], directions), 1, atol=0.1)
+    assert np.allclose(odf.ipfDensity([0, 0, 1], directions), 1, atol=0.1)
+
+
+# Smoothing kernel rows are normalised so smoothing preserves the total
+def testKernelMatrix():
+    rng = np.random.default_rng(0)
+    odf = defdap.texture.ODF(randomOrientations(10, rng), 'cubic', halfWidth=0)
+    kernel = odf.kernelMatrix(5)
+
+    assert kernel.shape == (odf.density.size, odf.density.size)
+    assert np.allclose(kernel.sum(axis=1), 1)
+
+
+# Symmetric equivalents of an orientation give the same ODF
+def testSymmetricEquivalents():
+    rng = np.random.default_rng(0)
+    quatComps = randomOrientations(20, rng)
+    symComps = defdap.quat.Quat.symEqvComps('cubic')
+    symQuatComps = defdap.quat.Quat.quatProduct(
+        symComps[rng.integers(len(symComps), size=20)].T, quatComps
+    )
+
+    odf = defdap.texture.ODF(quatComps, 'cubic', halfWidth=0)
+    symOdf = defdap.texture.ODF(symQuatComps, 'cubic', halfWidth=0)
+
+    assert np.allclose(odf.rawDensity, symOdf.rawDensity)
+
+
+# Cube texture has {001} poles along the sample axes
+def testCubeTexture():
+    odf = defdap.texture.ODF(np.array([[1.], [0], [0], [0]]), 'cubic',
+                             resolution=10)
+    poleDensity = odf.poleDensity([0, 0, 1], np.array([[0, 0, 1],
+                                                       [1, 0, 0],
+                                                       [1, 1, 0]]).T)
+    ipfDensity = odf.ipfDensity([0, 0, 1], np.array([[0, 0, 1],
+                                                     [1, 1, 1]]).T)
+
+    assert odf.textureIndex() > 5
+    assert poleDensity[0] > 5 and poleDensity[1] > 5
+    assert poleDensity[2] < 1e-2
+    assert ipfDensity[0] > 5 and ipfDensity[1] < 1e-2
+
+
+# Non-indexed points of a map are not counted
+def testFromEbsdMapNonIndexed():
+    ebsdMap = defdap.ebsd.Map("data/testDataEBSD", "cubic")
+    ebsdMap.eulerAngleArray[:, :20, :] = 0
+    indexed = ebsdMap.eulerAngleArray.any(axis=0)
+    ebsdMap.buildFZQuatArray()
+    quatComps = ebsdMap.fzQuatArray.quatCoef[:, indexed]
+
+    odf = defdap.texture.ODF.fromEbsdMap(ebsdMap, resolution=10)
+    expectedOdf = defdap.texture.ODF(quatComps, 'cubic', resolution=10)
+
+    assert np.count_nonzero(~indexed) >= 20 * ebsdMap.xDim
+    assert np.allclose(odf.rawDensity, expectedOdf.rawDensity)
+    assert np.isclose(odf.textureIndex(), expectedOdf.textureIndex())
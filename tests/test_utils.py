@@ -0,0 +1,44 @@
+import pytest
+import numpy as np
+
+from defdap.utils import runParallel
+
+
+def squareTask(arrays, task):
+    if task == 'fail':
+        raise ValueError("Task failed.")
+    arrays['squares'][task] = arrays['values'][task] ** 2
+
+    return task
+
+
+## runParallel
+# Outputs of finished tasks are kept when the caller stops early or a
+# task raises
+@pytest.mark.parametrize('nWorkers', [1, 2])
+def testRunParallelStoppedEarly(nWorkers):
+    values = np.arange(8.)
+    squares = np.zeros(8)
+    results = runParallel(squareTask, list(range(8)),
+                          inputs={'values': values},
+                          outputs={'squares': squares}, nWorkers=nWorkers)
+    for task in results:
+        if task == 3:
+            break
+    results.close()
+
+    assert np.array_equal(squares[:4], values[:4] ** 2)
+
+
+@pytest.mark.parametrize('nWorkers', [1, 2])
+def testRunParallelRaises(nWorkers):
+    values = np.arange(4.)
+    squares = np.zeros(4)
+    with pytest.raises(ValueError):
+        for _ in runParallel(squareTask, [0, 1, 2, 3, 'fail'],
+                             inputs={'values': values},
+                             outputs={'squares': squares},
+                             nWorkers=nWorkers):
+            pass
+
+    assert np.array_equal(squares, values ** 2)